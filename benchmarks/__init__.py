@@ -0,0 +1,3 @@
+"""
+CodeMao SDK 基准测试
+"""
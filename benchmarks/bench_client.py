@@ -0,0 +1,99 @@
+"""
+客户端基准测试
+
+请求发往本地模拟服务器（无注入延迟），测得的耗时主要是SDK和 requests 本身的开销。
+"""
+
+from typing import Any, Callable
+
+import requests
+
+from codemaokit import CodeMaoClient
+from codemaokit.cache import ResponseCache
+from codemaokit.testing import Dataset, FakeCodeMaoServer
+
+from .harness import Fixture, benchmark
+
+USER_ID = 10001
+BATCH_IDS = [10000 + i for i in range(1, 101)]
+
+
+def _server(fixture: Fixture, latency: float = 0.0) -> FakeCodeMaoServer:
+    return fixture.get(
+        f"server-{latency}",
+        lambda: FakeCodeMaoServer(Dataset(users=1000, seed=0), latency=latency).start(),
+        lambda server: server.stop(),
+    )
+
+
+def _client(fixture: Fixture, key: str, latency: float = 0.0,
+            **kwargs: Any) -> CodeMaoClient:
+    server = _server(fixture, latency)
+    return fixture.get(
+        f"client-{key}",
+        lambda: CodeMaoClient(base_url=server.url, **kwargs),
+        lambda client: client.close(),
+    )
+
+
+@benchmark("transport")
+def raw_session_get(fixture: Fixture) -> Callable[[], Any]:
+    """不经过SDK的 requests 会话，作为 _request 开销的基线"""
+    server = _server(fixture)
+    session = fixture.get("raw-session", requests.Session, lambda s: s.close())
+    url = f"{server.url}/web/forums/boards/1"
+    return lambda: session.get(url).json()
+
+
+@benchmark("transport")
+def request_get(fixture: Fixture) -> Callable[[], Any]:
+    client = _client(fixture, "plain")
+    return lambda: client._request("GET", "/web/forums/boards/1")
+
+
+@benchmark("transport")
+def request_get_conditional(fixture: Fixture) -> Callable[[], Any]:
+    """条件请求，服务器返回304"""
+    client = _client(fixture, "conditional", conditional_requests=True)
+    return lambda: client._request("GET", "/web/forums/boards/1")
+
+
+@benchmark("transport")
+def stream_user_works(fixture: Fixture) -> Callable[[], Any]:
+    client = _client(fixture, "plain")
+    return lambda: list(client.stream_user_works(USER_ID, limit=1000))
+
+
+@benchmark("cache")
+def cached_get_user(fixture: Fixture) -> Callable[[], Any]:
+    """响应缓存命中"""
+    client = _client(fixture, "cached", cache=ResponseCache())
+    client.get_user(USER_ID)
+    return lambda: client.get_user(USER_ID)
+
+
+@benchmark("cache")
+def cached_board_by_name(fixture: Fixture) -> Callable[[], Any]:
+    """板块目录命中（列表和详情都已缓存）"""
+    client = _client(fixture, "catalog", boards_ttl=300)
+    client.get_board_by_name("板块7")
+    return lambda: client.get_board_by_name("板块7")
+
+
+@benchmark("bulk", ops=len(BATCH_IDS), rounds=5)
+def users_batch(fixture: Fixture) -> Callable[[], Any]:
+    """100个用户及荣誉信息，服务器每个请求延迟5ms"""
+    client = _client(fixture, "bulk", latency=0.005)
+    return lambda: client.get_users_batch(BATCH_IDS, include_honor=True)
+
+
+@benchmark("bulk", ops=len(BATCH_IDS), rounds=5)
+def users_sequential(fixture: Fixture) -> Callable[[], Any]:
+    """逐个获取相同的100个用户，作为批量接口的基线"""
+    client = _client(fixture, "bulk", latency=0.005)
+
+    def run() -> None:
+        for user_id in BATCH_IDS:
+            client.get_user(user_id)
+            client.get_user_honor(user_id)
+    return run
@@ -0,0 +1,47 @@
+"""
+旧版 codemao 模块与新客户端的对比
+
+旧版模块和新客户端都复用连接，主要差别在解析和模型构造。
+"""
+
+from types import ModuleType
+from typing import Any, Callable
+
+from .bench_client import USER_ID, _client, _server
+from .harness import Fixture, SkipBenchmark, benchmark
+
+
+def _legacy(fixture: Fixture) -> ModuleType:
+    """导入旧版模块并指向本地模拟服务器"""
+    try:
+        import codemao
+    except ImportError as e:
+        raise SkipBenchmark(f"无法导入旧版模块: {e}")
+    server = _server(fixture)
+    previous = codemao.BASE_URL
+    codemao.BASE_URL = server.url
+    fixture.get("legacy-base-url", lambda: previous,
+                lambda url: setattr(codemao, "BASE_URL", url))
+    return codemao
+
+
+@benchmark("legacy")
+def legacy_another(fixture: Fixture) -> Callable[[], Any]:
+    """旧版 another：用户详情、荣誉、作品、收藏、关注和粉丝六个请求"""
+    codemao = _legacy(fixture)
+    return lambda: codemao.another(USER_ID)
+
+
+@benchmark("legacy")
+def client_user_details(fixture: Fixture) -> Callable[[], Any]:
+    """新客户端完成与 another 相同的六个请求"""
+    client = _client(fixture, "plain")
+
+    def run() -> None:
+        client.get_user(USER_ID)
+        client.get_user_honor(USER_ID)
+        list(client.stream_user_works(USER_ID))
+        list(client.stream_user_collections(USER_ID))
+        list(client.stream_followers(USER_ID))
+        list(client.stream_fans(USER_ID))
+    return run
@@ -0,0 +1,63 @@
+"""
+模型解析基准测试
+"""
+
+from typing import Any, Callable, Dict, List
+
+from codemaokit.models import Board, Post, User, UserHonor, Work
+from codemaokit.testing import Dataset
+
+from .harness import Fixture, benchmark
+
+BATCH = 1000
+
+
+def _dataset(fixture: Fixture) -> Dataset:
+    return fixture.get("dataset", lambda: Dataset(users=BATCH, seed=0))
+
+
+def _parse_all(model: Callable[[Dict[str, Any]], Any],
+               items: List[Dict[str, Any]]) -> Callable[[], Any]:
+    def run() -> None:
+        for item in items:
+            model(item)
+    return run
+
+
+@benchmark("models", ops=BATCH)
+def user_from_dict(fixture: Fixture) -> Callable[[], Any]:
+    dataset = _dataset(fixture)
+    items = [dataset.user(dataset.user_id(i + 1)) for i in range(BATCH)]
+    return _parse_all(User.from_dict, items)
+
+
+@benchmark("models", ops=BATCH)
+def board_from_dict(fixture: Fixture) -> Callable[[], Any]:
+    boards = _dataset(fixture).boards
+    items = [boards[i % len(boards)] for i in range(BATCH)]
+    return _parse_all(Board.from_dict, items)
+
+
+@benchmark("models", ops=BATCH)
+def post_from_dict(fixture: Fixture) -> Callable[[], Any]:
+    posts = list(_dataset(fixture).posts.values())
+    items = [posts[i % len(posts)] for i in range(BATCH)]
+    return _parse_all(Post.from_dict, items)
+
+
+@benchmark("models", ops=BATCH)
+def work_from_dict(fixture: Fixture) -> Callable[[], Any]:
+    dataset = _dataset(fixture)
+    items: List[Dict[str, Any]] = []
+    user = 1
+    while len(items) < BATCH:
+        items.extend(dataset.works(dataset.user_id(user)))
+        user += 1
+    return _parse_all(Work.from_dict, items[:BATCH])
+
+
+@benchmark("models", ops=BATCH)
+def user_honor_from_dict(fixture: Fixture) -> Callable[[], Any]:
+    dataset = _dataset(fixture)
+    items = [dataset.honor(dataset.user_id(i + 1)) for i in range(BATCH)]
+    return _parse_all(UserHonor.from_dict, items)
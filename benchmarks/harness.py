@@ -0,0 +1,226 @@
+"""
+基准测试框架
+
+只依赖标准库。每个基准测试是一个接受 Fixture 并返回"一轮"可调用对象的函数，
+框架先预热，再重复执行若干轮并记录每轮耗时，结果保存为 JSON 供不同版本之间比较。
+"""
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# 已注册的基准测试，按名称索引
+REGISTRY: Dict[str, "Benchmark"] = {}
+
+
+class SkipBenchmark(Exception):
+    """准备阶段抛出，表示当前环境无法运行该基准测试"""
+
+
+class Benchmark:
+    """一个已注册的基准测试"""
+
+    def __init__(self, name: str, setup: Callable[["Fixture"], Callable[[], Any]],
+                 group: str, ops: int, rounds: Optional[int]):
+        self.name = name
+        self.setup = setup
+        self.group = group
+        self.ops = ops
+        self.rounds = rounds
+
+
+def benchmark(group: str, ops: int = 1, rounds: Optional[int] = None,
+              name: Optional[str] = None) -> Callable:
+    """
+    注册基准测试
+
+    被装饰的函数接受 Fixture，完成准备工作后返回执行一轮的无参函数。
+
+    Args:
+        group: 分组名称，用于筛选和展示
+        ops: 每轮包含的操作数，用于计算单次操作耗时
+        rounds: 固定轮数，None表示按 --min-time 自动决定
+        name: 名称，默认使用函数名
+    """
+    def decorator(func: Callable[["Fixture"], Callable[[], Any]]) -> Callable:
+        bench_name = name or func.__name__
+        if bench_name in REGISTRY:
+            raise ValueError(f"基准测试重复注册: {bench_name}")
+        REGISTRY[bench_name] = Benchmark(bench_name, func, group, ops, rounds)
+        return func
+    return decorator
+
+
+class Fixture:
+    """
+    基准测试共享的资源
+
+    在整个运行过程中复用，注册的清理函数在结束时按相反顺序调用。
+    """
+
+    def __init__(self) -> None:
+        self._resources: Dict[str, Any] = {}
+        self._cleanups: List[Callable[[], None]] = []
+
+    def get(self, key: str, factory: Callable[[], Any],
+            cleanup: Optional[Callable[[Any], None]] = None) -> Any:
+        """
+        获取共享资源，第一次使用时创建
+
+        Args:
+            key: 资源名称
+            factory: 创建资源的函数
+            cleanup: 释放资源的函数
+        """
+        if key not in self._resources:
+            resource = self._resources[key] = factory()
+            if cleanup is not None:
+                self._cleanups.append(lambda: cleanup(resource))
+        return self._resources[key]
+
+    def close(self) -> None:
+        """释放所有资源"""
+        while self._cleanups:
+            self._cleanups.pop()()
+        self._resources.clear()
+
+
+def _calibrate(func: Callable[[], Any], min_time: float, max_rounds: int) -> int:
+    start = time.perf_counter()
+    func()
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    return max(5, min(max_rounds, int(min_time / elapsed)))
+
+
+def run_benchmark(bench: Benchmark, fixture: Fixture, min_time: float = 1.0,
+                  max_rounds: int = 10000, warmup: int = 1) -> Dict[str, Any]:
+    """
+    执行一个基准测试
+
+    Args:
+        bench: 基准测试
+        fixture: 共享资源
+        min_time: 自动决定轮数时的目标总耗时（秒）
+        max_rounds: 最大轮数
+        warmup: 预热轮数
+
+    Returns:
+        结果字典，耗时统计均为每次操作的秒数
+
+    Raises:
+        SkipBenchmark: 当前环境无法运行
+    """
+    func = bench.setup(fixture)
+    for _ in range(warmup):
+        func()
+    rounds = bench.rounds or _calibrate(func, min_time, max_rounds)
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) / bench.ops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    samples.sort()
+    mean = statistics.fmean(samples)
+    return {
+        "name": bench.name,
+        "group": bench.group,
+        "rounds": rounds,
+        "ops_per_round": bench.ops,
+        "min": samples[0],
+        "max": samples[-1],
+        "mean": mean,
+        "median": statistics.median(samples),
+        "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "ops": 1 / mean if mean > 0 else float("inf"),
+    }
+
+
+def machine_info() -> Dict[str, Any]:
+    """运行环境信息"""
+    from codemaokit import __version__
+    from codemaokit.jsonlib import get_loads
+
+    return {
+        "sdk_version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "json_decoder": getattr(get_loads(None), "__module__", "json"),
+    }
+
+
+def save_results(path: str, results: List[Dict[str, Any]]) -> None:
+    """保存结果为 JSON"""
+    document = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "machine": machine_info(),
+        "benchmarks": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def compare(baseline_path: str, results: List[Dict[str, Any]],
+            threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    与之前保存的结果比较中位数
+
+    Args:
+        baseline_path: 基线结果文件
+        results: 本次结果
+        threshold: 判定为回归的变慢比例
+
+    Returns:
+        每个共同基准测试的 name、baseline、current、ratio 和 regression
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {item["name"]: item for item in json.load(f)["benchmarks"]}
+    rows = []
+    for item in results:
+        old = baseline.get(item["name"])
+        if old is None:
+            continue
+        ratio = item["median"] / old["median"] if old["median"] > 0 else float("inf")
+        rows.append({
+            "name": item["name"],
+            "baseline": old["median"],
+            "current": item["median"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def format_seconds(value: float) -> str:
+    """把秒数格式化为合适的单位"""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if value >= scale:
+            return f"{value / scale:.3f}{unit}"
+    return f"{value / 1e-9:.1f}ns"
+
+
+def print_table(results: List[Dict[str, Any]], out: Any = sys.stdout) -> None:
+    """打印结果表格"""
+    width = max([len(item["name"]) for item in results] + [4])
+    out.write(f"{'name':<{width}}  {'median':>10}  {'p95':>10}  {'ops/s':>12}  rounds\n")
+    for item in results:
+        out.write(
+            f"{item['name']:<{width}}  {format_seconds(item['median']):>10}  "
+            f"{format_seconds(item['p95']):>10}  {item['ops']:>12.1f}  {item['rounds']}\n"
+        )
@@ -0,0 +1,73 @@
+"""
+运行基准测试
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --group models --compare results.json
+
+需要在仓库根目录运行，并且 codemaokit 可以导入（已安装或 PYTHONPATH=src）。
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from . import bench_client, bench_legacy, bench_models  # noqa: F401  注册基准测试
+from .harness import (
+    REGISTRY, Fixture, SkipBenchmark, compare, format_seconds, print_table, run_benchmark, save_results,
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口，存在回归时返回1"""
+    parser = argparse.ArgumentParser(description="运行 CodeMao SDK 基准测试")
+    parser.add_argument("--group", action="append", help="只运行指定分组，可重复")
+    parser.add_argument("-k", dest="keyword", help="只运行名称包含该字符串的基准测试")
+    parser.add_argument("--min-time", type=float, default=1.0,
+                        help="每个基准测试的目标耗时（秒）")
+    parser.add_argument("--output", help="结果保存路径（JSON）")
+    parser.add_argument("--compare", help="与之前保存的结果比较")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="中位数变慢超过该比例时判定为回归")
+    parser.add_argument("--list", action="store_true", help="列出所有基准测试")
+    args = parser.parse_args(argv)
+
+    selected = [
+        bench for bench in REGISTRY.values()
+        if (not args.group or bench.group in args.group)
+        and (not args.keyword or args.keyword in bench.name)
+    ]
+    if args.list:
+        for bench in selected:
+            print(f"{bench.group:<10} {bench.name}")
+        return 0
+
+    fixture = Fixture()
+    results = []
+    try:
+        for bench in selected:
+            print(f"运行 {bench.name} ...", file=sys.stderr)
+            try:
+                results.append(run_benchmark(bench, fixture, min_time=args.min_time))
+            except SkipBenchmark as e:
+                print(f"跳过 {bench.name}: {e}", file=sys.stderr)
+    finally:
+        fixture.close()
+
+    print_table(results)
+    if args.output:
+        save_results(args.output, results)
+
+    if args.compare:
+        rows = compare(args.compare, results, args.threshold)
+        print()
+        for row in rows:
+            mark = "  回归" if row["regression"] else ""
+            print(f"{row['name']:<30} {format_seconds(row['baseline']):>10} -> "
+                  f"{format_seconds(row['current']):>10}  x{row['ratio']:.2f}{mark}")
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,87 +1,161 @@
+import threading
+from http.cookiejar import DefaultCookiePolicy
 from typing import Union
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 
 
+# 接口地址，可改为本地模拟服务器的地址
+BASE_URL = 'https://api.codemao.cn'
+
+
 class UserError(Exception):
     ...
 
 
+class _NoCookiePolicy(DefaultCookiePolicy):
+    """共享会话不保存响应的Cookie，登录状态由每个 user 自己传入"""
+
+    def set_ok(self, cookie, request):
+        return False
+
+
+# 所有请求共用一个会话，复用连接，避免每次调用都重新建立TCP/TLS连接
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+_session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+_session.cookies.set_policy(_NoCookiePolicy())
+_session.headers.update({
+    "Content-Type": "application/json",
+    "User-Agent": 'Mozilla/5.0 (Windows NT 10.0; ) '
+                  'AppleWebKit/537.36 (KHTML, like Gecko) '
+                  'Chrome/81.0.4044.138 Safari/537.36'
+})
+
+
 def _post(url: str, data=None, cookies=None):
-    if cookies is None:
-        cookies = {}
     if data is None:
         data = {}
-    return requests.post('https://api.codemao.cn' + url, data=json.dumps(data),
-                         headers={
-                             "Content-Type": "application/json",
-                             "User-Agent": 'Mozilla/5.0 (Windows NT 10.0; ) '
-                                           'AppleWebKit/537.36 (KHTML, like Gecko) '
-                                           'Chrome/81.0.4044.138 Safari/537.36'
-                         },
-                         cookies=cookies
-                         )
+    return _session.post(BASE_URL + url, data=json.dumps(data), cookies=cookies)
 
 
 def _get(url: str, cookies=None):
-    if cookies is None:
-        cookies = {}
-    return requests.get('https://api.codemao.cn' + url,
-                        headers={
-                            "Content-Type": "application/json",
-                            "User-Agent": 'Mozilla/5.0 (Windows NT 10.0; ) '
-                                          'AppleWebKit/537.36 (KHTML, like Gecko) '
-                                          'Chrome/81.0.4044.138 Safari/537.36'
-                        },
-                        cookies=cookies
-                        )
+    return _session.get(BASE_URL + url, cookies=cookies)
+
+
+def _stream(url: str, item):
+    """流式请求列表接口，items 中的元素每到达一个就转换并产出，不把整个响应读入内存"""
+    # 延迟导入，未安装 codemaokit 时模块的其余部分仍可使用
+    from codemaokit.streaming import iter_items
+    with _session.get(BASE_URL + url, stream=True) as response:
+        if response.status_code == 404:
+            raise UserError('您访问的资源不存在')
+        for data in iter_items(response.iter_content(chunk_size=16 * 1024)):
+            yield item(data)
 
 
 def _patch(url: str, data=None, cookies=None):
-    if cookies is None:
-        cookies = {}
     if data is None:
         data = {}
-    return requests.patch('https://api.codemao.cn' + url, data=json.dumps(data),
-                          headers={
-                              "Content-Type": "application/json",
-                              "User-Agent": 'Mozilla/5.0 (Windows NT 10.0; ) '
-                                            'AppleWebKit/537.36 (KHTML, like Gecko) '
-                                            'Chrome/81.0.4044.138 Safari/537.36'
-                          },
-                          cookies=cookies
-                          )
+    return _session.patch(BASE_URL + url, data=json.dumps(data), cookies=cookies)
 
 
 def _delete(url: str, data=None, cookies=None):
-    if cookies is None:
-        cookies = {}
     if data is None:
         data = {}
-    return requests.delete('https://api.codemao.cn' + url, data=json.dumps(data),
-                           headers={
-                               "Content-Type": "application/json",
-                               "User-Agent": 'Mozilla/5.0 (Windows NT 10.0; ) '
-                                             'AppleWebKit/537.36 (KHTML, like Gecko) '
-                                             'Chrome/81.0.4044.138 Safari/537.36'
-                           },
-                           cookies=cookies
-                           )
+    return _session.delete(BASE_URL + url, data=json.dumps(data), cookies=cookies)
+
+
+class _board_item:
+    def __init__(self, data):
+        self.data: dict = data
+        self.id: str = data['id']
+        self.name: str = data['name']
+        self.icon_url: str = data['icon_url']
+        self.is_hot: str = data['is_hot']
+
+
+class _work_item:
+    def __init__(self, data: dict):
+        self.data = data
+        self.id: int = data['id']
+        self.type: int = data['type']
+        self.work_name: str = data['work_name']
+        self.preview: str = data['preview']
+        self.view_times: int = data['view_times']
+        self.collect_times: int = data['collect_times']
+        self.liked_times: int = data['liked_times']
+        self.parent_id: int = data['parent_id']
+        self.fork_enable: bool = data['fork_enable']
+        self.fork_times: int = data['fork_times']
+        self.publish_time: int = data['publish_time']
+        self.description: str = data['description']
+
+
+class _collection_item:
+    def __init__(self, data: dict):
+        self.data = data
+        self.id: int = data['id']
+        self.name: str = data['name']
+        self.preview: str = data['preview']
+        self.user_id: int = data['user_id']
+        self.nickname: str = data['nickname']
+        self.avatar_url: str = data['avatar_url']
+        self.views_count: int = data['views_count']
+        self.likes_count: int = data['likes_count']
+        self.collections_count: int = data['collections_count']
+        self.is_deleted: bool = data['is_deleted']
+        self.publish_time: int = data['publish_time']
+        self.work_type: int = data['work_type']
+        self.description: str = data['description']
+
+
+class _follower_item:
+    def __init__(self, data: dict):
+        self.data = data
+        self.id: int = data['id']
+        self.nickname: str = data['nickname']
+        self.avatar_url: str = data['avatar_url']
+        self.n_works: int = data['n_works']
+        self.total_likes: int = data['total_likes']
+        self.is_followed: bool = data['is_followed']
+        self.description: str = data['description']
+
+
+class _fan_item:
+    def __init__(self, data: dict):
+        self.data = data
+        self.id: int = data['id']
+        self.nickname: str = data['nickname']
+        self.avatar_url: str = data['avatar_url']
+        self.total_likes: int = data['total_likes']
+        self.is_followed: bool = data['is_followed']
+        self.description: str = data['description']
+
+
+class _lazy_boards:
+    """板块列表在第一次访问时加载，按 BASE_URL 缓存，导入模块时不发请求"""
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def __get__(self, instance, owner):
+        base_url = BASE_URL
+        boards = self._cache.get(base_url)
+        if boards is None:
+            with self._lock:
+                boards = self._cache.get(base_url)
+                if boards is None:
+                    items = _get('/web/forums/boards/simples/all').json()['items']
+                    boards = self._cache[base_url] = [_board_item(item) for item in items]
+        return boards
 
 
 class board:
-    boards: list = []
-    for item in _get('/web/forums/boards/simples/all').json()['items']:
-        class board:
-            def __init__(self, data):
-                self.data: dict = data
-                self.id: str = data['id']
-                self.name: str = data['name']
-                self.icon_url: str = data['icon_url']
-                self.is_hot: str = data['is_hot']
-
-        boards += [board(item)]
+    boards = _lazy_boards()
 
     def getBoardById(self, board_id: Union[str, int]):
         data = _get('/web/forums/boards/' + str(board_id)).json()
@@ -350,8 +424,9 @@ class user:
 
 
 class another:
-    def __init__(self, user_id: Union[str, int]):
+    def __init__(self, user_id: Union[str, int], load_lists: bool = True):
         self.user_id = user_id
+        self.load_lists = load_lists
         self.__data = {}
         data = _get('/api/user/info/detail/' + str(user_id)).json()
         if data['code'] == 404:
@@ -394,6 +469,10 @@ class another:
         self.honor.like_score = data['like_score']
         self.honor.collect_score = data['collect_score']
         self.honor.fork_score = data['fork_score']
+        if not load_lists:
+            # 列表改用 streamWorks 等方法按需流式获取
+            self.__log('获取信息成功')
+            return
         data = _get(f'/creation-tools/v1/user/center/work-list?user_id={str(user_id)}&offset=1&limit=200').json()
         self.works.data = data
         for __item in range(len(data['items'])):
@@ -453,89 +532,57 @@ class another:
         items: list = []
 
         def getItem(self, number: int):
-            class item:
-                def __init__(self, data: dict):
-                    self.data = data
-                    self.id: int = data['id']
-                    self.type: int = data['type']
-                    self.work_name: str = data['work_name']
-                    self.preview: str = data['preview']
-                    self.view_times: int = data['view_times']
-                    self.collect_times: int = data['collect_times']
-                    self.liked_times: int = data['liked_times']
-                    self.parent_id: int = data['parent_id']
-                    self.fork_enable: bool = data['fork_enable']
-                    self.fork_times: int = data['fork_times']
-                    self.publish_time: int = data['publish_time']
-                    self.description: str = data['description']
-
-            return item(self.data['items'][number - 1])
+            return _work_item(self.data['items'][number - 1])
 
     class collections:
         data: dict = {}
         items: list = []
 
         def getItem(self, number: int):
-            class item:
-                def __init__(self, data: dict):
-                    self.data = data
-                    self.id: int = data['id']
-                    self.name: str = data['name']
-                    self.preview: str = data['preview']
-                    self.user_id: int = data['user_id']
-                    self.nickname: str = data['nickname']
-                    self.avatar_url: str = data['avatar_url']
-                    self.views_count: int = data['views_count']
-                    self.likes_count: int = data['likes_count']
-                    self.collections_count: int = data['collections_count']
-                    self.is_deleted: bool = data['is_deleted']
-                    self.publish_time: int = data['publish_time']
-                    self.work_type: int = data['work_type']
-                    self.description: str = data['description']
-
-            return item(self.data['items'][number - 1])
+            return _collection_item(self.data['items'][number - 1])
 
     class followers:
         data: dict = {}
         items: list = []
 
         def getItem(self, number: int):
-            class item:
-                def __init__(self, data: dict):
-                    self.data = data
-                    self.id: int = data['id']
-                    self.nickname: str = data['nickname']
-                    self.avatar_url: str = data['avatar_url']
-                    self.n_works: int = data['n_works']
-                    self.total_likes: int = data['total_likes']
-                    self.is_followed: bool = data['is_followed']
-                    self.description: str = data['description']
-
-            return item(self.data['items'][number - 1])
+            return _follower_item(self.data['items'][number - 1])
 
     class fans:
         data: dict = {}
         items: list = []
 
         def getItem(self, number: int):
-            class item:
-                def __init__(self, data: dict):
-                    self.data = data
-                    self.id: int = data['id']
-                    self.nickname: str = data['nickname']
-                    self.avatar_url: str = data['avatar_url']
-                    self.total_likes: int = data['total_likes']
-                    self.is_followed: bool = data['is_followed']
-                    self.description: str = data['description']
-
-            return item(self.data['items'][number - 1])
+            return _fan_item(self.data['items'][number - 1])
 
     def __log(self, value: str):
         if self.info.id:
             print(f'{self.info.id}: {value}')
 
+    def streamWorks(self, offset: int = 0, limit: int = 200):
+        """流式获取作品列表，逐个产出作品"""
+        return _stream('/creation-tools/v1/user/center/work-list'
+                       f'?user_id={str(self.user_id)}&offset={offset}&limit={limit}', _work_item)
+
+    def streamCollections(self, offset: int = 0, limit: int = 200):
+        """流式获取收藏列表，逐个产出收藏的作品"""
+        return _stream('/creation-tools/v1/user/center/collect/list'
+                       f'?user_id={str(self.user_id)}&offset={offset}&limit={limit}',
+                       _collection_item)
+
+    def streamFollowers(self, offset: int = 0, limit: int = 200):
+        """流式获取关注列表，逐个产出关注的用户"""
+        return _stream('/creation-tools/v1/user/followers'
+                       f'?user_id={str(self.user_id)}&offset={offset}&limit={limit}',
+                       _follower_item)
+
+    def streamFans(self, offset: int = 0, limit: int = 200):
+        """流式获取粉丝列表，逐个产出粉丝"""
+        return _stream('/creation-tools/v1/user/fans'
+                       f'?user_id={str(self.user_id)}&offset={offset}&limit={limit}', _fan_item)
+
     def reload(self):
-        self.__init__(self.user_id)
+        self.__init__(self.user_id, self.load_lists)
 
 
 class post:
@@ -9,8 +9,18 @@ CodeMao SDK for Python
 """
 
 from .client import CodeMaoClient
+from .async_client import AsyncCodeMaoClient
 from .models import User, Post, Board, Work
-from .exceptions import CodeMaoError, AuthenticationError, APIError
+from .exceptions import (
+    CodeMaoError, AuthenticationError, APIError, RateLimitError, DeadlineExceededError
+)
+from .ratelimit import RateLimiter
+from .circuitbreaker import CircuitBreaker
+from .deadline import Deadline
+from .hedging import HedgingPolicy
+from .middleware import Middleware, RequestContext
+from .metrics import MetricsRegistry
+from .pool import SessionPool
 
 __version__ = "1.0.0"
 __author__ = "nichengfuben"
@@ -18,11 +28,22 @@ __license__ = "MIT"
 
 __all__ = [
     "CodeMaoClient",
+    "AsyncCodeMaoClient",
     "User", 
     "Post",
     "Board", 
     "Work",
     "CodeMaoError",
     "AuthenticationError",
-    "APIError"
+    "APIError",
+    "RateLimitError",
+    "DeadlineExceededError",
+    "RateLimiter",
+    "CircuitBreaker",
+    "Deadline",
+    "HedgingPolicy",
+    "Middleware",
+    "RequestContext",
+    "MetricsRegistry",
+    "SessionPool"
 ]
\ No newline at end of file
@@ -0,0 +1,515 @@
+"""
+CodeMao 异步客户端类
+"""
+
+import asyncio
+import logging
+from typing import Optional, Dict, Any, List, Union, Callable
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - 可选依赖
+    aiohttp = None
+
+from .client import CodeMaoClient, check_api_error
+from .models import User, Board, MessageStats
+from .exceptions import (
+    AuthenticationError, APIError,
+    ValidationError, ResourceNotFoundError, NetworkError, RateLimitError
+)
+from .jsonlib import get_loads, body_preview
+from .utils import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCodeMaoClient:
+    """
+    CodeMao SDK异步客户端
+
+    与 CodeMaoClient 提供相同的方法，所有请求共用一个 aiohttp 连接池。
+    需要安装可选依赖: pip install codemao-sdk[async]
+
+    示例:
+        >>> async with AsyncCodeMaoClient() as client:
+        ...     await client.login("username", "password")
+        ...     boards = await client.get_boards()
+    """
+
+    BASE_URL = CodeMaoClient.BASE_URL
+    USER_AGENT = CodeMaoClient.USER_AGENT
+
+    # 仅对幂等请求在服务器错误时重试
+    RETRY_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+    RETRY_STATUS = frozenset({500, 502, 503, 504})
+
+    def __init__(self, timeout: int = 30, max_retries: int = 3,
+                 connection_limit: int = 100,
+                 connection_limit_per_host: int = 0,
+                 json_decoder: Union[str, Callable[[bytes], Any], None] = None,
+                 base_url: Optional[str] = None):
+        """
+        初始化客户端
+
+        Args:
+            timeout: 请求超时时间（秒）
+            max_retries: 最大重试次数
+            connection_limit: 连接池总连接数上限
+            connection_limit_per_host: 单个主机的连接数上限（0表示不限制）
+            json_decoder: JSON解码器名称或接受 bytes 的解码函数，None表示自动选择
+            base_url: API地址（例如本地模拟服务器），None表示使用 BASE_URL
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncCodeMaoClient 需要 aiohttp，请执行: pip install codemao-sdk[async]"
+            )
+
+        if base_url is not None:
+            self.BASE_URL = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self._session: Optional["aiohttp.ClientSession"] = None
+        if callable(json_decoder):
+            self._json_loads = json_decoder
+        else:
+            self._json_loads = get_loads(json_decoder)
+
+        # 用户状态
+        self.is_authenticated = False
+        self.current_user: Optional[User] = None
+        self.auth_token: Optional[str] = None
+        self.cookies: Dict[str, str] = {}
+
+        # 缓存
+        self._boards_cache: Optional[List[Board]] = None
+        self._board_ids: Dict[str, str] = {}
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """获取（必要时创建）共享的HTTP会话"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit_per_host,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    "User-Agent": self.USER_AGENT,
+                    "Content-Type": "application/json",
+                    "Accept": "application/json"
+                },
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """关闭HTTP会话及其连接池"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _request(self, method: str, endpoint: str,
+                       data: Optional[Dict[str, Any]] = None,
+                       params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        发送HTTP请求
+
+        Args:
+            method: 请求方法 (GET, POST, PATCH, DELETE)
+            endpoint: API端点
+            data: 请求数据
+            params: URL参数
+
+        Returns:
+            API响应数据
+
+        Raises:
+            NetworkError: 网络连接失败
+            APIError: API返回错误
+        """
+        url = f"{self.BASE_URL}{endpoint}"
+        session = self._get_session()
+        retries = self.max_retries if method in self.RETRY_METHODS else 0
+
+        for attempt in range(retries + 1):
+            try:
+                async with session.request(
+                    method,
+                    url,
+                    json=data if data else None,
+                    params=params,
+                    cookies=self.cookies,
+                ) as response:
+                    status = response.status
+                    if status in self.RETRY_STATUS and attempt < retries:
+                        await asyncio.sleep(2 ** attempt)
+                        continue
+
+                    # 检查响应状态
+                    if status == 404:
+                        raise ResourceNotFoundError(f"资源不存在: {endpoint}")
+                    elif status == 401:
+                        self.is_authenticated = False
+                        raise AuthenticationError("认证失败，请重新登录")
+                    elif status == 429:
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+                        raise RateLimitError(
+                            "请求过于频繁，请稍后再试", retry_after=retry_after
+                        )
+                    elif status >= 500:
+                        raise NetworkError(f"服务器错误: {status}")
+
+                    body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt < retries:
+                    await asyncio.sleep(2 ** attempt)
+                    continue
+                raise NetworkError(f"网络请求失败: {str(e)}")
+
+            # 解析响应数据
+            try:
+                response_data = self._json_loads(body)
+            except ValueError:
+                raise APIError(f"无效的JSON响应: {body_preview(body)}")
+
+            # 检查API错误
+            check_api_error(response_data)
+            return response_data
+
+        raise NetworkError(f"网络请求失败: {endpoint}")  # pragma: no cover
+
+    async def login(self, identity: str, password: str) -> User:
+        """
+        用户登录
+
+        Args:
+            identity: 用户名、邮箱或手机号
+            password: 密码
+
+        Returns:
+            当前用户对象
+
+        Raises:
+            AuthenticationError: 登录失败
+        """
+        login_data = {
+            "identity": identity,
+            "password": password,
+            "pid": "65edCTyg"
+        }
+
+        try:
+            response = await self._request(
+                "POST", "/tiger/v3/web/accounts/login", login_data
+            )
+
+            # 保存认证信息
+            self.cookies = {
+                cookie.key: cookie.value
+                for cookie in self._get_session().cookie_jar
+            }
+            self.auth_token = response.get('auth', {}).get('token')
+            self.is_authenticated = True
+
+            # 创建用户对象
+            user_info = response.get('user_info', {})
+            self.current_user = User.from_dict(user_info)
+
+            logger.info(f"用户 {self.current_user.nickname} 登录成功")
+            return self.current_user
+
+        except APIError as e:
+            if e.error_code == 2:
+                raise AuthenticationError("用户不存在或密码错误")
+            raise AuthenticationError(f"登录失败: {e.message}")
+
+    async def logout(self) -> None:
+        """用户登出"""
+        if not self.is_authenticated:
+            return
+
+        try:
+            await self._request("POST", "/tiger/v3/web/accounts/logout")
+        except Exception as e:
+            logger.warning(f"登出时出错: {e}")
+        finally:
+            self.is_authenticated = False
+            self.current_user = None
+            self.auth_token = None
+            self.cookies = {}
+            if self._session is not None:
+                self._session.cookie_jar.clear()
+            logger.info("用户已登出")
+
+    async def get_current_user(self) -> Optional[User]:
+        """获取当前登录用户"""
+        if not self.is_authenticated:
+            return None
+
+        if self.current_user:
+            return self.current_user
+
+        # 重新获取用户信息
+        try:
+            response = await self._request("GET", "/api/user/info")
+            user_data = response.get('data', {}).get('userInfo', {})
+            self.current_user = User.from_dict(user_data)
+            return self.current_user
+        except Exception as e:
+            logger.error(f"获取用户信息失败: {e}")
+            return None
+
+    async def get_boards(self, refresh: bool = False) -> List[Board]:
+        """
+        获取所有论坛板块
+
+        Args:
+            refresh: 是否强制刷新缓存
+
+        Returns:
+            板块列表
+        """
+        if self._boards_cache and not refresh:
+            return self._boards_cache
+
+        try:
+            response = await self._request("GET", "/web/forums/boards/simples/all")
+            boards_data = response.get('items', [])
+
+            boards = [Board.from_dict(board_data) for board_data in boards_data]
+            board_ids: Dict[str, str] = {}
+            for board in boards:
+                board_ids.setdefault(board.name, str(board.id))
+            self._boards_cache = boards
+            self._board_ids = board_ids
+
+            return boards
+        except (AuthenticationError, RateLimitError, NetworkError):
+            raise
+        except Exception as e:
+            logger.error(f"获取板块列表失败: {e}")
+            raise APIError(f"获取板块列表失败: {e}")
+
+    async def get_board_by_id(self, board_id: Union[str, int]) -> Board:
+        """
+        根据ID获取板块信息
+
+        Args:
+            board_id: 板块ID
+
+        Returns:
+            板块对象
+        """
+        try:
+            response = await self._request("GET", f"/web/forums/boards/{board_id}")
+            return Board.from_dict(response)
+        except ResourceNotFoundError:
+            raise ResourceNotFoundError(f"板块不存在: {board_id}")
+        except (AuthenticationError, RateLimitError, NetworkError):
+            raise
+        except Exception as e:
+            logger.error(f"获取板块信息失败: {e}")
+            raise APIError(f"获取板块信息失败: {e}")
+
+    async def get_board_by_name(self, board_name: str) -> Board:
+        """
+        根据名称获取板块信息
+
+        Args:
+            board_name: 板块名称
+
+        Returns:
+            板块对象
+
+        Raises:
+            ResourceNotFoundError: 板块不存在
+        """
+        return await self.get_board_by_id(await self._resolve_board_id(board_name))
+
+    async def _resolve_board_id(self, board_name: str) -> str:
+        """
+        根据板块名称查找板块ID，板块列表已缓存时不发起网络请求
+
+        Raises:
+            ResourceNotFoundError: 板块不存在
+        """
+        await self.get_boards()
+        board_id = self._board_ids.get(board_name)
+        if board_id is None:
+            raise ResourceNotFoundError(f"板块不存在: {board_name}")
+        return board_id
+
+    async def create_post(self, title: str, content: str,
+                          board_name: str, studio_id: Optional[str] = None) -> str:
+        """
+        发布帖子
+
+        Args:
+            title: 帖子标题（5-50字）
+            content: 帖子内容（最少10字）
+            board_name: 板块名称
+            studio_id: 工作室ID（可选）
+
+        Returns:
+            帖子ID
+
+        Raises:
+            ValidationError: 参数验证失败
+            AuthenticationError: 未登录
+        """
+        if not self.is_authenticated:
+            raise AuthenticationError("请先登录")
+
+        # 参数验证
+        if len(title) < 5 or len(title) > 50:
+            raise ValidationError("标题长度必须在5-50字之间")
+        if len(content) < 10:
+            raise ValidationError("内容长度必须不少于10字")
+
+        # 获取板块ID
+        board_id = await self._resolve_board_id(board_name)
+
+        post_data = {
+            "title": title,
+            "content": content,
+            "studio_id": studio_id
+        }
+
+        try:
+            response = await self._request(
+                "POST", f"/web/forums/boards/{board_id}/posts", post_data
+            )
+            post_id = response.get('id')
+
+            if post_id:
+                logger.info(f"用户 {self.current_user.nickname} 在板块 {board_name} 发布帖子成功")
+                return str(post_id)
+            else:
+                raise APIError("发布帖子失败，未返回帖子ID")
+
+        except APIError as e:
+            if e.error_code == 'Param-Invalid@Common':
+                raise ValidationError("请求参数验证失败")
+            raise APIError(f"发布帖子失败: {e.message}")
+
+    async def delete_post(self, post_id: Union[str, int]) -> None:
+        """
+        删除帖子
+
+        Args:
+            post_id: 帖子ID
+
+        Raises:
+            AuthenticationError: 未登录
+            ResourceNotFoundError: 帖子不存在
+        """
+        if not self.is_authenticated:
+            raise AuthenticationError("请先登录")
+
+        try:
+            await self._request("DELETE", f"/web/forums/posts/{post_id}")
+            logger.info(f"用户 {self.current_user.nickname} 删除帖子 {post_id} 成功")
+        except ResourceNotFoundError:
+            raise ResourceNotFoundError(f"帖子不存在: {post_id}")
+        except (AuthenticationError, RateLimitError, NetworkError):
+            raise
+        except Exception as e:
+            logger.error(f"删除帖子失败: {e}")
+            raise APIError(f"删除帖子失败: {e}")
+
+    async def reply_to_post(self, post_id: Union[str, int], content: str) -> str:
+        """
+        回复帖子
+
+        Args:
+            post_id: 帖子ID
+            content: 回复内容
+
+        Returns:
+            回复ID
+        """
+        if not self.is_authenticated:
+            raise AuthenticationError("请先登录")
+
+        reply_data = {"content": content}
+
+        try:
+            response = await self._request(
+                "POST", f"/web/forums/posts/{post_id}/replies", reply_data
+            )
+            reply_id = response.get('id')
+
+            if reply_id:
+                logger.info(f"用户 {self.current_user.nickname} 回复帖子 {post_id} 成功")
+                return str(reply_id)
+            else:
+                raise APIError("回复帖子失败，未返回回复ID")
+
+        except APIError as e:
+            raise APIError(f"回复帖子失败: {e.message}")
+
+    async def get_message_stats(self) -> MessageStats:
+        """
+        获取消息统计
+
+        Returns:
+            消息统计对象
+        """
+        if not self.is_authenticated:
+            raise AuthenticationError("请先登录")
+
+        try:
+            response = await self._request("GET", "/web/message-record/count")
+            return MessageStats.from_dict(response)
+        except (AuthenticationError, RateLimitError, NetworkError):
+            raise
+        except Exception as e:
+            logger.error(f"获取消息统计失败: {e}")
+            raise APIError(f"获取消息统计失败: {e}")
+
+    async def update_user_info(self, **kwargs) -> None:
+        """
+        更新用户信息
+
+        Args:
+            **kwargs: 要更新的字段（nickname, fullname, description, sex, birthday, avatar_url）
+
+        Raises:
+            AuthenticationError: 未登录
+            ValidationError: 参数验证失败
+        """
+        if not self.is_authenticated:
+            raise AuthenticationError("请先登录")
+
+        # 验证参数
+        valid_fields = {'nickname', 'fullname', 'description', 'sex', 'birthday', 'avatar_url'}
+        invalid_fields = set(kwargs.keys()) - valid_fields
+        if invalid_fields:
+            raise ValidationError(f"无效的字段: {invalid_fields}")
+
+        # 更新每个字段
+        for field, value in kwargs.items():
+            try:
+                await self._request(
+                    "PATCH", f"/tiger/v3/web/accounts/{field}", {field: value}
+                )
+                logger.info(f"用户 {self.current_user.nickname} 更新 {field} 成功")
+            except APIError as e:
+                if e.error_code == 5:
+                    raise ValidationError(f"字段 {field} 格式错误")
+                raise APIError(f"更新 {field} 失败: {e.message}")
+
+    async def __aenter__(self):
+        """异步上下文管理器支持"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """异步上下文管理器清理"""
+        try:
+            await self.logout()
+        finally:
+            await self.close()
@@ -0,0 +1,26 @@
+"""
+CodeMao 登录状态
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from .models import User
+
+
+@dataclass(frozen=True)
+class AuthState:
+    """
+    登录状态快照
+
+    客户端持有当前快照的引用，登录、登出和认证失败时整体替换为新快照，
+    读取时不需要加锁，也不会看到新旧状态混合的结果。
+    每次登录或登出 generation 加一，用于识别基于旧登录状态发出的请求。
+    """
+
+    generation: int = 0
+    is_authenticated: bool = False
+    user: Optional[User] = None
+    token: Optional[str] = None
+    # 快照之间不共享，不要原地修改
+    cookies: Dict[str, str] = field(default_factory=dict)
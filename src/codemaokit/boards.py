@@ -0,0 +1,216 @@
+"""
+CodeMao 板块目录缓存
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .models import Board
+
+logger = logging.getLogger(__name__)
+
+# 板块列表在后台刷新队列中的键
+_ALL_BOARDS = "*"
+
+
+def _call(fetch: Callable[..., Any], *args: Any, deadline: Any = None,
+          refresh: bool = False) -> Any:
+    """
+    调用获取函数
+
+    只在有截止时间时传入 deadline、需要跳过响应缓存时传入 refresh，
+    兼容不接受这些参数的函数。
+    """
+    kwargs: Dict[str, Any] = {}
+    if deadline is not None:
+        kwargs["deadline"] = deadline
+    if refresh:
+        kwargs["refresh"] = True
+    return fetch(*args, **kwargs)
+
+
+class BoardCatalog:
+    """
+    板块目录
+
+    缓存板块列表和板块详情，并维护名称→ID和ID→板块的索引。
+    设置软过期时间后，过期条目仍立即返回，
+    同时由唯一的后台线程刷新，调用方不会等待板块元数据。
+    未设置软过期时间时，板块列表永久缓存，板块详情不缓存。
+    """
+
+    def __init__(self, fetch_boards: Callable[..., List[Board]],
+                 fetch_board: Callable[..., Board],
+                 soft_ttl: Optional[float] = None):
+        """
+        初始化板块目录
+
+        Args:
+            fetch_boards: 从服务器获取板块列表的函数，同步加载且有截止时间时传入 deadline 参数，
+                强制刷新时传入 refresh=True（应跳过响应缓存）
+            fetch_board: 从服务器获取单个板块详情的函数，参数同 fetch_boards
+            soft_ttl: 软过期时间（秒），None表示不自动刷新
+        """
+        self.soft_ttl = soft_ttl
+        self._fetch_boards = fetch_boards
+        self._fetch_board = fetch_board
+        self._lock = threading.Lock()
+        self._boards: Optional[List[Board]] = None
+        self._boards_loaded_at = 0.0
+        self._ids_by_name: Dict[str, str] = {}
+        self._boards_by_id: Dict[str, Board] = {}
+        self._details: Dict[str, Tuple[Board, float]] = {}
+        self._pending: Set[str] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _is_stale(self, loaded_at: float) -> bool:
+        return (self.soft_ttl is not None
+                and time.monotonic() - loaded_at >= self.soft_ttl)
+
+    def _load_boards(self, deadline: Any = None, refresh: bool = False) -> List[Board]:
+        boards = _call(self._fetch_boards, deadline=deadline, refresh=refresh)
+        boards_by_id = {str(board.id): board for board in boards}
+        # 同名板块以列表中第一个为准，与线性查找的结果一致
+        ids_by_name: Dict[str, str] = {}
+        for board in boards:
+            ids_by_name.setdefault(board.name, str(board.id))
+        with self._lock:
+            self._boards = boards
+            self._boards_by_id = boards_by_id
+            self._ids_by_name = ids_by_name
+            self._boards_loaded_at = time.monotonic()
+        return boards
+
+    def _load_board(self, board_id: str, deadline: Any = None,
+                    refresh: bool = False) -> Board:
+        board = _call(self._fetch_board, board_id, deadline=deadline, refresh=refresh)
+        with self._lock:
+            self._details[board_id] = (board, time.monotonic())
+        return board
+
+    def _schedule(self, key: str, loader: Callable[[], object]) -> None:
+        """安排后台刷新，同一条目同时只刷新一次"""
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="codemao-boards"
+                )
+            executor = self._executor
+        executor.submit(self._refresh, key, loader)
+
+    def _refresh(self, key: str, loader: Callable[[], object]) -> None:
+        try:
+            loader()
+        except Exception as e:
+            logger.warning(f"后台刷新板块 {key} 失败，继续使用旧数据: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def get_boards(self, refresh: bool = False, deadline: Any = None) -> List[Board]:
+        """
+        获取板块列表
+
+        Args:
+            refresh: 是否同步刷新
+            deadline: 同步加载时传给获取函数的截止时间，后台刷新不受限制
+
+        Returns:
+            板块列表
+        """
+        boards = self._boards
+        if not boards or refresh:
+            return self._load_boards(deadline, refresh)
+        if self._is_stale(self._boards_loaded_at):
+            # 后台刷新必须绕过响应缓存，否则会拿回同一份旧数据
+            self._schedule(_ALL_BOARDS, lambda: self._load_boards(refresh=True))
+        return boards
+
+    def get_board(self, board_id: str, refresh: bool = False,
+                  deadline: Any = None) -> Board:
+        """
+        获取板块详情
+
+        Args:
+            board_id: 板块ID
+            refresh: 是否同步刷新
+            deadline: 同步加载时传给获取函数的截止时间，后台刷新不受限制
+
+        Returns:
+            板块对象
+        """
+        if self.soft_ttl is None:
+            return _call(self._fetch_board, board_id, deadline=deadline, refresh=refresh)
+
+        entry = self._details.get(board_id)
+        if entry is None or refresh:
+            return self._load_board(board_id, deadline, refresh)
+        board, loaded_at = entry
+        if self._is_stale(loaded_at):
+            self._schedule(board_id, lambda: self._load_board(board_id, refresh=True))
+        return board
+
+    def resolve_id(self, board_name: str) -> Optional[str]:
+        """
+        根据板块名称查找板块ID
+
+        板块列表已缓存时不发起网络请求。
+
+        Args:
+            board_name: 板块名称
+
+        Returns:
+            板块ID，不存在时返回None
+        """
+        self.get_boards()
+        return self._ids_by_name.get(board_name)
+
+    def find(self, board_id: str) -> Optional[Board]:
+        """
+        在板块列表中查找板块（只含列表字段，不发起详情请求）
+
+        Args:
+            board_id: 板块ID
+
+        Returns:
+            板块对象，不存在时返回None
+        """
+        self.get_boards()
+        return self._boards_by_id.get(board_id)
+
+    def wait_refreshed(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待后台刷新完成
+
+        Returns:
+            是否在超时前完成
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._boards = None
+            self._boards_by_id = {}
+            self._ids_by_name = {}
+            self._details.clear()
+
+    def close(self) -> None:
+        """停止后台刷新线程"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,335 @@
+"""
+CodeMao 响应缓存
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+from .utils import endpoint_template
+
+# 默认可缓存的只读端点及其过期时间（秒）
+DEFAULT_TTLS: Dict[str, float] = {
+    "/web/forums/boards/simples/all": 300,
+    "/web/forums/boards/{id}": 60,
+    "/api/user/info/detail/{id}": 60,
+    "/creation-tools/v1/user/center/honor": 60,
+    "/creation-tools/v1/user/center/work-list": 30,
+    "/creation-tools/v1/user/center/collect/list": 30,
+    "/creation-tools/v1/user/followers": 30,
+    "/creation-tools/v1/user/fans": 30,
+}
+
+
+class CacheBackend:
+    """
+    缓存后端基类
+
+    后端负责存储、过期和按LRU淘汰，值为可JSON序列化的响应数据。
+    """
+
+    def get(self, key: str) -> Any:
+        """读取未过期的值，不存在时返回 None"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float,
+            size: Optional[int] = None) -> None:
+        """写入值，ttl 为过期秒数，size 为响应体字节数（None表示由后端估算）"""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """删除值"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """清空缓存"""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """返回条目数、占用字节数和淘汰次数"""
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """
+    内存缓存后端
+
+    按条目数和字节数双重限制，超出时淘汰最久未使用的条目。
+    命中时直接返回缓存的对象，调用方不应修改返回的数据。
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024):
+        """
+        初始化内存缓存
+
+        Args:
+            max_entries: 最大条目数
+            max_bytes: 最大占用字节数（按响应体字节数计算，未提供时按JSON编码长度估算）
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, size, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._bytes -= size
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float,
+            size: Optional[int] = None) -> None:
+        if size is None:
+            size = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (time.monotonic() + ttl, size, value)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "evictions": self._evictions,
+            }
+
+
+class SQLiteCache(CacheBackend):
+    """
+    本地磁盘缓存后端
+
+    使用SQLite存储JSON编码的响应，进程重启后仍可命中。
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000,
+                 max_bytes: int = 256 * 1024 * 1024):
+        """
+        初始化磁盘缓存
+
+        Args:
+            path: 数据库文件路径
+            max_entries: 最大条目数
+            max_bytes: 最大占用字节数
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed "
+                "ON responses (accessed_at)"
+            )
+
+    def get(self, key: str) -> Any:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            with self._conn:
+                if expires_at <= now:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                self._conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: float,
+            size: Optional[int] = None) -> None:
+        # 磁盘后端总要编码，按实际存储的字节数计算
+        encoded = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        size = len(encoded.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, size, now + ttl, now),
+            )
+            self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            self._evict()
+
+    def _evict(self) -> None:
+        """按最久未使用淘汰，直到满足条目数和字节数限制"""
+        entries, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if entries <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        for key, size in rows:
+            if entries <= self.max_entries and total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            entries -= 1
+            total -= size
+            self._evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"entries": entries, "bytes": total, "evictions": self._evictions}
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """
+    只读接口的响应缓存
+
+    按端点模板配置过期时间，只缓存配置过的GET端点。
+
+    示例:
+        >>> cache = ResponseCache(ttls={"/web/forums/boards/{id}": 120})
+        >>> client = CodeMaoClient(cache=cache)
+        >>> client.get_board_by_id(17)
+        >>> cache.stats()["hits"]
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None,
+                 ttls: Optional[Dict[str, float]] = None):
+        """
+        初始化响应缓存
+
+        Args:
+            backend: 缓存后端，默认使用 MemoryCache
+            ttls: 端点模板到过期时间（秒）的映射，与默认配置合并，
+                值为0表示不缓存该端点
+        """
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """生成缓存键"""
+        if not params:
+            return endpoint
+        return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+    def ttl_for(self, method: str, endpoint: str) -> float:
+        """获取端点的过期时间，不可缓存时返回0"""
+        if method != "GET":
+            return 0
+        return self.ttls.get(endpoint_template(endpoint), 0)
+
+    def get(self, method: str, endpoint: str,
+            params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        读取缓存
+
+        Returns:
+            缓存的响应数据，未命中时返回 None
+        """
+        if not self.ttl_for(method, endpoint):
+            return None
+        value = self.backend.get(self.make_key(endpoint, params))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, method: str, endpoint: str, params: Optional[Dict[str, Any]],
+            value: Any, size: Optional[int] = None) -> None:
+        """写入缓存，size 为响应体字节数"""
+        ttl = self.ttl_for(method, endpoint)
+        if not ttl:
+            return
+        self.backend.set(self.make_key(endpoint, params), value, ttl, size)
+
+    def invalidate(self, endpoint: str,
+                   params: Optional[Dict[str, Any]] = None) -> None:
+        """删除指定端点的缓存"""
+        self.backend.delete(self.make_key(endpoint, params))
+
+    def clear(self) -> None:
+        """清空缓存并重置计数"""
+        self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+
+        Returns:
+            包含 hits、misses、hit_rate 及后端条目数和字节数的字典
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        stats: Dict[str, Any] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+        }
+        stats.update(self.backend.stats())
+        return stats
@@ -0,0 +1,285 @@
+"""
+CodeMao 录制/回放传输层
+"""
+
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.response import HTTPResponse
+
+from .middleware import TimingAdapter
+
+# 录制时不保存的响应头：响应体以解码后的形式保存，长度在回放时重新计算
+_DROPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "set-cookie"}
+
+Latency = Union[float, Callable[[], float], None]
+
+
+class CassetteMissError(requests.exceptions.RequestException):
+    """回放时没有匹配的录制记录"""
+
+
+def request_key(method: str, url: str, body: Union[bytes, str, None] = None) -> str:
+    """
+    生成请求的匹配键
+
+    只使用路径和按名称排序的查询参数，不含主机名，
+    录制的记录可以在不同的 BASE_URL 下回放；请求体只保留摘要。
+
+    Args:
+        method: 请求方法
+        url: 完整URL
+        body: 请求体
+
+    Returns:
+        匹配键
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    key = f"{method.upper()} {parts.path}"
+    if query:
+        key += f"?{query}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        key += f" {hashlib.sha1(body).hexdigest()[:16]}"
+    return key
+
+
+class Cassette:
+    """
+    录制的请求/响应记录
+
+    以 JSON Lines 格式保存，每行一条记录；路径以 .gz 结尾时使用 gzip 压缩。
+    相同请求可以有多条记录，回放时按录制顺序依次返回，最后一条重复使用。
+
+    示例:
+        >>> cassette = Cassette("tests/cassettes/boards.jsonl.gz")
+        >>> client = CodeMaoClient(transport=RecordingTransport(cassette))
+        >>> client.get_boards()
+        >>> cassette.save()
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        初始化记录
+
+        Args:
+            path: 文件路径，文件存在时自动加载；None表示只在内存中保存
+        """
+        self.path = path
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _open(self, path: str, mode: str) -> Any:
+        if path.endswith(".gz"):
+            return gzip.open(path, mode + "t", encoding="utf-8")
+        return open(path, mode, encoding="utf-8")
+
+    def load(self, path: str) -> None:
+        """从文件加载记录"""
+        with self._open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["key"], []).append(entry)
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        保存记录
+
+        Args:
+            path: 文件路径，默认使用初始化时的路径
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("没有指定保存路径")
+        with self._lock:
+            entries = [entry for group in self._entries.values() for entry in group]
+        with self._open(path, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+
+    def record(self, key: str, status: int, headers: Dict[str, str],
+               content: bytes, elapsed: float) -> None:
+        """
+        添加一条记录
+
+        Args:
+            key: 请求匹配键
+            status: HTTP状态码
+            headers: 响应头
+            content: 解码后的响应体
+            elapsed: 从发送请求到收到响应头的秒数
+        """
+        try:
+            body, encoding = content.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode("ascii"), "base64"
+        entry = {
+            "key": key,
+            "status": status,
+            "headers": {
+                name: value for name, value in headers.items()
+                if name.lower() not in _DROPPED_HEADERS
+            },
+            "body": body,
+            "encoding": encoding,
+            "elapsed": round(elapsed, 6),
+        }
+        with self._lock:
+            self._entries.setdefault(key, []).append(entry)
+
+    def next(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        取出下一条匹配的记录
+
+        Returns:
+            记录，没有匹配时返回None
+        """
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            index = self._cursors.get(key, 0)
+            self._cursors[key] = index + 1
+            return entries[min(index, len(entries) - 1)]
+
+    def rewind(self) -> None:
+        """重置回放位置"""
+        with self._lock:
+            self._cursors.clear()
+
+
+def entry_content(entry: Dict[str, Any]) -> bytes:
+    """获取记录中的响应体"""
+    if entry["encoding"] == "base64":
+        return base64.b64decode(entry["body"])
+    return entry["body"].encode("utf-8")
+
+
+class RecordingTransport(TimingAdapter):
+    """
+    录制传输层
+
+    正常发送请求，同时把请求和响应写入记录。关闭会话时自动保存到文件。
+    """
+
+    def __init__(self, cassette: Cassette, **kwargs: Any):
+        """
+        初始化录制传输层
+
+        Args:
+            cassette: 写入的记录
+            **kwargs: 传给 HTTPAdapter 的参数
+        """
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request: requests.PreparedRequest,
+             **kwargs: Any) -> requests.Response:
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        elapsed = time.perf_counter() - start
+        # 读取响应体后 iter_content 仍然可用
+        content = response.content
+        self.cassette.record(
+            request_key(request.method, request.url, request.body),
+            response.status_code,
+            dict(response.headers),
+            content,
+            elapsed,
+        )
+        return response
+
+    def close(self) -> None:
+        super().close()
+        if self.cassette.path is not None:
+            self.cassette.save()
+
+
+class ReplayTransport(HTTPAdapter):
+    """
+    回放传输层
+
+    不访问网络，按请求匹配键返回录制的响应，可注入固定或随机延迟。
+    延迟超过请求的读取超时时，等待到超时后抛出 ReadTimeout，与真实网络的行为一致。
+    没有匹配的记录时抛出 CassetteMissError（客户端转换为 NetworkError，不重试）。
+
+    示例:
+        >>> import random
+        >>> transport = ReplayTransport(
+        ...     Cassette("boards.jsonl.gz"),
+        ...     latency=lambda: random.expovariate(1 / 0.05),
+        ... )
+        >>> client = CodeMaoClient(transport=transport)
+    """
+
+    def __init__(self, cassette: Cassette, latency: Latency = None,
+                 use_recorded_latency: bool = False):
+        """
+        初始化回放传输层
+
+        Args:
+            cassette: 读取的记录
+            latency: 每个响应的注入延迟（秒），或返回延迟的函数
+            use_recorded_latency: 是否按录制时的耗时延迟，与 latency 叠加
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency
+        self.use_recorded_latency = use_recorded_latency
+
+    def _delay(self, entry: Dict[str, Any]) -> float:
+        delay = self.latency() if callable(self.latency) else (self.latency or 0.0)
+        if self.use_recorded_latency:
+            delay += entry.get("elapsed", 0.0)
+        return delay
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False,
+             timeout: Any = None, verify: Any = True, cert: Any = None,
+             proxies: Any = None) -> requests.Response:
+        key = request_key(request.method, request.url, request.body)
+        entry = self.cassette.next(key)
+        if entry is None:
+            raise CassetteMissError(f"没有匹配的录制记录: {key}", request=request)
+
+        delay = self._delay(entry)
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.exceptions.ReadTimeout(
+                f"回放延迟 {delay:.3f} 秒超过读取超时", request=request
+            )
+        if delay > 0:
+            time.sleep(delay)
+
+        content = entry_content(entry)
+        headers = CaseInsensitiveDict(entry["headers"])
+        headers["Content-Length"] = str(len(content))
+        raw = HTTPResponse(
+            body=io.BytesIO(content),
+            headers=headers,
+            status=entry["status"],
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
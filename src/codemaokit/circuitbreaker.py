@@ -0,0 +1,175 @@
+"""
+CodeMao 端点分组熔断器
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .exceptions import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# (连续失败阈值, 冷却秒数)
+BreakerSpec = Tuple[int, float]
+
+
+class _Circuit:
+    """单个端点分组的熔断状态"""
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.successes = 0
+        self.probes = 0
+        self.opened_at = 0.0
+
+
+class CircuitBreaker:
+    """
+    按端点分组的熔断器
+
+    分组连续失败达到阈值后打开，打开期间请求直接抛出 CircuitOpenError，
+    不再等待超时和重试。冷却时间过后进入半开状态，只放行少量探测请求：
+    探测成功则关闭熔断器，探测失败则重新打开。
+    连接失败、超时和5xx响应计为失败，其余响应（包括4xx）都说明服务可用。
+
+    示例:
+        >>> breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=30,
+        ...                          group_settings={"forums": (3, 10)})
+        >>> client = CodeMaoClient(circuit_breaker=breaker)
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, success_threshold: int = 1,
+                 group_settings: Optional[Dict[str, BreakerSpec]] = None):
+        """
+        初始化熔断器
+
+        Args:
+            failure_threshold: 打开熔断器所需的连续失败次数
+            recovery_timeout: 打开后进入半开状态前的冷却时间（秒）
+            half_open_max_calls: 半开状态下同时允许的探测请求数
+            success_threshold: 半开状态下关闭熔断器所需的连续成功次数
+            group_settings: 端点分组的单独配置，值为 (连续失败阈值, 冷却秒数)
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold 必须大于0")
+        if half_open_max_calls < 1:
+            raise ValueError("half_open_max_calls 必须大于0")
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.group_settings = dict(group_settings or {})
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, group: str) -> _Circuit:
+        circuit = self._circuits.get(group)
+        if circuit is None:
+            threshold, timeout = self.group_settings.get(
+                group, (self.failure_threshold, self.recovery_timeout)
+            )
+            circuit = self._circuits[group] = _Circuit(threshold, timeout)
+        return circuit
+
+    def _open(self, group: str, circuit: _Circuit) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.probes = 0
+        circuit.successes = 0
+        logger.warning(
+            f"端点分组 {group} 连续失败 {circuit.failures} 次，"
+            f"熔断 {circuit.recovery_timeout} 秒"
+        )
+
+    def before_request(self, group: str = "default") -> None:
+        """
+        在发送请求前检查熔断状态
+
+        半开状态下放行的请求占用一个探测名额，必须随后调用
+        record_success 或 record_failure 归还。
+
+        Args:
+            group: 端点分组
+
+        Raises:
+            CircuitOpenError: 熔断器打开或探测名额已满
+        """
+        with self._lock:
+            circuit = self._circuit(group)
+            if circuit.state == CLOSED:
+                return
+            if circuit.state == OPEN:
+                remaining = circuit.opened_at + circuit.recovery_timeout - time.monotonic()
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"服务暂时不可用，{group} 分组已熔断", retry_after=remaining
+                    )
+                circuit.state = HALF_OPEN
+                circuit.probes = 0
+                circuit.successes = 0
+            if circuit.probes >= self.half_open_max_calls:
+                raise CircuitOpenError(
+                    f"服务暂时不可用，{group} 分组正在探测恢复", retry_after=0.0
+                )
+            circuit.probes += 1
+
+    def record_success(self, group: str = "default") -> None:
+        """记录一次成功的请求"""
+        with self._lock:
+            circuit = self._circuit(group)
+            if circuit.state == HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+                circuit.successes += 1
+                if circuit.successes >= self.success_threshold:
+                    circuit.state = CLOSED
+                    circuit.failures = 0
+                    logger.info(f"端点分组 {group} 已恢复")
+            else:
+                circuit.failures = 0
+
+    def record_failure(self, group: str = "default") -> None:
+        """记录一次失败的请求"""
+        with self._lock:
+            circuit = self._circuit(group)
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN:
+                self._open(group, circuit)
+            elif circuit.state == CLOSED and circuit.failures >= circuit.failure_threshold:
+                self._open(group, circuit)
+
+    def state(self, group: str = "default") -> str:
+        """
+        获取分组的熔断状态
+
+        Returns:
+            closed、open 或 half_open，冷却时间已过的打开状态报告为 half_open
+        """
+        with self._lock:
+            circuit = self._circuit(group)
+            if (circuit.state == OPEN and
+                    time.monotonic() - circuit.opened_at >= circuit.recovery_timeout):
+                return HALF_OPEN
+            return circuit.state
+
+    def reset(self, group: Optional[str] = None) -> None:
+        """
+        重置熔断状态
+
+        Args:
+            group: 端点分组，None表示重置所有分组
+        """
+        with self._lock:
+            if group is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(group, None)
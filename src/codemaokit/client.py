@@ -2,23 +2,94 @@
 CodeMao 主客户端类
 """
 
-import json
 import logging
-from typing import Optional, Dict, Any, List, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Optional, Dict, Any, List, Tuple, Union, Iterable, Iterator, Callable, TypeVar
+)
+from dataclasses import asdict, replace
+from functools import partial
 from datetime import datetime
 
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
-from .models import User, Board, Post, Work, MessageStats, UserHonor
+from .models import (
+    User, Board, Post, Work, MessageStats, UserHonor, UserBatchResult,
+    Collection, Follower
+)
 from .exceptions import (
     CodeMaoError, AuthenticationError, APIError, 
-    ValidationError, ResourceNotFoundError, NetworkError
+    ValidationError, ResourceNotFoundError, NetworkError, RateLimitError,
+    DeadlineExceededError
+)
+from .auth import AuthState
+from .boards import BoardCatalog
+from .cache import ResponseCache
+from .circuitbreaker import CircuitBreaker
+from .conditional import ValidatorStore
+from .deadline import Deadline, DeadlineLike
+from .hedging import HedgingPolicy
+from .metrics import MetricsRegistry
+from .middleware import (
+    Middleware, RequestContext, TimingAdapter, record_connect, run_chain,
+    run_stream_chain
 )
+from .jsonlib import get_loads, body_preview
+from .pagination import DEFAULT_PAGE_SIZE, PageIterator
+from .profile import (
+    COLLECTIONS, FANS, FOLLOWERS, HONOR, USER, WORKS, UserProfile
+)
+from .ratelimit import RateLimiter
+from .sessionfile import (
+    dump_cookies, load_cookies, read_session_file, write_session_file
+)
+from .singleflight import SingleFlight
+from .streaming import ItemStreamParser
+from .utils import endpoint_group, endpoint_template, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# 可安全重试的请求方法及触发重试的状态码
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE"})
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+# 单次退避的最长时间（秒）
+MAX_BACKOFF = 120.0
+
+LOGIN_ENDPOINT = "/tiger/v3/web/accounts/login"
+LOGOUT_ENDPOINT = "/tiger/v3/web/accounts/logout"
+
+
+def check_api_error(response_data: Any) -> None:
+    """
+    检查响应数据中的业务错误
+    
+    同步与异步客户端共用此逻辑，保证两者抛出相同的异常。
+    
+    Args:
+        response_data: 已解析的响应数据
+        
+    Raises:
+        ResourceNotFoundError: 资源不存在
+        AuthenticationError: 认证失败
+        APIError: 其他API错误
+    """
+    if isinstance(response_data, dict):
+        if response_data.get('error_code'):
+            error_msg = response_data.get('error_message', '未知错误')
+            error_code = response_data.get('error_code')
+            
+            if error_code == 'Not Found':
+                raise ResourceNotFoundError(error_msg)
+            elif '认证' in error_msg or '登录' in error_msg:
+                raise AuthenticationError(error_msg)
+            else:
+                raise APIError(error_msg, error_code, response_data)
+
 
 class CodeMaoClient:
     """
@@ -39,35 +110,111 @@ class CodeMaoClient:
         "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     )
     
-    def __init__(self, timeout: int = 30, max_retries: int = 3):
+    def __init__(self, timeout: float = 30, max_retries: int = 3,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 coalesce_requests: bool = False,
+                 cache: Optional[ResponseCache] = None,
+                 boards_ttl: Optional[float] = None,
+                 conditional_requests: bool = False,
+                 json_decoder: Union[str, Callable[[bytes], Any], None] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 connect_timeout: Optional[float] = None,
+                 deadline: Optional[float] = None,
+                 backoff_factor: float = 1.0,
+                 hedging: Optional[HedgingPolicy] = None,
+                 middlewares: Optional[Iterable[Middleware]] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 transport: Optional[HTTPAdapter] = None,
+                 base_url: Optional[str] = None,
+                 connection_pool_size: int = 10,
+                 connection_pool_maxsize: int = 20,
+                 connection_pool_block: bool = False,
+                 auto_reauth: Union[bool, Callable[[], Tuple[str, str]], None] = False):
         """
         初始化客户端
         
         Args:
-            timeout: 请求超时时间（秒）
-            max_retries: 最大重试次数
+            timeout: 单次请求的读取超时时间（秒）
+            max_retries: 最大重试次数（仅重试幂等请求的连接失败、超时和5xx响应）
+            rate_limiter: 客户端限流器，None表示不限流
+            coalesce_requests: 是否合并并发的相同GET请求
+            cache: 只读接口的响应缓存，None表示不缓存
+            boards_ttl: 板块元数据的软过期时间（秒），过期后先返回旧数据并在后台刷新，
+                None表示板块列表永久缓存且板块详情不缓存
+            conditional_requests: 是否对GET请求使用 ETag / If-Modified-Since 条件请求
+            json_decoder: JSON解码器名称（orjson、ujson、json）或接受 bytes 的解码函数，
+                None表示自动选择已安装的最快解码器
+            circuit_breaker: 按端点分组的熔断器，None表示不熔断
+            connect_timeout: 单次请求的连接超时时间（秒），None表示与 timeout 相同
+            deadline: 每次调用的默认截止时间（秒），覆盖连接、读取、重试和退避，
+                None表示不限制；各方法的 deadline 参数可单独覆盖
+            backoff_factor: 重试退避系数，第n次重试前等待 backoff_factor * 2^(n-1) 秒
+                （第一次重试立即进行）
+            hedging: 幂等GET请求的对冲策略，None表示不对冲
+            middlewares: 按顺序包裹每次API调用的中间件
+            metrics: 指标注册表，作为最外层中间件记录每次调用，None表示不统计
+            transport: 自定义传输层（例如 RecordingTransport / ReplayTransport），
+                None表示直接访问网络
+            base_url: API地址（例如本地模拟服务器），None表示使用 BASE_URL
+            connection_pool_size: 连接池缓存的主机数
+            connection_pool_maxsize: 每个主机保留的最大连接数，多线程共用客户端时应不小于线程数
+            connection_pool_block: 连接全部占用时是否等待空闲连接，False表示临时新建连接
+                （用完后丢弃）；使用自定义 transport 时以上三项不生效
+            auto_reauth: 登录失效（401）时是否自动重新登录。True表示用最近一次
+                login 的账号密码，也可以传入返回 (账号, 密码) 的函数；
+                并发失败的调用只触发一次登录，幂等请求在登录后自动重放一次
         """
+        if base_url is not None:
+            self.BASE_URL = base_url.rstrip("/")
         self.timeout = timeout
+        self.connect_timeout = connect_timeout if connect_timeout is not None else timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.hedging = hedging
+        self.middlewares: List[Middleware] = list(middlewares or [])
+        self.metrics = metrics
+        if metrics is not None:
+            self.middlewares.insert(0, metrics)
+        self._singleflight = SingleFlight() if coalesce_requests else None
+        self.cache = cache
+        self._validators = ValidatorStore() if conditional_requests else None
+        if callable(json_decoder):
+            self._json_loads = json_decoder
+        else:
+            self._json_loads = get_loads(json_decoder)
         self.session = requests.Session()
-        self._setup_session(max_retries)
+        self._setup_session(
+            transport, connection_pool_size, connection_pool_maxsize, connection_pool_block
+        )
         
-        # 用户状态
-        self.is_authenticated = False
-        self.current_user: Optional[User] = None
-        self.auth_token: Optional[str] = None
-        self.cookies: Dict[str, str] = {}
+        # 用户状态：只整体替换快照，读取无需加锁
+        self._auth_lock = threading.Lock()
+        self._auth = AuthState()
+        
+        # 自动重新登录：同一时间只有一个线程登录
+        self.auto_reauth = auto_reauth
+        self._credentials: Optional[Tuple[str, str]] = None
+        self._reauth_lock = threading.Lock()
         
         # 缓存
-        self._boards_cache: Optional[List[Board]] = None
+        self._board_catalog = BoardCatalog(
+            self._fetch_boards, self._fetch_board, soft_ttl=boards_ttl
+        )
         
-    def _setup_session(self, max_retries: int) -> None:
+    def _setup_session(self, transport: Optional[HTTPAdapter] = None,
+                       pool_size: int = 10, pool_maxsize: int = 20,
+                       pool_block: bool = False) -> None:
         """配置HTTP会话"""
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # 重试由 _perform 在截止时间内进行，适配器本身不重试
+        adapter = transport
+        if adapter is None:
+            adapter = TimingAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_maxsize,
+                max_retries=0, pool_block=pool_block,
+            )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
@@ -78,79 +225,616 @@ class CodeMaoClient:
             "Accept": "application/json"
         })
     
+    @property
+    def auth_state(self) -> AuthState:
+        """当前登录状态的快照，多个字段需要一致时应读取快照而不是分别读取属性"""
+        return self._auth
+    
+    @property
+    def is_authenticated(self) -> bool:
+        """是否已登录"""
+        return self._auth.is_authenticated
+    
+    @is_authenticated.setter
+    def is_authenticated(self, value: bool) -> None:
+        self._update_auth(is_authenticated=value)
+    
+    @property
+    def current_user(self) -> Optional[User]:
+        """当前登录用户"""
+        return self._auth.user
+    
+    @current_user.setter
+    def current_user(self, value: Optional[User]) -> None:
+        self._update_auth(user=value)
+    
+    @property
+    def auth_token(self) -> Optional[str]:
+        """登录令牌"""
+        return self._auth.token
+    
+    @auth_token.setter
+    def auth_token(self, value: Optional[str]) -> None:
+        self._update_auth(token=value)
+    
+    @property
+    def cookies(self) -> Dict[str, str]:
+        """登录时保存的Cookie"""
+        return self._auth.cookies
+    
+    @cookies.setter
+    def cookies(self, value: Dict[str, str]) -> None:
+        self._update_auth(cookies=dict(value))
+    
+    def _update_auth(self, **changes: Any) -> None:
+        """修改当前登录状态的部分字段，不改变 generation"""
+        with self._auth_lock:
+            self._auth = replace(self._auth, **changes)
+    
+    def _replace_auth(self, **fields: Any) -> AuthState:
+        """
+        以新的登录状态替换当前状态（登录或登出）
+        
+        Returns:
+            新的登录状态
+        """
+        with self._auth_lock:
+            self._auth = AuthState(generation=self._auth.generation + 1, **fields)
+            return self._auth
+    
+    def _invalidate_auth(self, generation: int) -> None:
+        """
+        收到401时标记为未登录
+        
+        只有请求发出时的登录状态仍是当前状态才生效，
+        避免旧请求的401覆盖其他线程刚完成的登录。
+        """
+        with self._auth_lock:
+            if self._auth.generation == generation and self._auth.is_authenticated:
+                self._auth = replace(self._auth, is_authenticated=False)
+    
+    def add_middleware(self, middleware: Middleware) -> None:
+        """
+        在中间件链末尾添加中间件
+        
+        Args:
+            middleware: 中间件
+        """
+        self.middlewares.append(middleware)
+    
+    def _make_deadline(self, deadline: DeadlineLike = None) -> Optional[Deadline]:
+        """
+        生成本次调用的截止时间
+        
+        Args:
+            deadline: 调用方指定的秒数或 Deadline，None表示使用客户端默认值
+            
+        Returns:
+            Deadline，没有截止时间时返回None
+        """
+        if deadline is None:
+            deadline = self.deadline
+        return Deadline.coerce(deadline)
+    
     def _request(self, method: str, endpoint: str, 
                  data: Optional[Dict[str, Any]] = None,
-                 params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                 params: Optional[Dict[str, Any]] = None,
+                 deadline: DeadlineLike = None,
+                 refresh: bool = False) -> Dict[str, Any]:
         """
         发送HTTP请求
         
+        配置了响应缓存时先查缓存；开启请求合并时，并发的相同GET请求只发送一次。
+        缓存命中和合并的请求共享同一个解析结果，调用方不应修改返回的数据。
+        
         Args:
             method: 请求方法 (GET, POST, PATCH, DELETE)
             endpoint: API端点
             data: 请求数据
             params: URL参数
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
+            refresh: 是否跳过响应缓存直接请求服务器（结果仍写入缓存）
             
         Returns:
             API响应数据
+        """
+        deadline = self._make_deadline(deadline)
+        auth_generation = self._auth.generation
+        try:
+            return self._call(method, endpoint, data, params, deadline, refresh)
+        except AuthenticationError:
+            if not self._reauthenticate(endpoint, auth_generation):
+                raise
+            # 非幂等请求可能已经生效，只重新登录不重放
+            if method not in IDEMPOTENT_METHODS:
+                raise
+            logger.info(f"重新登录后重放请求: {method} {endpoint}")
+            return self._call(method, endpoint, data, params, deadline, refresh)
+    
+    def _call(self, method: str, endpoint: str,
+              data: Optional[Dict[str, Any]] = None,
+              params: Optional[Dict[str, Any]] = None,
+              deadline: Optional[Deadline] = None,
+              refresh: bool = False) -> Dict[str, Any]:
+        """经过中间件链发送一次请求"""
+        if not self.middlewares:
+            return self._dispatch(method, endpoint, data, params, deadline, refresh=refresh)
+        
+        context = RequestContext(method, endpoint, data, params, deadline)
+        return run_chain(
+            self.middlewares, context,
+            lambda: self._dispatch(
+                method, endpoint, data, params, deadline, context, refresh
+            )
+        )
+    
+    def _reauth_credentials(self) -> Optional[Tuple[str, str]]:
+        """自动重新登录使用的账号密码，未开启时返回None"""
+        if callable(self.auto_reauth):
+            return self.auto_reauth()
+        if self.auto_reauth:
+            return self._credentials
+        return None
+    
+    def _reauthenticate(self, endpoint: str, auth_generation: int) -> bool:
+        """
+        登录失效后重新登录
+        
+        并发失败的调用在锁上排队，第一个调用登录，
+        其余调用发现登录状态已经更新后直接返回。
+        
+        Args:
+            endpoint: 失败的API端点
+            auth_generation: 失败的请求发出时登录状态的 generation
+            
+        Returns:
+            是否已重新登录，未开启自动重新登录时返回False
+            
+        Raises:
+            AuthenticationError: 重新登录失败
+        """
+        if endpoint in (LOGIN_ENDPOINT, LOGOUT_ENDPOINT) or not self.auto_reauth:
+            return False
+        with self._reauth_lock:
+            state = self._auth
+            if state.is_authenticated and state.generation != auth_generation:
+                return True
+            credentials = self._reauth_credentials()
+            if credentials is None:
+                return False
+            logger.info("登录已失效，自动重新登录")
+            self.login(*credentials)
+            return True
+    
+    def _ensure_authenticated(self) -> None:
+        """
+        检查是否已登录，开启自动重新登录时先尝试登录
+        
+        Raises:
+            AuthenticationError: 未登录
+        """
+        state = self._auth
+        if state.is_authenticated:
+            return
+        if not self._reauthenticate("", state.generation):
+            raise AuthenticationError("请先登录")
+    
+    def _dispatch(self, method: str, endpoint: str,
+                  data: Optional[Dict[str, Any]] = None,
+                  params: Optional[Dict[str, Any]] = None,
+                  deadline: Optional[Deadline] = None,
+                  context: Optional[RequestContext] = None,
+                  refresh: bool = False) -> Dict[str, Any]:
+        """
+        经过响应缓存和请求合并发送请求
+        
+        Args:
+            method: 请求方法
+            endpoint: API端点
+            data: 请求数据
+            params: URL参数
+            deadline: 截止时间
+            context: 中间件上下文
+            refresh: 是否跳过缓存读取
+            
+        Returns:
+            API响应数据
+        """
+        if self.cache is not None and not refresh:
+            cached = self.cache.get(method, endpoint, params)
+            if cached is not None:
+                if context is not None:
+                    context.from_cache = True
+                return cached
+        
+        def fetch() -> Dict[str, Any]:
+            response_data, size = self._send_request(
+                method, endpoint, data, params, deadline, context
+            )
+            if self.cache is not None:
+                self.cache.set(method, endpoint, params, response_data, size)
+            return response_data
+        
+        if self._singleflight is not None and method == "GET":
+            key = (method, endpoint, tuple(sorted((params or {}).items())))
+            response_data, shared = self._singleflight.do(
+                key, fetch, deadline.remaining() if deadline is not None else None
+            )
+            if context is not None:
+                context.shared = shared
+            return response_data
+        return fetch()
+    
+    def _send_request(self, method: str, endpoint: str,
+                      data: Optional[Dict[str, Any]] = None,
+                      params: Optional[Dict[str, Any]] = None,
+                      deadline: Optional[Deadline] = None,
+                      context: Optional[RequestContext] = None,
+                      conditional: bool = True
+                      ) -> Tuple[Dict[str, Any], Optional[int]]:
+        """
+        发送单个HTTP请求并解析响应
+        
+        Args:
+            method: 请求方法 (GET, POST, PATCH, DELETE)
+            endpoint: API端点
+            data: 请求数据
+            params: URL参数
+            deadline: 截止时间
+            context: 中间件上下文，记录各阶段时间戳并提供额外的请求头
+            conditional: 是否带上已保存的校验信息
+            
+        Returns:
+            (API响应数据, 响应体字节数)，304复用已保存的数据时字节数为None
             
         Raises:
             NetworkError: 网络连接失败
+            CircuitOpenError: 端点分组已熔断
+            DeadlineExceededError: 超过截止时间
+            RateLimitError: 请求过于频繁
             APIError: API返回错误
         """
-        url = f"{self.BASE_URL}{endpoint}"
+        group = endpoint_group(endpoint)
+        
+        # 条件请求：带上已保存的校验信息
+        validator_key = None
+        headers: Dict[str, str] = {}
+        if context is not None:
+            headers.update(context.headers)
+        if self._validators is not None and method == "GET":
+            validator_key = ResponseCache.make_key(endpoint, params)
+            if conditional:
+                headers.update(self._validators.request_headers(validator_key))
         
+        # 先只接收响应头，以便分别记录首字节和读取响应体的时间
+        auth_generation = self._auth.generation
+        response = self._perform(
+            method, endpoint, group, deadline, context,
+            json=data if data else None,
+            params=params,
+            headers=headers or None,
+            stream=True
+        )
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                json=data if data else None,
-                params=params,
-                cookies=self.cookies,
-                timeout=self.timeout
+            content = response.content
+        except requests.exceptions.RequestException as e:
+            raise NetworkError(f"网络请求失败: {str(e)}")
+        finally:
+            response.close()
+        if context is not None:
+            context.mark("received")
+            context.bytes_in = len(content)
+            body = getattr(response.request, "body", None)
+            if isinstance(body, (bytes, str)):
+                context.bytes_out = len(body)
+        
+        # 资源未修改，复用之前解析的数据
+        if response.status_code == 304 and validator_key is not None:
+            response_data = self._validators.not_modified(validator_key)
+            if response_data is not None:
+                return response_data, None
+            # 发出请求后校验信息已被淘汰，304没有响应体可用，不带校验信息重新请求
+            logger.debug(f"校验信息已失效，重新请求: {endpoint}")
+            self._validators.discard(validator_key)
+            return self._send_request(method, endpoint, data, params, deadline, context,
+                                      conditional=False)
+        
+        # 检查响应状态
+        self._check_status(response, endpoint, group, auth_generation)
+        
+        # 解析响应数据，直接从字节解码，错误信息只保留响应体预览
+        try:
+            response_data = self._json_loads(content)
+        except ValueError:
+            raise APIError(f"无效的JSON响应: {body_preview(content)}")
+        if context is not None:
+            context.mark("parsed")
+        
+        # 检查API错误
+        check_api_error(response_data)
+        
+        if validator_key is not None:
+            self._validators.store(
+                validator_key,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                response_data,
             )
+        return response_data, len(content)
+    
+    def _perform(self, method: str, endpoint: str, group: str,
+                 deadline: Optional[Deadline] = None,
+                 context: Optional[RequestContext] = None,
+                 hedge: bool = True,
+                 **kwargs: Any) -> requests.Response:
+        """
+        发送请求，在截止时间内对失败的幂等请求重试
+        
+        每次尝试的连接/读取超时都不超过剩余预算，退避时间超出剩余预算时不再重试。
+        
+        Args:
+            method: 请求方法
+            endpoint: API端点
+            group: 端点分组
+            deadline: 截止时间
+            context: 中间件上下文
+            hedge: 是否允许按对冲策略发送重复请求
+            **kwargs: 传给 Session.request 的其他参数
+            
+        Returns:
+            HTTP响应，重试用尽后的5xx响应也会返回，由调用方检查状态
+            
+        Raises:
+            NetworkError: 网络连接失败
+            CircuitOpenError: 端点分组已熔断
+            DeadlineExceededError: 超过截止时间
+        """
+        url = f"{self.BASE_URL}{endpoint}"
+        retryable = method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                # 限流排队也计入截止时间，等不到令牌时立即失败
+                self.rate_limiter.acquire(
+                    group, deadline.remaining() if deadline is not None else None
+                )
+            timeout = (self.connect_timeout, self.timeout)
+            if deadline is not None:
+                timeout = deadline.clamp(*timeout)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request(group)
+            if context is not None:
+                context.attempts += 1
+                context.mark("send")
             
-            # 检查响应状态
-            if response.status_code == 404:
-                raise ResourceNotFoundError(f"资源不存在: {endpoint}")
-            elif response.status_code == 401:
-                self.is_authenticated = False
-                raise AuthenticationError("认证失败，请重新登录")
-            elif response.status_code == 429:
-                raise CodeMaoError("请求过于频繁，请稍后再试")
-            elif response.status_code >= 500:
-                raise NetworkError(f"服务器错误: {response.status_code}")
-            
-            # 解析响应数据
             try:
-                response_data = response.json()
-            except json.JSONDecodeError:
-                raise APIError(f"无效的JSON响应: {response.text}")
-            
-            # 检查API错误
-            if isinstance(response_data, dict):
-                if response_data.get('error_code'):
-                    error_msg = response_data.get('error_message', '未知错误')
-                    error_code = response_data.get('error_code')
-                    
-                    if error_code == 'Not Found':
-                        raise ResourceNotFoundError(error_msg)
-                    elif '认证' in error_msg or '登录' in error_msg:
-                        raise AuthenticationError(error_msg)
-                    else:
-                        raise APIError(error_msg, error_code, response_data)
-                        
-            return response_data
+                response = self._send_attempt(
+                    method, endpoint, url, context, hedge,
+                    cookies=self.cookies,
+                    timeout=timeout,
+                    **kwargs
+                )
+            except requests.exceptions.RequestException as e:
+                self._record_outcome(group, None)
+                # 连接超时时请求尚未发出，非幂等请求也可以重试
+                can_retry = retryable or isinstance(e, requests.exceptions.ConnectTimeout)
+                if (isinstance(e, (requests.exceptions.ConnectionError,
+                                   requests.exceptions.Timeout))
+                        and can_retry and self._backoff(attempt, deadline)):
+                    attempt += 1
+                    continue
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceededError(
+                        f"请求超过截止时间 ({deadline.budget:g} 秒): {str(e)}"
+                    )
+                raise NetworkError(f"网络请求失败: {str(e)}")
+            except BaseException:
+                # 对冲执行器、回放传输等抛出的其他异常也要归还半开探测名额
+                self._record_outcome(group, None)
+                raise
+            
+            if context is not None:
+                context.mark("first_byte")
+                context.status_code = response.status_code
+            self._record_outcome(group, response.status_code)
+            if (response.status_code in RETRY_STATUSES and retryable
+                    and self._backoff(attempt, deadline)):
+                response.close()
+                attempt += 1
+                continue
+            return response
+    
+    def _send_attempt(self, method: str, endpoint: str, url: str,
+                      context: Optional[RequestContext] = None,
+                      hedge: bool = True,
+                      **kwargs: Any) -> requests.Response:
+        """
+        发送一次请求，配置了对冲策略时对GET请求进行对冲
+        
+        Args:
+            method: 请求方法
+            endpoint: API端点
+            url: 完整URL
+            context: 中间件上下文，用于记录建立连接的时间
+            hedge: 是否允许对冲
+            **kwargs: 传给 Session.request 的其他参数
             
+        Returns:
+            HTTP响应
+        """
+        timings = context.timings if context is not None else None
+        
+        def send() -> requests.Response:
+            # 对冲请求在其他线程发送，计时表需要在发送的线程内设置
+            with record_connect(timings):
+                return self.session.request(method=method, url=url, **kwargs)
+        
+        hedging = self.hedging
+        if hedging is None or not hedge or method != "GET":
+            return send()
+        template = endpoint_template(endpoint)
+        if not hedging.applies(template):
+            return send()
+        # 对冲请求同样要获取限流令牌，拿不到时不对冲
+        before_hedge = None
+        if self.rate_limiter is not None:
+            before_hedge = partial(self.rate_limiter.try_acquire, endpoint_group(endpoint))
+        return hedging.run(
+            template, send,
+            accept=lambda response: response.status_code < 500,
+            discard=lambda response: response.close(),
+            before_hedge=before_hedge,
+        )
+    
+    def _backoff(self, attempt: int, deadline: Optional[Deadline] = None) -> bool:
+        """
+        在重试前退避
+        
+        Args:
+            attempt: 已重试的次数
+            deadline: 截止时间
+            
+        Returns:
+            是否应该重试；重试次数用尽或退避时间超出剩余预算时返回False
+        """
+        if attempt >= self.max_retries:
+            return False
+        delay = 0.0 if attempt == 0 else min(
+            MAX_BACKOFF, self.backoff_factor * (2 ** attempt)
+        )
+        if deadline is not None and delay >= deadline.remaining():
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        return True
+    
+    def _record_outcome(self, group: str, status_code: Optional[int]) -> None:
+        """
+        向熔断器报告请求结果
+        
+        Args:
+            group: 端点分组
+            status_code: HTTP状态码，None表示连接失败或超时
+        """
+        if self.circuit_breaker is None:
+            return
+        if status_code is None or status_code >= 500:
+            self.circuit_breaker.record_failure(group)
+        else:
+            self.circuit_breaker.record_success(group)
+    
+    def _check_status(self, response: requests.Response, endpoint: str,
+                      group: str, auth_generation: Optional[int] = None) -> None:
+        """
+        根据HTTP状态码抛出对应异常
+        
+        Args:
+            response: HTTP响应
+            endpoint: API端点
+            group: 端点分组
+            auth_generation: 发出请求时登录状态的 generation
+        """
+        if response.status_code == 404:
+            raise ResourceNotFoundError(f"资源不存在: {endpoint}")
+        elif response.status_code == 401:
+            if auth_generation is None:
+                auth_generation = self._auth.generation
+            self._invalidate_auth(auth_generation)
+            raise AuthenticationError("认证失败，请重新登录")
+        elif response.status_code == 429:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if self.rate_limiter is not None:
+                retry_after = self.rate_limiter.backoff(group, retry_after)
+            raise RateLimitError("请求过于频繁，请稍后再试", retry_after=retry_after)
+        elif response.status_code >= 500:
+            raise NetworkError(f"服务器错误: {response.status_code}")
+    
+    def _stream_items(self, endpoint: str, params: Dict[str, Any],
+                      model: Callable[[Dict[str, Any]], T],
+                      chunk_size: int = 16 * 1024,
+                      deadline: DeadlineLike = None) -> Iterator[T]:
+        """
+        以流式方式请求列表接口，逐个产出 items 中的元素
+        
+        响应体按块读取并增量解析，不经过响应缓存和条件请求。
+        设置了中间件时，从发送请求到读完响应体作为一次调用经过中间件链。
+        
+        Args:
+            endpoint: API端点
+            params: URL参数
+            model: 将元素字典转换为模型的函数
+            chunk_size: 每次读取的字节数
+            deadline: 截止时间，覆盖建立请求和读取整个响应体
+            
+        Yields:
+            模型对象
+        """
+        deadline = self._make_deadline(deadline)
+        if not self.middlewares:
+            items = self._read_stream(endpoint, params, chunk_size, deadline)
+        else:
+            context = RequestContext("GET", endpoint, None, params, deadline)
+            items = run_stream_chain(
+                self.middlewares, context,
+                partial(self._read_stream, endpoint, params, chunk_size, deadline, context)
+            )
+        for item in items:
+            yield model(item)
+    
+    def _read_stream(self, endpoint: str, params: Dict[str, Any],
+                     chunk_size: int, deadline: Optional[Deadline] = None,
+                     context: Optional[RequestContext] = None) -> Iterator[Dict[str, Any]]:
+        """发送流式请求并逐个产出 items 中的元素字典"""
+        group = endpoint_group(endpoint)
+        headers = dict(context.headers) if context is not None else None
+        # 流式列表由调用方边读边处理，不对冲
+        auth_generation = self._auth.generation
+        response = self._perform("GET", endpoint, group, deadline, context, hedge=False,
+                                 params=params, headers=headers or None, stream=True)
+        if response.status_code == 401 and self.auto_reauth:
+            # 还没有产出任何元素，重新登录后可以安全重放
+            response.close()
+            self._invalidate_auth(auth_generation)
+            if self._reauthenticate(endpoint, auth_generation):
+                auth_generation = self._auth.generation
+                response = self._perform("GET", endpoint, group, deadline, context,
+                                         hedge=False, params=params,
+                                         headers=headers or None, stream=True)
+        
+        try:
+            self._check_status(response, endpoint, group, auth_generation)
+            parser = ItemStreamParser("items", self._json_loads)
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if context is not None:
+                    context.bytes_in += len(chunk)
+                yield from parser.feed(chunk)
+                if parser.done:
+                    return
+                if deadline is not None:
+                    deadline.check()
+            # 没有 items 字段时按普通响应检查业务错误
+            try:
+                check_api_error(parser.close())
+            except ValueError:
+                raise APIError(f"无效的JSON响应: {endpoint}")
         except requests.exceptions.RequestException as e:
             raise NetworkError(f"网络请求失败: {str(e)}")
+        except ValueError as e:
+            raise APIError(f"无效的JSON响应: {e}")
+        finally:
+            response.close()
+            if context is not None:
+                context.mark("received")
     
-    def login(self, identity: str, password: str) -> User:
+    def login(self, identity: str, password: str,
+              deadline: DeadlineLike = None) -> User:
         """
         用户登录
         
         Args:
             identity: 用户名、邮箱或手机号
             password: 密码
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
             
         Returns:
             当前用户对象
@@ -165,110 +849,545 @@ class CodeMaoClient:
         }
         
         try:
-            response = self._request("POST", "/tiger/v3/web/accounts/login", login_data)
+            response = self._request("POST", LOGIN_ENDPOINT, login_data, deadline=deadline)
             
-            # 保存认证信息
-            self.cookies = self.session.cookies.get_dict()
-            self.auth_token = response.get('auth', {}).get('token')
-            self.is_authenticated = True
-            
-            # 创建用户对象
-            user_info = response.get('user_info', {})
-            self.current_user = User.from_dict(user_info)
+            # 保存认证信息，一次性替换登录状态
+            user = User.from_dict(response.get('user_info', {}))
+            self._replace_auth(
+                is_authenticated=True,
+                user=user,
+                token=response.get('auth', {}).get('token'),
+                cookies=self.session.cookies.get_dict(),
+            )
+            if self.auto_reauth is True:
+                self._credentials = (identity, password)
             
-            logger.info(f"用户 {self.current_user.nickname} 登录成功")
-            return self.current_user
+            logger.info(f"用户 {user.nickname} 登录成功")
+            return user
             
         except APIError as e:
             if e.error_code == 2:
                 raise AuthenticationError("用户不存在或密码错误")
             raise AuthenticationError(f"登录失败: {e.message}")
     
-    def logout(self) -> None:
-        """用户登出"""
+    def logout(self, deadline: DeadlineLike = None) -> None:
+        """
+        用户登出
+        
+        Args:
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
+        """
+        # 主动登出后不再自动重新登录
+        self._credentials = None
         if not self.is_authenticated:
             return
             
         try:
-            self._request("POST", "/tiger/v3/web/accounts/logout")
+            self._request("POST", LOGOUT_ENDPOINT, deadline=deadline)
         except Exception as e:
             logger.warning(f"登出时出错: {e}")
         finally:
-            self.is_authenticated = False
-            self.current_user = None
-            self.auth_token = None
-            self.cookies = {}
+            self._replace_auth()
             self.session.cookies.clear()
             logger.info("用户已登出")
     
-    def get_current_user(self) -> Optional[User]:
-        """获取当前登录用户"""
+    def save_session(self, path: str) -> None:
+        """
+        把登录状态保存到文件，供其他进程用 restore_session 恢复
+        
+        文件包含Cookie、令牌和当前用户，权限为0600（仅所有者可读写）。
+        
+        Args:
+            path: 文件路径
+            
+        Raises:
+            AuthenticationError: 未登录
+        """
+        state = self._auth
+        if not state.is_authenticated:
+            raise AuthenticationError("请先登录")
+        write_session_file(path, {
+            "base_url": self.BASE_URL,
+            "token": state.token,
+            "user": asdict(state.user) if state.user is not None else None,
+            "cookies": dump_cookies(self.session.cookies),
+        })
+    
+    def restore_session(self, path: str, max_age: Optional[float] = None,
+                        validate: bool = False,
+                        deadline: DeadlineLike = None) -> bool:
+        """
+        从 save_session 保存的文件恢复登录状态
+        
+        默认不发起请求：恢复后立即可用，会话失效时第一个需要认证的请求
+        收到401，客户端随即标记为未登录并抛出 AuthenticationError。
+        
+        Args:
+            path: 文件路径
+            max_age: 文件的最长有效时间（秒），None表示不限制
+            validate: 是否立即请求当前用户信息验证会话
+            deadline: 验证请求的截止时间
+            
+        Returns:
+            是否恢复成功；文件不存在、已过期、属于其他 base_url 或验证失败时返回False，
+            此时应调用 login。验证请求因网络错误失败时同样返回False，客户端保持未登录
+        """
+        document = read_session_file(path, max_age)
+        if document is None:
+            return False
+        if document.get("base_url") != self.BASE_URL:
+            logger.info(f"登录状态文件 {path} 属于 {document.get('base_url')}，不恢复")
+            return False
+        
+        load_cookies(self.session.cookies, document.get("cookies") or [])
+        user_data = document.get("user")
+        state = self._replace_auth(
+            is_authenticated=True,
+            user=User.from_dict(user_data) if user_data else None,
+            token=document.get("token"),
+            cookies=self.session.cookies.get_dict(),
+        )
+        if validate:
+            try:
+                valid = self.validate_session(deadline=deadline)
+            except NetworkError as e:
+                logger.warning(f"无法验证 {path} 中的登录状态: {e}")
+                self._invalidate_auth(state.generation)
+                return False
+            if not valid:
+                return False
+        logger.info(f"已从 {path} 恢复登录状态"
+                    + (f"（{state.user.nickname}）" if state.user else ""))
+        return True
+    
+    def validate_session(self, deadline: DeadlineLike = None) -> bool:
+        """
+        请求当前用户信息，确认登录状态仍然有效
+        
+        Args:
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
+            
+        Returns:
+            会话是否有效，无效时客户端标记为未登录
+        """
         if not self.is_authenticated:
+            return False
+        try:
+            self._request("GET", "/api/user/info", deadline=deadline)
+        except AuthenticationError:
+            return False
+        return self.is_authenticated
+    
+    def get_current_user(self, deadline: DeadlineLike = None) -> Optional[User]:
+        """
+        获取当前登录用户
+        
+        Args:
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
+        """
+        state = self._auth
+        if not state.is_authenticated:
             return None
             
-        if self.current_user:
-            return self.current_user
+        if state.user:
+            return state.user
             
         # 重新获取用户信息
         try:
-            response = self._request("GET", "/api/user/info")
+            response = self._request("GET", "/api/user/info", deadline=deadline)
             user_data = response.get('data', {}).get('userInfo', {})
-            self.current_user = User.from_dict(user_data)
-            return self.current_user
+            user = User.from_dict(user_data)
+            with self._auth_lock:
+                # 期间重新登录或登出时不覆盖新的状态
+                if self._auth.generation == state.generation:
+                    self._auth = replace(self._auth, user=user)
+            return user
         except Exception as e:
             logger.error(f"获取用户信息失败: {e}")
             return None
     
-    def get_boards(self, refresh: bool = False) -> List[Board]:
+    def get_user(self, user_id: Union[str, int],
+                 deadline: DeadlineLike = None) -> User:
         """
-        获取所有论坛板块
+        根据ID获取用户信息
         
         Args:
-            refresh: 是否强制刷新缓存
+            user_id: 用户ID
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
             
         Returns:
-            板块列表
+            用户对象
+            
+        Raises:
+            ResourceNotFoundError: 用户不存在
+        """
+        response = self._request(
+            "GET", f"/api/user/info/detail/{user_id}", deadline=deadline
+        )
+        if response.get('code') == 404:
+            raise ResourceNotFoundError(f"用户不存在: {user_id}")
+        user_data = response.get('data', {}).get('userInfo', {}).get('user', {})
+        return User.from_dict(user_data)
+    
+    def get_user_honor(self, user_id: Union[str, int],
+                       deadline: DeadlineLike = None) -> UserHonor:
         """
-        if self._boards_cache and not refresh:
-            return self._boards_cache
+        获取用户荣誉信息
+        
+        Args:
+            user_id: 用户ID
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
             
-        try:
-            response = self._request("GET", "/web/forums/boards/simples/all")
-            boards_data = response.get('items', [])
+        Returns:
+            用户荣誉对象
+        """
+        response = self._request(
+            "GET", "/creation-tools/v1/user/center/honor",
+            params={"user_id": user_id}, deadline=deadline
+        )
+        return UserHonor.from_dict(response)
+    
+    def get_users_batch(self, user_ids: Iterable[Union[str, int]],
+                        include_honor: bool = False,
+                        max_workers: int = 8,
+                        deadline: DeadlineLike = None) -> List[UserBatchResult]:
+        """
+        批量获取用户信息
+        
+        重复的ID只请求一次，请求在共享会话上以有限的线程并发执行。
+        单个用户失败不会中断整个批次，错误记录在对应结果的 error 中。
+        
+        Args:
+            user_ids: 用户ID列表
+            include_honor: 是否同时获取用户荣誉信息
+            max_workers: 最大并发数
+            deadline: 整个批次共享的截止时间（秒数或 Deadline），None表示使用客户端默认值
             
-            boards = [Board.from_dict(board_data) for board_data in boards_data]
-            self._boards_cache = boards
+        Returns:
+            与输入顺序一致的结果列表
+        """
+        user_ids = list(user_ids)
+        unique_ids = list(dict.fromkeys(user_ids))
+        if not unique_ids:
+            return []
+        deadline = self._make_deadline(deadline)
+        
+        def fetch(user_id: Union[str, int]) -> UserBatchResult:
+            result = UserBatchResult(user_id=user_id)
+            try:
+                result.user = self.get_user(user_id, deadline=deadline)
+                if include_honor:
+                    result.honor = self.get_user_honor(user_id, deadline=deadline)
+            except CodeMaoError as e:
+                logger.warning(f"获取用户 {user_id} 信息失败: {e}")
+                result.error = e
+            return result
+        
+        workers = max(1, min(max_workers, len(unique_ids)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = dict(zip(unique_ids, executor.map(fetch, unique_ids)))
+        
+        return [results[user_id] for user_id in user_ids]
+    
+    def stream_user_works(self, user_id: Union[str, int], offset: int = 0,
+                          limit: int = 200,
+                          deadline: DeadlineLike = None) -> Iterator[Work]:
+        """
+        流式获取用户作品列表
+        
+        边下载边解析，第一个作品到达即可使用，内存占用不随列表长度增长。
+        
+        Args:
+            user_id: 用户ID
+            offset: 起始位置
+            limit: 数量
+            deadline: 截止时间，覆盖建立请求和读取整个列表
             
-            return boards
+        Yields:
+            作品对象
+        """
+        return self._stream_items(
+            "/creation-tools/v1/user/center/work-list",
+            {"user_id": user_id, "offset": offset, "limit": limit},
+            Work.from_dict,
+            deadline=deadline
+        )
+    
+    def stream_user_collections(self, user_id: Union[str, int], offset: int = 0,
+                                limit: int = 200,
+                                deadline: DeadlineLike = None) -> Iterator[Collection]:
+        """
+        流式获取用户收藏列表
+        
+        Args:
+            user_id: 用户ID
+            offset: 起始位置
+            limit: 数量
+            deadline: 截止时间，覆盖建立请求和读取整个列表
+            
+        Yields:
+            收藏作品对象
+        """
+        return self._stream_items(
+            "/creation-tools/v1/user/center/collect/list",
+            {"user_id": user_id, "offset": offset, "limit": limit},
+            Collection.from_dict,
+            deadline=deadline
+        )
+    
+    def stream_followers(self, user_id: Union[str, int], offset: int = 0,
+                         limit: int = 200,
+                         deadline: DeadlineLike = None) -> Iterator[Follower]:
+        """
+        流式获取用户关注列表
+        
+        Args:
+            user_id: 用户ID
+            offset: 起始位置
+            limit: 数量
+            deadline: 截止时间，覆盖建立请求和读取整个列表
+            
+        Yields:
+            关注用户对象
+        """
+        return self._stream_items(
+            "/creation-tools/v1/user/followers",
+            {"user_id": user_id, "offset": offset, "limit": limit},
+            Follower.from_dict,
+            deadline=deadline
+        )
+    
+    def stream_fans(self, user_id: Union[str, int], offset: int = 0,
+                    limit: int = 200,
+                    deadline: DeadlineLike = None) -> Iterator[Follower]:
+        """
+        流式获取用户粉丝列表
+        
+        Args:
+            user_id: 用户ID
+            offset: 起始位置
+            limit: 数量
+            deadline: 截止时间，覆盖建立请求和读取整个列表
+            
+        Yields:
+            粉丝用户对象
+        """
+        return self._stream_items(
+            "/creation-tools/v1/user/fans",
+            {"user_id": user_id, "offset": offset, "limit": limit},
+            Follower.from_dict,
+            deadline=deadline
+        )
+    
+    def _paginate(self, endpoint: str, user_id: Union[str, int],
+                  model: Callable[[Dict[str, Any]], T], cursor: int, page_size: int,
+                  prefetch: bool, deadline: DeadlineLike) -> PageIterator[T]:
+        """创建按 offset/limit 分页的列表迭代器"""
+        def fetch_page(offset: int, limit: int) -> Dict[str, Any]:
+            return self._request(
+                "GET", endpoint,
+                params={"user_id": user_id, "offset": offset, "limit": limit},
+                deadline=deadline
+            )
+        return PageIterator(fetch_page, model, cursor, page_size, prefetch)
+    
+    def iter_user_works(self, user_id: Union[str, int], cursor: int = 0,
+                        page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True,
+                        deadline: DeadlineLike = None) -> PageIterator[Work]:
+        """
+        逐页获取用户作品列表
+        
+        Args:
+            user_id: 用户ID
+            cursor: 起始位置，可传入之前迭代器的 cursor 从断点继续
+            page_size: 每页条数
+            prefetch: 是否在后台预取下一页
+            deadline: 每一页请求的截止时间（秒数或 Deadline），None表示使用客户端默认值
+            
+        Returns:
+            作品迭代器
+        """
+        return self._paginate(
+            "/creation-tools/v1/user/center/work-list", user_id,
+            Work.from_dict, cursor, page_size, prefetch, deadline
+        )
+    
+    def iter_user_collections(self, user_id: Union[str, int], cursor: int = 0,
+                              page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True,
+                              deadline: DeadlineLike = None) -> PageIterator[Collection]:
+        """
+        逐页获取用户收藏列表
+        
+        Args:
+            user_id: 用户ID
+            cursor: 起始位置，可传入之前迭代器的 cursor 从断点继续
+            page_size: 每页条数
+            prefetch: 是否在后台预取下一页
+            deadline: 每一页请求的截止时间（秒数或 Deadline），None表示使用客户端默认值
+            
+        Returns:
+            收藏迭代器
+        """
+        return self._paginate(
+            "/creation-tools/v1/user/center/collect/list", user_id,
+            Collection.from_dict, cursor, page_size, prefetch, deadline
+        )
+    
+    def iter_followers(self, user_id: Union[str, int], cursor: int = 0,
+                       page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True,
+                       deadline: DeadlineLike = None) -> PageIterator[Follower]:
+        """
+        逐页获取用户关注列表
+        
+        Args:
+            user_id: 用户ID
+            cursor: 起始位置，可传入之前迭代器的 cursor 从断点继续
+            page_size: 每页条数
+            prefetch: 是否在后台预取下一页
+            deadline: 每一页请求的截止时间（秒数或 Deadline），None表示使用客户端默认值
+            
+        Returns:
+            关注迭代器
+        """
+        return self._paginate(
+            "/creation-tools/v1/user/followers", user_id,
+            Follower.from_dict, cursor, page_size, prefetch, deadline
+        )
+    
+    def iter_fans(self, user_id: Union[str, int], cursor: int = 0,
+                  page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True,
+                  deadline: DeadlineLike = None) -> PageIterator[Follower]:
+        """
+        逐页获取用户粉丝列表
+        
+        Args:
+            user_id: 用户ID
+            cursor: 起始位置，可传入之前迭代器的 cursor 从断点继续
+            page_size: 每页条数
+            prefetch: 是否在后台预取下一页
+            deadline: 每一页请求的截止时间（秒数或 Deadline），None表示使用客户端默认值
+            
+        Returns:
+            粉丝迭代器
+        """
+        return self._paginate(
+            "/creation-tools/v1/user/fans", user_id,
+            Follower.from_dict, cursor, page_size, prefetch, deadline
+        )
+    
+    def get_user_profile(self, user_id: Union[str, int],
+                         sections: Iterable[str] = (USER,),
+                         max_workers: int = 6,
+                         limit: int = 200,
+                         deadline: DeadlineLike = None) -> UserProfile:
+        """
+        获取用户资料
+        
+        sections 中的部分（user、honor、works、collections、followers、fans）
+        并发请求，总耗时约为其中最慢的一个请求；其余部分在第一次访问对应属性时请求。
+        作品、收藏、关注和粉丝各取前 limit 条，达到上限的部分记录在
+        UserProfile.truncated 中。
+        
+        Args:
+            user_id: 用户ID
+            sections: 立即加载的部分
+            max_workers: 最大并发数
+            limit: 作品、收藏、关注和粉丝列表各自的条数上限
+            deadline: 立即加载的部分共享的截止时间（秒数或 Deadline），
+                None表示使用客户端默认值；懒加载的部分使用客户端默认值
+            
+        Returns:
+            用户资料
+            
+        Raises:
+            ValueError: 未知的部分名称
+            ResourceNotFoundError: 用户不存在
+        """
+        def collect(stream: Callable[..., Iterator[Any]]) -> Callable[[Any], List[Any]]:
+            return lambda d: list(stream(user_id, limit=limit, deadline=d))
+        
+        profile = UserProfile(user_id, {
+            USER: lambda d: self.get_user(user_id, deadline=d),
+            HONOR: lambda d: self.get_user_honor(user_id, deadline=d),
+            WORKS: collect(self.stream_user_works),
+            COLLECTIONS: collect(self.stream_user_collections),
+            FOLLOWERS: collect(self.stream_followers),
+            FANS: collect(self.stream_fans),
+        }, limit)
+        return profile.load(sections, max_workers, self._make_deadline(deadline))
+    
+    def get_boards(self, refresh: bool = False,
+                   deadline: DeadlineLike = None) -> List[Board]:
+        """
+        获取所有论坛板块
+        
+        Args:
+            refresh: 是否强制刷新缓存（同时跳过响应缓存）
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
+            
+        Returns:
+            板块列表
+        """
+        try:
+            return self._board_catalog.get_boards(refresh, deadline=deadline)
+        except (AuthenticationError, RateLimitError, NetworkError):
+            raise
         except Exception as e:
             logger.error(f"获取板块列表失败: {e}")
             raise APIError(f"获取板块列表失败: {e}")
     
-    def get_board_by_id(self, board_id: Union[str, int]) -> Board:
+    def _fetch_boards(self, deadline: DeadlineLike = None,
+                      refresh: bool = False) -> List[Board]:
+        """从服务器获取板块列表，refresh 时跳过响应缓存"""
+        response = self._request(
+            "GET", "/web/forums/boards/simples/all", deadline=deadline, refresh=refresh
+        )
+        boards_data = response.get('items', [])
+        return [Board.from_dict(board_data) for board_data in boards_data]
+    
+    def _fetch_board(self, board_id: str, deadline: DeadlineLike = None,
+                     refresh: bool = False) -> Board:
+        """从服务器获取板块详情，refresh 时跳过响应缓存"""
+        response = self._request(
+            "GET", f"/web/forums/boards/{board_id}", deadline=deadline, refresh=refresh
+        )
+        return Board.from_dict(response)
+    
+    def get_board_by_id(self, board_id: Union[str, int],
+                        refresh: bool = False,
+                        deadline: DeadlineLike = None) -> Board:
         """
         根据ID获取板块信息
         
         Args:
             board_id: 板块ID
+            refresh: 是否强制刷新缓存（板块详情仅在设置了 boards_ttl 时缓存，
+                同时跳过响应缓存）
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
             
         Returns:
             板块对象
         """
         try:
-            response = self._request("GET", f"/web/forums/boards/{board_id}")
-            return Board.from_dict(response)
+            return self._board_catalog.get_board(
+                str(board_id), refresh, deadline=deadline
+            )
         except ResourceNotFoundError:
             raise ResourceNotFoundError(f"板块不存在: {board_id}")
+        except (AuthenticationError, RateLimitError, NetworkError):
+            raise
         except Exception as e:
             logger.error(f"获取板块信息失败: {e}")
             raise APIError(f"获取板块信息失败: {e}")
     
-    def get_board_by_name(self, board_name: str) -> Board:
+    def get_board_by_name(self, board_name: str,
+                          deadline: DeadlineLike = None) -> Board:
         """
         根据名称获取板块信息
         
         Args:
             board_name: 板块名称
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
             
         Returns:
             板块对象
@@ -276,16 +1395,30 @@ class CodeMaoClient:
         Raises:
             ResourceNotFoundError: 板块不存在
         """
-        boards = self.get_boards()
+        deadline = self._make_deadline(deadline)
+        board_id = self._resolve_board_id(board_name, deadline)
+        return self.get_board_by_id(board_id, deadline=deadline)
+    
+    def _resolve_board_id(self, board_name: str,
+                          deadline: DeadlineLike = None) -> str:
+        """
+        根据板块名称查找板块ID
         
-        for board in boards:
-            if board.name == board_name:
-                return self.get_board_by_id(board.id)
-                
-        raise ResourceNotFoundError(f"板块不存在: {board_name}")
+        使用板块列表的名称索引，板块列表已缓存时不发起网络请求。
+        
+        Raises:
+            ResourceNotFoundError: 板块不存在
+        """
+        # 通过 get_boards 加载列表，保持统一的错误处理
+        self.get_boards(deadline=deadline)
+        board_id = self._board_catalog.resolve_id(board_name)
+        if board_id is None:
+            raise ResourceNotFoundError(f"板块不存在: {board_name}")
+        return board_id
     
     def create_post(self, title: str, content: str, 
-                    board_name: str, studio_id: Optional[str] = None) -> str:
+                    board_name: str, studio_id: Optional[str] = None,
+                    deadline: DeadlineLike = None) -> str:
         """
         发布帖子
         
@@ -294,6 +1427,7 @@ class CodeMaoClient:
             content: 帖子内容（最少10字）
             board_name: 板块名称
             studio_id: 工作室ID（可选）
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
             
         Returns:
             帖子ID
@@ -302,8 +1436,7 @@ class CodeMaoClient:
             ValidationError: 参数验证失败
             AuthenticationError: 未登录
         """
-        if not self.is_authenticated:
-            raise AuthenticationError("请先登录")
+        self._ensure_authenticated()
             
         # 参数验证
         if len(title) < 5 or len(title) > 50:
@@ -311,8 +1444,9 @@ class CodeMaoClient:
         if len(content) < 10:
             raise ValidationError("内容长度必须不少于10字")
             
-        # 获取板块信息
-        board = self.get_board_by_name(board_name)
+        # 获取板块ID
+        deadline = self._make_deadline(deadline)
+        board_id = self._resolve_board_id(board_name, deadline)
         
         post_data = {
             "title": title,
@@ -321,7 +1455,10 @@ class CodeMaoClient:
         }
         
         try:
-            response = self._request("POST", f"/web/forums/boards/{board.id}/posts", post_data)
+            response = self._request(
+                "POST", f"/web/forums/boards/{board_id}/posts", post_data,
+                deadline=deadline
+            )
             post_id = response.get('id')
             
             if post_id:
@@ -335,47 +1472,54 @@ class CodeMaoClient:
                 raise ValidationError("请求参数验证失败")
             raise APIError(f"发布帖子失败: {e.message}")
     
-    def delete_post(self, post_id: Union[str, int]) -> None:
+    def delete_post(self, post_id: Union[str, int],
+                    deadline: DeadlineLike = None) -> None:
         """
         删除帖子
         
         Args:
             post_id: 帖子ID
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
             
         Raises:
             AuthenticationError: 未登录
             ResourceNotFoundError: 帖子不存在
         """
-        if not self.is_authenticated:
-            raise AuthenticationError("请先登录")
+        self._ensure_authenticated()
             
         try:
-            self._request("DELETE", f"/web/forums/posts/{post_id}")
+            self._request("DELETE", f"/web/forums/posts/{post_id}", deadline=deadline)
             logger.info(f"用户 {self.current_user.nickname} 删除帖子 {post_id} 成功")
         except ResourceNotFoundError:
             raise ResourceNotFoundError(f"帖子不存在: {post_id}")
+        except (AuthenticationError, RateLimitError, NetworkError):
+            raise
         except Exception as e:
             logger.error(f"删除帖子失败: {e}")
             raise APIError(f"删除帖子失败: {e}")
     
-    def reply_to_post(self, post_id: Union[str, int], content: str) -> str:
+    def reply_to_post(self, post_id: Union[str, int], content: str,
+                      deadline: DeadlineLike = None) -> str:
         """
         回复帖子
         
         Args:
             post_id: 帖子ID
             content: 回复内容
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
             
         Returns:
             回复ID
         """
-        if not self.is_authenticated:
-            raise AuthenticationError("请先登录")
+        self._ensure_authenticated()
             
         reply_data = {"content": content}
         
         try:
-            response = self._request("POST", f"/web/forums/posts/{post_id}/replies", reply_data)
+            response = self._request(
+                "POST", f"/web/forums/posts/{post_id}/replies", reply_data,
+                deadline=deadline
+            )
             reply_id = response.get('id')
             
             if reply_id:
@@ -387,36 +1531,40 @@ class CodeMaoClient:
         except APIError as e:
             raise APIError(f"回复帖子失败: {e.message}")
     
-    def get_message_stats(self) -> MessageStats:
+    def get_message_stats(self, deadline: DeadlineLike = None) -> MessageStats:
         """
         获取消息统计
         
+        Args:
+            deadline: 截止时间（秒数或 Deadline），None表示使用客户端默认值
+        
         Returns:
             消息统计对象
         """
-        if not self.is_authenticated:
-            raise AuthenticationError("请先登录")
+        self._ensure_authenticated()
             
         try:
-            response = self._request("GET", "/web/message-record/count")
+            response = self._request("GET", "/web/message-record/count", deadline=deadline)
             return MessageStats.from_dict(response)
+        except (AuthenticationError, RateLimitError, NetworkError):
+            raise
         except Exception as e:
             logger.error(f"获取消息统计失败: {e}")
             raise APIError(f"获取消息统计失败: {e}")
     
-    def update_user_info(self, **kwargs) -> None:
+    def update_user_info(self, deadline: DeadlineLike = None, **kwargs) -> None:
         """
         更新用户信息
         
         Args:
+            deadline: 所有字段共享的截止时间（秒数或 Deadline），None表示使用客户端默认值
             **kwargs: 要更新的字段（nickname, fullname, description, sex, birthday, avatar_url）
             
         Raises:
             AuthenticationError: 未登录
             ValidationError: 参数验证失败
         """
-        if not self.is_authenticated:
-            raise AuthenticationError("请先登录")
+        self._ensure_authenticated()
             
         # 验证参数
         valid_fields = {'nickname', 'fullname', 'description', 'sex', 'birthday', 'avatar_url'}
@@ -425,19 +1573,38 @@ class CodeMaoClient:
             raise ValidationError(f"无效的字段: {invalid_fields}")
         
         # 更新每个字段
+        deadline = self._make_deadline(deadline)
         for field, value in kwargs.items():
             try:
-                self._request("PATCH", f"/tiger/v3/web/accounts/{field}", {field: value})
+                self._request(
+                    "PATCH", f"/tiger/v3/web/accounts/{field}", {field: value},
+                    deadline=deadline
+                )
                 logger.info(f"用户 {self.current_user.nickname} 更新 {field} 成功")
             except APIError as e:
                 if e.error_code == 5:
                     raise ValidationError(f"字段 {field} 格式错误")
                 raise APIError(f"更新 {field} 失败: {e.message}")
     
+    def close(self) -> None:
+        """
+        停止后台刷新并关闭HTTP会话
+        
+        会话关闭时传输层随之关闭，RecordingTransport 在此时保存录制文件。
+        不会登出，需要登出时先调用 logout。
+        """
+        try:
+            self._board_catalog.close()
+        finally:
+            self.session.close()
+    
     def __enter__(self):
         """上下文管理器支持"""
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """上下文管理器清理"""
-        self.logout()
\ No newline at end of file
+        try:
+            self.logout()
+        finally:
+            self.close()
\ No newline at end of file
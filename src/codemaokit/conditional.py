@@ -0,0 +1,95 @@
+"""
+CodeMao 条件请求支持
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+
+class Validators(NamedTuple):
+    """资源的校验信息及对应的已解析响应"""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    data: Any
+
+
+class ValidatorStore:
+    """
+    条件请求校验信息存储
+
+    按URL保存 ETag / Last-Modified 和解析后的响应，
+    服务器返回304时直接复用已解析的数据。超过容量时淘汰最久未使用的条目。
+    """
+
+    def __init__(self, max_entries: int = 512):
+        """
+        初始化存储
+
+        Args:
+            max_entries: 最多保存的资源数
+        """
+        self.max_entries = max_entries
+        self.revalidated = 0
+        self._data: "OrderedDict[str, Validators]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Validators]:
+        """读取校验信息"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def request_headers(self, key: str) -> Dict[str, str]:
+        """
+        生成条件请求头
+
+        Returns:
+            If-None-Match / If-Modified-Since 请求头，没有校验信息时为空
+        """
+        entry = self.get(key)
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(self, key: str, etag: Optional[str], last_modified: Optional[str],
+              data: Any) -> None:
+        """保存响应的校验信息，响应没有校验信息时删除旧条目"""
+        with self._lock:
+            if not etag and not last_modified:
+                self._data.pop(key, None)
+                return
+            self._data[key] = Validators(etag, last_modified, data)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def not_modified(self, key: str) -> Any:
+        """
+        处理304响应
+
+        Returns:
+            之前保存的解析结果，没有保存时返回None
+        """
+        entry = self.get(key)
+        if entry is None:
+            return None
+        with self._lock:
+            self.revalidated += 1
+        return entry.data
+
+    def discard(self, key: str) -> None:
+        """删除校验信息"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清空所有校验信息"""
+        with self._lock:
+            self._data.clear()
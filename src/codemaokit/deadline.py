@@ -0,0 +1,89 @@
+"""
+CodeMao 请求截止时间
+"""
+
+import time
+from typing import Optional, Tuple, Union
+
+from .exceptions import DeadlineExceededError
+
+
+class Deadline:
+    """
+    请求截止时间
+
+    覆盖连接、读取、重试和退避的总时间预算。
+    同一个 Deadline 可以传给多次调用，让它们共享剩余预算。
+
+    示例:
+        >>> deadline = Deadline(2.0)
+        >>> user = client.get_user(123, deadline=deadline)
+        >>> honor = client.get_user_honor(123, deadline=deadline)
+    """
+
+    def __init__(self, seconds: float):
+        """
+        初始化截止时间
+
+        Args:
+            seconds: 从现在开始的时间预算（秒）
+        """
+        if seconds <= 0:
+            raise ValueError("截止时间必须大于0")
+        self.budget = float(seconds)
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """剩余秒数，已过期时为0"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """是否已过期"""
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """
+        检查是否已过期
+
+        Raises:
+            DeadlineExceededError: 已超过截止时间
+        """
+        if self.expired:
+            raise DeadlineExceededError(f"请求超过截止时间 ({self.budget:g} 秒)")
+
+    def clamp(self, connect: float, read: float) -> Tuple[float, float]:
+        """
+        将单次请求的连接/读取超时限制在剩余预算内
+
+        Args:
+            connect: 连接超时（秒）
+            read: 读取超时（秒）
+
+        Returns:
+            (连接超时, 读取超时)
+
+        Raises:
+            DeadlineExceededError: 已超过截止时间
+        """
+        self.check()
+        remaining = self.remaining()
+        return min(connect, remaining), min(read, remaining)
+
+    @classmethod
+    def coerce(cls, value: "DeadlineLike") -> Optional["Deadline"]:
+        """
+        将秒数转换为截止时间
+
+        Args:
+            value: 秒数、Deadline 或 None
+
+        Returns:
+            Deadline，value 为 None 时返回 None
+        """
+        if value is None or isinstance(value, Deadline):
+            return value
+        return cls(value)
+
+
+DeadlineLike = Union[float, Deadline, None]
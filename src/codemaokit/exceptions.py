@@ -43,9 +43,31 @@ class ResourceNotFoundError(CodeMaoError):
 
 class RateLimitError(CodeMaoError):
     """请求频率限制异常"""
-    pass
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None,
+                 error_code: Optional[int] = None,
+                 response_data: Optional[Dict[str, Any]] = None):
+        super().__init__(message, error_code, response_data)
+        # 建议的等待时间（秒），未知时为None
+        self.retry_after = retry_after
 
 
 class NetworkError(CodeMaoError):
     """网络异常 - 连接失败、超时等"""
-    pass
\ No newline at end of file
+    pass
+
+
+class CircuitOpenError(NetworkError):
+    """熔断异常 - 端点分组连续失败，熔断器打开期间直接拒绝请求"""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None,
+                 error_code: Optional[int] = None,
+                 response_data: Optional[Dict[str, Any]] = None):
+        super().__init__(message, error_code, response_data)
+        # 距离熔断器允许探测请求的秒数
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(NetworkError):
+    """截止时间异常 - 请求（含重试和退避）未能在截止时间内完成"""
+    pass
@@ -0,0 +1,305 @@
+"""
+CodeMao 对冲请求
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+
+class LatencyTracker:
+    """
+    最近请求耗时的滑动窗口
+
+    只保留最近 window 个样本，按需计算百分位数。
+    """
+
+    def __init__(self, window: int = 200):
+        """
+        初始化耗时窗口
+
+        Args:
+            window: 保留的样本数
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        """记录一次耗时"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        计算百分位数
+
+        Args:
+            p: 百分位（0-100）
+
+        Returns:
+            对应的耗时（秒），没有样本时返回None
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * p / 100))
+        return samples[index]
+
+
+class HedgingPolicy:
+    """
+    幂等GET请求的对冲策略
+
+    第一次请求在独立线程上发送，在该端点的百分位耗时内没有返回时，
+    由线程池再发送一个相同的请求，采用先成功返回的结果，另一个结果被丢弃。
+    对冲请求受预算限制：
+    每个请求为预算增加 budget 个令牌，每次对冲消耗一个，
+    长期来看对冲请求不超过总请求数的 budget 比例。
+
+    示例:
+        >>> policy = HedgingPolicy(percentile=95, budget=0.05, endpoints=[
+        ...     "/api/user/info/detail/{id}",
+        ...     "/web/forums/posts/{id}/details",
+        ... ])
+        >>> client = CodeMaoClient(hedging=policy)
+    """
+
+    def __init__(self, percentile: float = 95.0, budget: float = 0.1,
+                 burst: float = 10.0, initial_delay: float = 1.0,
+                 min_delay: float = 0.01, max_delay: Optional[float] = None,
+                 min_samples: int = 20, window: int = 200,
+                 endpoints: Optional[Iterable[str]] = None,
+                 max_workers: int = 32):
+        """
+        初始化对冲策略
+
+        Args:
+            percentile: 发送对冲请求前等待的耗时百分位
+            budget: 对冲请求占总请求数的最大比例
+            burst: 预算最多累积的对冲次数
+            initial_delay: 样本不足时使用的等待时间（秒）
+            min_delay: 等待时间下限（秒）
+            max_delay: 等待时间上限（秒），None表示不限制
+            min_samples: 开始使用百分位耗时所需的样本数
+            window: 每个端点保留的耗时样本数
+            endpoints: 允许对冲的端点模板，None表示所有GET端点
+            max_workers: 发送对冲请求的最大线程数
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile 必须在0到100之间")
+        if budget < 0:
+            raise ValueError("budget 不能为负数")
+        self.percentile = percentile
+        self.budget = budget
+        self.burst = burst
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.endpoints = frozenset(endpoints) if endpoints is not None else None
+        self.max_workers = max_workers
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._tokens = burst
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def applies(self, template: str) -> bool:
+        """端点模板是否允许对冲"""
+        return self.endpoints is None or template in self.endpoints
+
+    def _tracker(self, template: str) -> LatencyTracker:
+        with self._lock:
+            tracker = self._trackers.get(template)
+            if tracker is None:
+                tracker = self._trackers[template] = LatencyTracker(self.window)
+            return tracker
+
+    def delay_for(self, template: str) -> float:
+        """
+        计算发送对冲请求前的等待时间
+
+        Args:
+            template: 端点模板
+
+        Returns:
+            等待秒数
+        """
+        tracker = self._tracker(template)
+        delay = None
+        if len(tracker) >= self.min_samples:
+            delay = tracker.percentile(self.percentile)
+        if delay is None:
+            delay = self.initial_delay
+        delay = max(self.min_delay, delay)
+        if self.max_delay is not None:
+            delay = min(self.max_delay, delay)
+        return delay
+
+    def _try_spend(self) -> bool:
+        """从预算中取出一次对冲"""
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.hedged += 1
+                return True
+            return False
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="codemao-hedge"
+                )
+            return self._executor
+
+    def _attempt(self, tracker: LatencyTracker, send: Callable[[], Any]) -> Any:
+        start = time.monotonic()
+        result = send()
+        tracker.add(time.monotonic() - start)
+        return result
+
+    def _refund(self) -> None:
+        """归还取出但没有使用的对冲预算"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+            self.hedged -= 1
+
+    def run(self, template: str, send: Callable[[], Any],
+            accept: Callable[[Any], bool] = lambda result: True,
+            discard: Callable[[Any], None] = lambda result: None,
+            before_hedge: Optional[Callable[[], bool]] = None) -> Any:
+        """
+        执行一次可对冲的请求
+
+        第一次请求在独立线程上发送，不会排在线程池中的对冲请求后面；
+        调用方线程等待结果，超过等待时间后发送对冲请求并采用先成功返回的结果。
+
+        Args:
+            template: 端点模板，用于统计耗时
+            send: 发送请求的函数，可能被调用两次
+            accept: 判断结果是否成功的函数，不成功的结果只在没有成功结果时返回
+            discard: 处理被丢弃结果的函数（例如关闭响应）
+            before_hedge: 发送对冲请求前调用（例如获取限流令牌），返回False时不对冲
+
+        Returns:
+            先成功的结果；都不成功时返回第一个不成功的结果
+
+        Raises:
+            Exception: 所有请求都抛出异常时，抛出最后一个异常
+        """
+        tracker = self._tracker(template)
+        delay = self.delay_for(template)
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.burst, self._tokens + self.budget)
+
+        # (是否对冲请求, 是否正常返回, 结果或异常)，按完成顺序排列
+        outcomes: List[Tuple[bool, bool, Any]] = []
+        condition = threading.Condition()
+        settled = False
+
+        def attempt(hedge: bool) -> None:
+            if hedge:
+                with condition:
+                    if settled:
+                        # 排队期间已经有结果，不再发送
+                        self._refund()
+                        return
+            try:
+                outcome = (hedge, True, self._attempt(tracker, send))
+            except Exception as e:
+                outcome = (hedge, False, e)
+            with condition:
+                late = settled
+                if not late:
+                    outcomes.append(outcome)
+                    condition.notify_all()
+            # 请求无法中断，返回后立即丢弃落后的结果
+            if late and outcome[1]:
+                discard(outcome[2])
+
+        threading.Thread(
+            target=attempt, args=(False,), name="codemao-hedge-primary", daemon=True
+        ).start()
+        expected = 1
+        with condition:
+            condition.wait_for(lambda: outcomes, timeout=delay)
+            waiting = not outcomes
+        if waiting and self._try_spend():
+            if before_hedge is not None and not before_hedge():
+                self._refund()
+            else:
+                logger.debug(f"{template} 超过 {delay:.3f} 秒未响应，发送对冲请求")
+                try:
+                    self._get_executor().submit(attempt, True)
+                    expected = 2
+                except RuntimeError:
+                    # 策略已关闭，只等待第一次请求
+                    self._refund()
+
+        seen = 0
+        winner: List[Any] = []
+        fallback: List[Any] = []
+        error: Optional[BaseException] = None
+        with condition:
+            while not winner and seen < expected:
+                condition.wait_for(lambda: len(outcomes) > seen)
+                hedge, ok, value = outcomes[seen]
+                seen += 1
+                if not ok:
+                    error = value
+                elif accept(value):
+                    winner.append(value)
+                    if hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                else:
+                    fallback.append(value)
+            settled = True
+
+        if winner:
+            for result in fallback:
+                discard(result)
+            return winner[0]
+        for result in fallback[1:]:
+            discard(result)
+        if fallback:
+            return fallback[0]
+        raise error
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取对冲统计
+
+        Returns:
+            包含 requests、hedged、hedge_wins 和 hedge_rate 的字典
+        """
+        with self._lock:
+            requests, hedged, wins = self.requests, self.hedged, self.hedge_wins
+        return {
+            "requests": requests,
+            "hedged": hedged,
+            "hedge_wins": wins,
+            "hedge_rate": hedged / requests if requests else 0.0,
+        }
+
+    def close(self) -> None:
+        """停止执行请求的线程"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,84 @@
+"""
+CodeMao JSON解码器选择
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional, Union
+
+JsonLoads = Callable[[Union[bytes, str]], Any]
+
+
+def _load_orjson() -> Optional[JsonLoads]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson.loads
+
+
+def _load_ujson() -> Optional[JsonLoads]:
+    try:
+        import ujson
+    except ImportError:
+        return None
+    return ujson.loads
+
+
+# 按优先级排列的可选解码器
+_BACKENDS: Dict[str, Callable[[], Optional[JsonLoads]]] = {
+    "orjson": _load_orjson,
+    "ujson": _load_ujson,
+    "json": lambda: json.loads,
+}
+
+
+def get_loads(name: Optional[str] = None) -> JsonLoads:
+    """
+    获取JSON解码函数
+
+    解码函数直接接受 bytes，解码失败时抛出 ValueError 的子类。
+
+    Args:
+        name: 解码器名称（orjson、ujson、json），None表示自动选择已安装的最快解码器
+
+    Returns:
+        解码函数
+
+    Raises:
+        ValueError: 指定的解码器不存在或未安装
+    """
+    if name is not None:
+        if name not in _BACKENDS:
+            raise ValueError(f"未知的JSON解码器: {name}")
+        loads = _BACKENDS[name]()
+        if loads is None:
+            raise ValueError(f"JSON解码器未安装: {name}")
+        return loads
+
+    for loader in _BACKENDS.values():
+        loads = loader()
+        if loads is not None:
+            return loads
+    return json.loads  # pragma: no cover
+
+
+def body_preview(content: bytes, limit: int = 200) -> str:
+    """
+    生成响应体的预览文本
+
+    只解码前 limit 个字节，避免在异常中保留整个响应体。
+
+    Args:
+        content: 响应体
+        limit: 最多保留的字节数
+
+    Returns:
+        预览文本
+    """
+    preview = content[:limit].decode("utf-8", errors="replace")
+    if len(content) > limit:
+        preview += f"...（共{len(content)}字节）"
+    return preview
+
+
+loads = get_loads()
@@ -0,0 +1,225 @@
+"""
+CodeMao 客户端指标
+"""
+
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .middleware import Middleware, RequestContext
+
+# 默认耗时分桶上界（秒）
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+class Histogram:
+    """
+    固定分桶的直方图
+
+    每次记录只做一次二分查找和几次加法，不保存原始样本。
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        初始化直方图
+
+        Args:
+            buckets: 递增的分桶上界
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """记录一个值"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """
+        获取累计分桶计数
+
+        Returns:
+            (上界, 累计计数) 列表，最后一项的上界为 +Inf
+        """
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((_format_float(bound), total))
+        result.append(("+Inf", total + self.counts[-1]))
+        return result
+
+
+class EndpointStats:
+    """单个端点模板的统计"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.requests = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.latency = Histogram(buckets)
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value)) if value != int(value) else f"{value:.1f}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class MetricsRegistry(Middleware):
+    """
+    按端点模板统计的客户端指标
+
+    作为最外层中间件记录每次API调用的次数、状态码、异常类型、重试次数、
+    收发字节数和耗时直方图，可导出为 Prometheus 文本格式或字典快照。
+    未启用时客户端不经过中间件链，没有额外开销。
+
+    示例:
+        >>> metrics = MetricsRegistry()
+        >>> client = CodeMaoClient(metrics=metrics)
+        >>> client.get_boards()
+        >>> print(metrics.to_prometheus())
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 namespace: str = "codemao"):
+        """
+        初始化指标注册表
+
+        Args:
+            buckets: 耗时直方图的分桶上界（秒）
+            namespace: Prometheus 指标名前缀
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._stats: Dict[Tuple[str, str], EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, context: RequestContext,
+                error: Optional[BaseException] = None) -> None:
+        key = (context.method, context.template)
+        durations = context.durations()
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats(self.buckets)
+            stats.requests += 1
+            stats.retries += max(0, context.attempts - 1)
+            stats.bytes_in += context.bytes_in
+            stats.bytes_out += context.bytes_out
+            if context.from_cache:
+                stats.cache_hits += 1
+            if context.status_code is not None:
+                stats.statuses[context.status_code] += 1
+            if error is not None:
+                stats.errors[type(error).__name__] += 1
+            if "total" in durations:
+                stats.latency.observe(durations["total"])
+
+    def after_receive(self, context: RequestContext, data: Any) -> Any:
+        self._record(context)
+        return None
+
+    def on_error(self, context: RequestContext, error: BaseException) -> Any:
+        self._record(context, error)
+        return None
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        获取指标快照
+
+        Returns:
+            以 "方法 端点模板" 为键的字典，值包含 requests、retries、cache_hits、
+            bytes_in、bytes_out、statuses、errors 和 latency（count、sum、buckets）
+        """
+        with self._lock:
+            result: Dict[str, Dict[str, Any]] = {}
+            for (method, template), stats in sorted(self._stats.items()):
+                result[f"{method} {template}"] = {
+                    "requests": stats.requests,
+                    "retries": stats.retries,
+                    "cache_hits": stats.cache_hits,
+                    "bytes_in": stats.bytes_in,
+                    "bytes_out": stats.bytes_out,
+                    "statuses": dict(stats.statuses),
+                    "errors": dict(stats.errors),
+                    "latency": {
+                        "count": stats.latency.count,
+                        "sum": stats.latency.sum,
+                        "buckets": dict(stats.latency.cumulative()),
+                    },
+                }
+            return result
+
+    def to_prometheus(self) -> str:
+        """
+        导出 Prometheus 文本格式
+
+        Returns:
+            符合 Prometheus 文本暴露格式 0.0.4 的字符串
+        """
+        ns = self.namespace
+        families: Dict[str, Tuple[str, str, List[str]]] = {
+            "requests": (f"{ns}_requests_total", "counter", []),
+            "responses": (f"{ns}_responses_total", "counter", []),
+            "errors": (f"{ns}_errors_total", "counter", []),
+            "retries": (f"{ns}_retries_total", "counter", []),
+            "cache_hits": (f"{ns}_cache_hits_total", "counter", []),
+            "bytes_in": (f"{ns}_response_bytes_total", "counter", []),
+            "bytes_out": (f"{ns}_request_bytes_total", "counter", []),
+            "latency": (f"{ns}_request_duration_seconds", "histogram", []),
+        }
+        helps = {
+            "requests": "API调用次数",
+            "responses": "按HTTP状态码统计的响应数",
+            "errors": "按异常类型统计的失败调用数",
+            "retries": "重试次数",
+            "cache_hits": "响应缓存命中次数",
+            "bytes_in": "接收的响应体字节数",
+            "bytes_out": "发送的请求体字节数",
+            "latency": "API调用耗时（秒）",
+        }
+
+        with self._lock:
+            for (method, template), stats in sorted(self._stats.items()):
+                labels = f'method="{_escape(method)}",endpoint="{_escape(template)}"'
+                for field in ("requests", "retries", "cache_hits", "bytes_in", "bytes_out"):
+                    name, _, lines = families[field]
+                    lines.append(f"{name}{{{labels}}} {getattr(stats, field)}")
+                name, _, lines = families["responses"]
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f'{name}{{{labels},status="{status}"}} {count}')
+                name, _, lines = families["errors"]
+                for exception, count in sorted(stats.errors.items()):
+                    lines.append(
+                        f'{name}{{{labels},exception="{_escape(exception)}"}} {count}'
+                    )
+                name, _, lines = families["latency"]
+                for bound, count in stats.latency.cumulative():
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {stats.latency.sum!r}")
+                lines.append(f"{name}_count{{{labels}}} {stats.latency.count}")
+
+        output: List[str] = []
+        for field, (name, kind, lines) in families.items():
+            output.append(f"# HELP {name} {helps[field]}")
+            output.append(f"# TYPE {name} {kind}")
+            output.extend(lines)
+        return "\n".join(output) + "\n"
+
+    def reset(self) -> None:
+        """清空所有指标"""
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,293 @@
+"""
+CodeMao 请求中间件
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .utils import endpoint_group, endpoint_template
+
+# 当前线程正在发送的请求的计时表，由计时连接写入建立连接的时间
+_current = threading.local()
+
+
+class RequestContext:
+    """
+    一次API调用的上下文
+
+    在中间件之间传递，记录请求信息、结果和各阶段的时间戳。
+    时间戳来自 time.perf_counter()，只在同一进程内可比较：
+
+    - start: 进入中间件链
+    - connect_start / connect_end: 建立新连接（含DNS解析和TLS握手），复用连接时没有
+    - send: 通过限流和熔断检查、开始发送
+    - first_byte: 收到响应头
+    - received: 读完响应体
+    - parsed: JSON解析完成
+    - end: 调用结束（成功或失败）
+
+    发生重试时，send 之后的时间戳记录最后一次尝试。
+    """
+
+    def __init__(self, method: str, endpoint: str,
+                 data: Optional[Dict[str, Any]] = None,
+                 params: Optional[Dict[str, Any]] = None,
+                 deadline: Any = None):
+        """
+        初始化上下文
+
+        Args:
+            method: 请求方法
+            endpoint: API端点
+            data: 请求数据
+            params: URL参数
+            deadline: 截止时间
+        """
+        self.method = method
+        self.endpoint = endpoint
+        self.template = endpoint_template(endpoint)
+        self.group = endpoint_group(endpoint)
+        self.data = data
+        self.params = params
+        self.deadline = deadline
+        # 中间件可以在 before_send 中添加请求头
+        self.headers: Dict[str, str] = {}
+        self.timings: Dict[str, float] = {}
+        self.attempts = 0
+        self.status_code: Optional[int] = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.from_cache = False
+        self.shared = False
+        self.error: Optional[BaseException] = None
+        # 中间件之间共享数据的位置
+        self.extras: Dict[str, Any] = {}
+        self._replay: Optional[Callable[[], Any]] = None
+
+    def mark(self, phase: str) -> None:
+        """记录阶段时间戳"""
+        self.timings[phase] = time.perf_counter()
+
+    def durations(self) -> Dict[str, float]:
+        """
+        计算各阶段耗时
+
+        Returns:
+            秒数字典，可能包含 queue（排队）、connect（建立连接）、ttfb（首字节）、
+            download（读取响应体）、parse（解析）和 total（总耗时），缺少时间戳的阶段不包含
+        """
+        t = self.timings
+        spans = {
+            "queue": ("start", "send"),
+            "connect": ("connect_start", "connect_end"),
+            "ttfb": ("send", "first_byte"),
+            "download": ("first_byte", "received"),
+            "parse": ("received", "parsed"),
+            "total": ("start", "end"),
+        }
+        return {
+            name: t[end] - t[start]
+            for name, (start, end) in spans.items()
+            if start in t and end in t
+        }
+
+    def replay(self) -> Any:
+        """
+        重新发送本次请求（不经过中间件），供 on_error 实现自定义重试
+
+        Returns:
+            API响应数据
+        """
+        if self._replay is None:
+            raise RuntimeError("当前上下文不支持重新发送")
+        self.error = None
+        return self._replay()
+
+
+class Middleware:
+    """
+    中间件基类
+
+    按注册顺序调用 before_send，按相反顺序调用 after_receive 和 on_error。
+    三个钩子返回非None的值时分别表示：直接使用该值作为响应（不发送请求）、
+    替换响应数据、从错误中恢复并使用该值作为响应。
+
+    示例:
+        >>> class Timing(Middleware):
+        ...     def after_receive(self, context, data):
+        ...         print(context.endpoint, context.durations())
+        >>> client = CodeMaoClient(middlewares=[Timing()])
+    """
+
+    def before_send(self, context: RequestContext) -> Any:
+        """发送请求前调用"""
+        return None
+
+    def after_receive(self, context: RequestContext, data: Any) -> Any:
+        """收到并解析响应后调用"""
+        return None
+
+    def on_error(self, context: RequestContext, error: BaseException) -> Any:
+        """请求失败时调用"""
+        return None
+
+
+def run_chain(middlewares: List[Middleware], context: RequestContext,
+              call: Callable[[], Any]) -> Any:
+    """
+    在中间件链中执行一次调用
+
+    Args:
+        middlewares: 中间件列表
+        context: 调用上下文
+        call: 实际发送请求的函数
+
+    Returns:
+        API响应数据
+    """
+    context._replay = call
+    context.mark("start")
+    try:
+        data = None
+        for middleware in middlewares:
+            data = middleware.before_send(context)
+            if data is not None:
+                break
+        else:
+            data = call()
+    except Exception as error:
+        context.error = error
+        context.mark("end")
+        for middleware in reversed(middlewares):
+            data = middleware.on_error(context, error)
+            if data is not None:
+                break
+        else:
+            raise
+        context.error = None
+
+    context.mark("end")
+    for middleware in reversed(middlewares):
+        replaced = middleware.after_receive(context, data)
+        if replaced is not None:
+            data = replaced
+    return data
+
+
+def run_stream_chain(middlewares: List[Middleware], context: RequestContext,
+                     stream: Callable[[], Iterator[Any]]) -> Iterator[Any]:
+    """
+    在中间件链中执行一次流式调用
+
+    整个读取过程算作一次调用：before_send 返回的响应中的 items 代替请求结果；
+    读完或调用方提前停止时调用 after_receive，流式读取时 data 为None，返回值被忽略；
+    出错时调用 on_error，只有还没有产出任何元素时才能用返回的响应恢复。
+
+    Args:
+        middlewares: 中间件列表
+        context: 调用上下文
+        stream: 发送请求并逐个产出元素的函数
+
+    Yields:
+        列表元素
+    """
+    context.mark("start")
+    data = None
+    yielded = False
+    try:
+        for middleware in middlewares:
+            data = middleware.before_send(context)
+            if data is not None:
+                break
+        if data is not None:
+            yield from data.get("items") or []
+        else:
+            for item in stream():
+                yielded = True
+                yield item
+    except GeneratorExit:
+        _finish_stream(middlewares, context, data)
+        raise
+    except Exception as error:
+        context.error = error
+        context.mark("end")
+        for middleware in reversed(middlewares):
+            data = middleware.on_error(context, error)
+            if data is not None:
+                break
+        if data is None or yielded:
+            raise
+        context.error = None
+        yield from data.get("items") or []
+    _finish_stream(middlewares, context, data)
+
+
+def _finish_stream(middlewares: List[Middleware], context: RequestContext,
+                   data: Any) -> None:
+    context.mark("end")
+    for middleware in reversed(middlewares):
+        middleware.after_receive(context, data)
+
+
+@contextmanager
+def record_connect(timings: Optional[Dict[str, float]]) -> Iterator[None]:
+    """
+    在当前线程内记录新建连接的时间
+
+    Args:
+        timings: 写入 connect_start / connect_end 的计时表，None表示不记录
+    """
+    previous = getattr(_current, "timings", None)
+    _current.timings = timings
+    try:
+        yield
+    finally:
+        _current.timings = previous
+
+
+class _TimedConnectionMixin:
+    def connect(self) -> None:
+        timings = getattr(_current, "timings", None)
+        if timings is None:
+            return super().connect()
+        start = time.perf_counter()
+        super().connect()
+        timings["connect_start"] = start
+        timings["connect_end"] = time.perf_counter()
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimingAdapter(HTTPAdapter):
+    """
+    记录建立连接时间的HTTP适配器
+
+    DNS解析在 urllib3 建立连接时进行，计入 connect 阶段。
+    """
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
@@ -188,4 +188,80 @@ class UserHonor:
             like_score=data.get('like_score', 0),
             collect_score=data.get('collect_score', 0),
             fork_score=data.get('fork_score', 0)
-        )
\ No newline at end of file
+        )
+
+
+@dataclass
+class UserBatchResult:
+    """批量获取用户信息时单个用户的结果"""
+    user_id: int
+    user: Optional[User] = None
+    honor: Optional[UserHonor] = None
+    error: Optional[Exception] = None
+    
+    @property
+    def ok(self) -> bool:
+        """是否获取成功"""
+        return self.error is None
+
+
+@dataclass
+class Collection:
+    """收藏作品模型"""
+    id: int
+    name: str
+    preview: str
+    user_id: int = 0
+    nickname: str = ""
+    avatar_url: str = ""
+    views_count: int = 0
+    likes_count: int = 0
+    collections_count: int = 0
+    is_deleted: bool = False
+    publish_time: int = 0
+    work_type: int = 0
+    description: str = ""
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Collection":
+        """从字典创建收藏作品实例"""
+        return cls(
+            id=data.get('id', 0),
+            name=data.get('name', data.get('work_name', '')),
+            preview=data.get('preview', ''),
+            user_id=data.get('user_id', 0),
+            nickname=data.get('nickname', ''),
+            avatar_url=data.get('avatar_url', ''),
+            views_count=data.get('views_count', 0),
+            likes_count=data.get('likes_count', 0),
+            collections_count=data.get('collections_count', 0),
+            is_deleted=data.get('is_deleted', False),
+            publish_time=data.get('publish_time', 0),
+            work_type=data.get('work_type', 0),
+            description=data.get('description', '')
+        )
+
+
+@dataclass
+class Follower:
+    """关注/粉丝用户模型"""
+    id: int
+    nickname: str
+    avatar_url: str = ""
+    n_works: int = 0
+    total_likes: int = 0
+    is_followed: bool = False
+    description: str = ""
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Follower":
+        """从字典创建关注/粉丝用户实例"""
+        return cls(
+            id=data.get('id', 0),
+            nickname=data.get('nickname', ''),
+            avatar_url=data.get('avatar_url', ''),
+            n_works=data.get('n_works', 0),
+            total_likes=data.get('total_likes', 0),
+            is_followed=data.get('is_followed', False),
+            description=data.get('description', '')
+        )
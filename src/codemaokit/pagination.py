@@ -0,0 +1,113 @@
+"""
+CodeMao 分页列表迭代器
+"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any, Callable, Deque, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar
+)
+
+T = TypeVar("T")
+
+# 每页默认条数
+DEFAULT_PAGE_SIZE = 50
+
+
+class PageIterator(Generic[T]):
+    """
+    分页列表迭代器
+
+    按页请求列表接口并逐个产出模型对象。开启预取时，取到一页后立即在后台请求下一页，
+    调用方处理当前页时下一页已经在路上。cursor 是下一个要产出的元素的位置，
+    中断后把它传给同一个 iter_* 方法即可从断点继续。
+    某一页请求失败时异常在调用方取到该页时抛出，cursor 不变，可以重试或稍后恢复。
+
+    示例:
+        >>> works = client.iter_user_works(123)
+        >>> for work in itertools.islice(works, 100):
+        ...     print(work.name)
+        >>> cursor = works.cursor
+        >>> rest = list(client.iter_user_works(123, cursor=cursor))
+    """
+
+    def __init__(self, fetch_page: Callable[[int, int], Dict[str, Any]],
+                 model: Callable[[Dict[str, Any]], T],
+                 cursor: int = 0, page_size: int = DEFAULT_PAGE_SIZE,
+                 prefetch: bool = True):
+        """
+        初始化分页迭代器
+
+        Args:
+            fetch_page: 按 (offset, limit) 请求一页的函数，返回包含 items 的响应
+            model: 将元素字典转换为模型的函数
+            cursor: 起始位置
+            page_size: 每页条数
+            prefetch: 是否在后台预取下一页
+        """
+        if page_size <= 0:
+            raise ValueError("page_size 必须大于0")
+        self.cursor = max(0, cursor)
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.pages = 0
+        self._fetch_page = fetch_page
+        self._model = model
+        self._buffer: Deque[T] = deque()
+        self._next_offset = self.cursor
+        self._exhausted = False
+        self._pending: Optional[Future] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __iter__(self) -> Iterator[T]:
+        return self
+
+    def __next__(self) -> T:
+        while not self._buffer:
+            if self._exhausted:
+                self.close()
+                raise StopIteration
+            self._next_page()
+        self.cursor += 1
+        return self._buffer.popleft()
+
+    def __enter__(self) -> "PageIterator[T]":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """停止预取并释放后台线程"""
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _load(self, offset: int) -> Tuple[List[T], Optional[int]]:
+        response = self._fetch_page(offset, self.page_size)
+        items = [self._model(item) for item in response.get("items") or []]
+        return items, response.get("total")
+
+    def _next_page(self) -> None:
+        if self._pending is not None:
+            future, self._pending = self._pending, None
+            items, total = future.result()
+        else:
+            items, total = self._load(self._next_offset)
+
+        self.pages += 1
+        self._next_offset += len(items)
+        self._buffer.extend(items)
+        self._exhausted = (
+            len(items) < self.page_size
+            or (total is not None and self._next_offset >= total)
+        )
+        if not self._exhausted and self.prefetch:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="codemao-prefetch"
+                )
+            self._pending = self._executor.submit(self._load, self._next_offset)
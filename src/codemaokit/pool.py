@@ -0,0 +1,336 @@
+"""
+CodeMao 多账号会话池
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .client import CodeMaoClient
+from .exceptions import AuthenticationError, RateLimitError
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = "round_robin"
+LEAST_LOADED = "least_loaded"
+
+ACTIVE = "active"
+COOLDOWN = "cooldown"
+RELOGIN = "relogin"
+
+
+class PooledSession:
+    """会话池中的一个账号"""
+
+    def __init__(self, identity: str, password: str, client: CodeMaoClient):
+        self.identity = identity
+        self.password = password
+        self.client = client
+        self.state = RELOGIN
+        self.in_flight = 0
+        self.calls = 0
+        self.rate_limited = 0
+        self.auth_failures = 0
+        # COOLDOWN 结束或下一次重新登录的时间（time.monotonic）
+        self.available_at = 0.0
+        self.relogin_attempts = 0
+        self.last_used = 0.0
+
+    def available(self, now: float) -> bool:
+        """是否可以分配给调用方"""
+        if self.state == COOLDOWN and now >= self.available_at:
+            self.state = ACTIVE
+        return self.state == ACTIVE
+
+
+class SessionPool:
+    """
+    多账号会话池
+
+    持有多个已登录的客户端，按策略把调用分配给可用的账号：
+    round_robin 依次轮转，least_loaded 选择进行中调用最少的账号。
+    调用抛出 RateLimitError 时，该账号暂停到 retry_after 之后再使用；
+    抛出 AuthenticationError 时，该账号移出轮转，由后台线程按指数退避重新登录。
+    没有可用账号时，最多等待 acquire_timeout 秒。
+    第一次取出账号时自动登录所有账号，也可以调用 start 或使用 with 提前登录。
+
+    示例:
+        >>> accounts = [("user1", "pass1"), ("user2", "pass2")]
+        >>> with SessionPool(accounts) as pool:
+        ...     pool.call("create_post", "标题标题", "内容内容内容内容", "灌水")
+        ...     with pool.session() as client:
+        ...         client.get_message_stats()
+    """
+
+    def __init__(self, credentials: Iterable[Tuple[str, str]],
+                 policy: str = LEAST_LOADED,
+                 client_factory: Optional[Callable[[], CodeMaoClient]] = None,
+                 cooldown: float = 60.0, relogin_delay: float = 5.0,
+                 max_relogin_delay: float = 300.0, acquire_timeout: float = 30.0,
+                 login_workers: int = 4):
+        """
+        初始化会话池
+
+        Args:
+            credentials: (账号, 密码) 列表
+            policy: 分配策略，round_robin 或 least_loaded
+            client_factory: 创建客户端的函数，默认使用 CodeMaoClient()
+            cooldown: RateLimitError 没有 retry_after 时的暂停时间（秒）
+            relogin_delay: 第一次重新登录前的等待时间（秒），之后每次失败加倍
+            max_relogin_delay: 重新登录等待时间的上限（秒）
+            acquire_timeout: 没有可用账号时的最长等待时间（秒）
+            login_workers: 启动时并发登录的线程数
+        """
+        if policy not in (ROUND_ROBIN, LEAST_LOADED):
+            raise ValueError(f"未知的分配策略: {policy}")
+        factory = client_factory or CodeMaoClient
+        self.sessions: List[PooledSession] = [
+            PooledSession(identity, password, factory())
+            for identity, password in credentials
+        ]
+        if not self.sessions:
+            raise ValueError("至少需要一个账号")
+        self.policy = policy
+        self.cooldown = cooldown
+        self.relogin_delay = relogin_delay
+        self.max_relogin_delay = max_relogin_delay
+        self.acquire_timeout = acquire_timeout
+        self.login_workers = login_workers
+        self._next = 0
+        self._started = False
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._condition = threading.Condition()
+        self._relogin_thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "SessionPool":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def start(self) -> "SessionPool":
+        """
+        并发登录所有账号
+
+        登录失败的账号交给后台线程重新登录，不影响其他账号。
+        """
+        self._started = True
+        pending = [s for s in self.sessions if s.state == RELOGIN]
+        with ThreadPoolExecutor(max_workers=self.login_workers) as executor:
+            results = list(executor.map(self._login, pending))
+        with self._condition:
+            for session, ok in zip(pending, results):
+                if ok:
+                    self._activate(session)
+                else:
+                    self._schedule_relogin(session)
+            self._condition.notify_all()
+        logger.info(f"会话池已登录 {sum(results)}/{len(pending)} 个账号")
+        return self
+
+    def close(self) -> None:
+        """停止后台重新登录并关闭所有客户端的连接"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._relogin_thread is not None:
+            self._relogin_thread.join()
+        for session in self.sessions:
+            session.client.close()
+
+    def _login(self, session: PooledSession) -> bool:
+        try:
+            session.client.login(session.identity, session.password)
+            return True
+        except Exception as e:
+            logger.warning(f"账号 {session.identity} 登录失败: {e}")
+            return False
+
+    def _activate(self, session: PooledSession) -> None:
+        session.state = ACTIVE
+        session.relogin_attempts = 0
+
+    def _schedule_relogin(self, session: PooledSession) -> None:
+        """移出轮转并安排重新登录，调用时需持有锁"""
+        delay = min(self.max_relogin_delay,
+                    self.relogin_delay * 2 ** session.relogin_attempts)
+        session.state = RELOGIN
+        session.available_at = time.monotonic() + delay
+        session.relogin_attempts += 1
+        if self._relogin_thread is None and not self._closed:
+            self._relogin_thread = threading.Thread(
+                target=self._relogin_loop, name="codemao-relogin", daemon=True
+            )
+            self._relogin_thread.start()
+        self._condition.notify_all()
+
+    def _relogin_loop(self) -> None:
+        """后台重新登录到期的账号"""
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        return
+                    now = time.monotonic()
+                    due = [s for s in self.sessions
+                           if s.state == RELOGIN and s.in_flight == 0]
+                    ready = [s for s in due if s.available_at <= now]
+                    if ready:
+                        session = min(ready, key=lambda s: s.available_at)
+                        # 登录期间不会被分配，也不会被重复选中
+                        session.available_at = float("inf")
+                        break
+                    timeout = min((s.available_at for s in due), default=None)
+                    self._condition.wait(None if timeout is None else timeout - now)
+
+            ok = self._login(session)
+            with self._condition:
+                if ok:
+                    logger.info(f"账号 {session.identity} 已重新登录")
+                    self._activate(session)
+                else:
+                    self._schedule_relogin(session)
+                self._condition.notify_all()
+
+    def _pick(self, now: float) -> Optional[PooledSession]:
+        """按策略选择可用账号，调用时需持有锁"""
+        count = len(self.sessions)
+        if self.policy == ROUND_ROBIN:
+            for offset in range(count):
+                session = self.sessions[(self._next + offset) % count]
+                if session.available(now):
+                    self._next = (self._next + offset + 1) % count
+                    return session
+            return None
+        candidates = [s for s in self.sessions if s.available(now)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda s: (s.in_flight, s.last_used))
+
+    def _unavailable_error(self, now: float) -> Exception:
+        cooling = [s.available_at - now for s in self.sessions if s.state == COOLDOWN]
+        if cooling:
+            return RateLimitError("所有账号都被限流", retry_after=max(0.0, min(cooling)))
+        return AuthenticationError("没有已登录的账号")
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledSession:
+        """
+        取出一个可用账号，用完后必须调用 release
+
+        Args:
+            timeout: 最长等待时间（秒），None表示使用 acquire_timeout
+
+        Raises:
+            RateLimitError: 等待超时且有账号处于限流暂停中
+            AuthenticationError: 等待超时且没有已登录的账号
+        """
+        if not self._started:
+            # 没有调用 start 时在第一次取出账号前登录，并发的调用等待登录完成
+            with self._start_lock:
+                if not self._started:
+                    self.start()
+        timeout = self.acquire_timeout if timeout is None else timeout
+        give_up_at = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("会话池已关闭")
+                now = time.monotonic()
+                session = self._pick(now)
+                if session is not None:
+                    session.in_flight += 1
+                    session.calls += 1
+                    session.last_used = now
+                    return session
+                if now >= give_up_at:
+                    raise self._unavailable_error(now)
+                # 最早结束暂停的账号可能在超时前恢复
+                wake_at = min(
+                    [give_up_at] + [s.available_at for s in self.sessions
+                                    if s.state == COOLDOWN]
+                )
+                self._condition.wait(max(0.0, wake_at - now))
+
+    def release(self, session: PooledSession,
+                error: Optional[BaseException] = None) -> None:
+        """
+        归还账号
+
+        Args:
+            session: acquire 返回的账号
+            error: 调用抛出的异常，用于判断是否需要暂停或重新登录
+        """
+        with self._condition:
+            session.in_flight -= 1
+            if isinstance(error, RateLimitError):
+                session.rate_limited += 1
+                wait = error.retry_after if error.retry_after is not None else self.cooldown
+                if session.state == ACTIVE or session.state == COOLDOWN:
+                    session.state = COOLDOWN
+                    session.available_at = max(session.available_at,
+                                               time.monotonic() + wait)
+                logger.info(f"账号 {session.identity} 被限流，暂停 {wait:.1f} 秒")
+            elif isinstance(error, AuthenticationError):
+                session.auth_failures += 1
+                if session.state != RELOGIN:
+                    logger.warning(f"账号 {session.identity} 认证失效，移出轮转")
+                    session.relogin_attempts = 0
+                    self._schedule_relogin(session)
+            self._condition.notify_all()
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[CodeMaoClient]:
+        """
+        在 with 块中使用一个账号的客户端
+
+        Args:
+            timeout: 等待可用账号的最长时间（秒），None表示使用 acquire_timeout
+        """
+        session = self.acquire(timeout)
+        try:
+            yield session.client
+        except BaseException as e:
+            self.release(session, e)
+            raise
+        self.release(session)
+
+    def call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        用一个可用账号调用客户端方法
+
+        Args:
+            method: CodeMaoClient 的方法名，例如 create_post
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            方法的返回值
+        """
+        with self.session() as client:
+            return getattr(client, method)(*args, **kwargs)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        获取每个账号的状态
+
+        Returns:
+            字典列表，包含 identity、state、in_flight、calls、rate_limited 和 auth_failures
+        """
+        with self._condition:
+            now = time.monotonic()
+            return [
+                {
+                    "identity": s.identity,
+                    "state": ACTIVE if s.available(now) else s.state,
+                    "in_flight": s.in_flight,
+                    "calls": s.calls,
+                    "rate_limited": s.rate_limited,
+                    "auth_failures": s.auth_failures,
+                }
+                for s in self.sessions
+            ]
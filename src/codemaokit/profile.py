@@ -0,0 +1,165 @@
+"""
+CodeMao 用户资料
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Union
+
+from .deadline import Deadline
+from .models import Collection, Follower, User, UserHonor, Work
+
+logger = logging.getLogger(__name__)
+
+USER = "user"
+HONOR = "honor"
+WORKS = "works"
+COLLECTIONS = "collections"
+FOLLOWERS = "followers"
+FANS = "fans"
+
+# 所有部分，按此顺序报告加载错误
+SECTIONS = (USER, HONOR, WORKS, COLLECTIONS, FOLLOWERS, FANS)
+# 按条数上限截取的列表部分
+LIST_SECTIONS = (WORKS, COLLECTIONS, FOLLOWERS, FANS)
+
+Loader = Callable[[Optional[Deadline]], Any]
+
+
+class UserProfile:
+    """
+    用户资料
+
+    由 CodeMaoClient.get_user_profile 创建。创建时选择的部分已经并发加载，
+    其余部分在第一次访问对应属性时请求，之后使用缓存。
+    懒加载失败时抛出原来的异常，下次访问重新请求。
+    """
+
+    def __init__(self, user_id: Union[str, int], loaders: Dict[str, Loader],
+                 limit: Optional[int] = None):
+        """
+        初始化用户资料
+
+        Args:
+            user_id: 用户ID
+            loaders: 部分名称→加载函数，加载函数接受截止时间参数
+            limit: 列表部分的条数上限，None表示不限制
+        """
+        self.user_id = user_id
+        self.limit = limit
+        self._loaders = loaders
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"UserProfile(user_id={self.user_id!r}, loaded={sorted(self.loaded)})"
+
+    @property
+    def loaded(self) -> FrozenSet[str]:
+        """已加载的部分"""
+        return frozenset(self._values)
+
+    @property
+    def truncated(self) -> FrozenSet[str]:
+        """
+        已加载的列表部分中条数达到 limit 的部分
+
+        这些部分可能没有包含全部条目，需要完整列表时使用客户端的 iter_* 方法。
+        """
+        if self.limit is None:
+            return frozenset()
+        return frozenset(
+            section for section in LIST_SECTIONS
+            if section in self._values and len(self._values[section]) >= self.limit
+        )
+
+    def load(self, sections: Iterable[str], max_workers: int = 6,
+             deadline: Optional[Deadline] = None) -> "UserProfile":
+        """
+        并发加载尚未加载的部分
+
+        Args:
+            sections: 部分名称
+            max_workers: 最大并发数
+            deadline: 所有请求共享的截止时间
+
+        Returns:
+            当前用户资料
+
+        Raises:
+            ValueError: 未知的部分名称
+            CodeMaoError: 按 SECTIONS 顺序第一个失败部分的异常
+        """
+        sections = list(dict.fromkeys(sections))
+        unknown = [s for s in sections if s not in SECTIONS]
+        if unknown:
+            raise ValueError(f"未知的资料部分: {', '.join(unknown)}")
+        pending = [s for s in sections if s not in self._values]
+        if not pending:
+            return self
+
+        def fetch(section: str) -> Any:
+            try:
+                return self._loaders[section](deadline), None
+            except Exception as e:
+                return None, e
+
+        if len(pending) == 1:
+            results = [fetch(pending[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as executor:
+                results = list(executor.map(fetch, pending))
+
+        errors = {}
+        with self._lock:
+            for section, (value, error) in zip(pending, results):
+                if error is None:
+                    self._values.setdefault(section, value)
+                else:
+                    errors[section] = error
+        for section in SECTIONS:
+            if section in errors:
+                logger.warning(f"加载用户 {self.user_id} 的 {section} 失败: {errors[section]}")
+                raise errors[section]
+        return self
+
+    def _section(self, section: str) -> Any:
+        try:
+            return self._values[section]
+        except KeyError:
+            pass
+        value = self._loaders[section](None)
+        with self._lock:
+            # 并发访问时以先完成的结果为准
+            return self._values.setdefault(section, value)
+
+    @property
+    def user(self) -> User:
+        """用户信息"""
+        return self._section(USER)
+
+    @property
+    def honor(self) -> UserHonor:
+        """荣誉信息"""
+        return self._section(HONOR)
+
+    @property
+    def works(self) -> List[Work]:
+        """作品列表"""
+        return self._section(WORKS)
+
+    @property
+    def collections(self) -> List[Collection]:
+        """收藏列表"""
+        return self._section(COLLECTIONS)
+
+    @property
+    def followers(self) -> List[Follower]:
+        """关注列表"""
+        return self._section(FOLLOWERS)
+
+    @property
+    def fans(self) -> List[Follower]:
+        """粉丝列表"""
+        return self._section(FANS)
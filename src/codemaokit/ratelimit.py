@@ -0,0 +1,213 @@
+"""
+CodeMao 客户端限流
+"""
+
+import threading
+import time
+from typing import Optional, Dict, Tuple, Union
+
+from .exceptions import DeadlineExceededError, RateLimitError
+
+RateSpec = Union[float, Tuple[float, float]]
+
+
+class TokenBucket:
+    """
+    令牌桶
+
+    以固定速率补充令牌，允许不超过容量的突发请求。
+    支持预留令牌，等待在锁外进行，不会阻塞其他线程计算等待时间。
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数
+            capacity: 桶容量（允许的突发请求数），默认与速率相同
+        """
+        if rate <= 0:
+            raise ValueError("rate 必须大于0")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """按流逝的时间补充令牌"""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        预留令牌
+
+        Args:
+            tokens: 需要的令牌数
+
+        Returns:
+            获得令牌前需要等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            deficit = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(0.0, self._blocked_until - now) + deficit
+
+    def refund(self, tokens: float = 1.0) -> None:
+        """归还预留但未使用的令牌"""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+    def pause(self, seconds: float) -> None:
+        """
+        暂停发放令牌
+
+        Args:
+            seconds: 暂停的秒数，通常来自服务器的 Retry-After
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            # 暂停期间不累积令牌，恢复时只放行一个请求，随后按正常速率发放
+            self._tokens = min(self._tokens, 1.0)
+            self._updated = max(self._updated, self._blocked_until)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        获取令牌，必要时阻塞等待
+
+        Returns:
+            实际等待的秒数
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """
+    客户端限流器
+
+    在请求发出前按客户端总速率和端点分组速率进行节流，
+    并根据服务器返回的 Retry-After 精确退避。
+
+    示例:
+        >>> limiter = RateLimiter(rate=20, group_rates={"forums": (5, 10)})
+        >>> client = CodeMaoClient(rate_limiter=limiter)
+    """
+
+    def __init__(self, rate: Optional[float] = 10.0, burst: Optional[float] = None,
+                 group_rates: Optional[Dict[str, RateSpec]] = None,
+                 max_wait: Optional[float] = None,
+                 default_backoff: float = 1.0):
+        """
+        初始化限流器
+
+        Args:
+            rate: 客户端每秒最大请求数，None表示不限制总速率
+            burst: 客户端允许的突发请求数
+            group_rates: 端点分组的限流配置，值为速率或 (速率, 突发数)
+            max_wait: 单次请求最长排队时间（秒），超过时直接抛出 RateLimitError
+            default_backoff: 服务器返回429但未给出 Retry-After 时的退避秒数
+        """
+        self.max_wait = max_wait
+        self.default_backoff = default_backoff
+        self._bucket = TokenBucket(rate, burst) if rate else None
+        self._groups: Dict[str, TokenBucket] = {}
+        for group, spec in (group_rates or {}).items():
+            if isinstance(spec, tuple):
+                self._groups[group] = TokenBucket(*spec)
+            else:
+                self._groups[group] = TokenBucket(spec)
+
+    def _buckets(self, group: str) -> Tuple[TokenBucket, ...]:
+        buckets = []
+        if self._bucket is not None:
+            buckets.append(self._bucket)
+        if group in self._groups:
+            buckets.append(self._groups[group])
+        return tuple(buckets)
+
+    def acquire(self, group: str = "default", timeout: Optional[float] = None) -> float:
+        """
+        在发送请求前获取许可
+
+        Args:
+            group: 端点分组
+            timeout: 本次最长等待时间（秒），通常为截止时间的剩余预算，None表示不限制
+
+        Returns:
+            实际等待的秒数
+
+        Raises:
+            RateLimitError: 需要等待的时间超过 max_wait
+            DeadlineExceededError: 需要等待的时间超过 timeout
+        """
+        buckets = self._buckets(group)
+        if not buckets:
+            return 0.0
+
+        wait = max(bucket.reserve() for bucket in buckets)
+        exceeds_max_wait = self.max_wait is not None and wait > self.max_wait
+        exceeds_timeout = timeout is not None and wait > timeout
+        if exceeds_max_wait or exceeds_timeout:
+            # 不会等待，归还预留的令牌
+            for bucket in buckets:
+                bucket.refund()
+            if exceeds_timeout:
+                raise DeadlineExceededError(
+                    f"限流需等待 {wait:.2f} 秒，超过剩余时间 {timeout:.2f} 秒"
+                )
+            raise RateLimitError(
+                f"请求过于频繁，需等待 {wait:.2f} 秒", retry_after=wait
+            )
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def try_acquire(self, group: str = "default") -> bool:
+        """
+        不等待地获取许可
+
+        Args:
+            group: 端点分组
+
+        Returns:
+            是否立即获得许可，未获得时不占用令牌
+        """
+        buckets = self._buckets(group)
+        if not buckets:
+            return True
+        if max(bucket.reserve() for bucket in buckets) > 0:
+            for bucket in buckets:
+                bucket.refund()
+            return False
+        return True
+
+    def backoff(self, group: str = "default",
+                retry_after: Optional[float] = None) -> float:
+        """
+        收到429后暂停发放令牌
+
+        有分组配置时只暂停该分组，否则暂停整个客户端。
+
+        Args:
+            group: 端点分组
+            retry_after: 服务器建议的等待秒数
+
+        Returns:
+            实际采用的退避秒数
+        """
+        delay = retry_after if retry_after is not None else self.default_backoff
+        bucket = self._groups.get(group, self._bucket)
+        if bucket is not None and delay > 0:
+            bucket.pause(delay)
+        return delay
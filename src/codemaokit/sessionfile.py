@@ -0,0 +1,121 @@
+"""
+CodeMao 登录状态文件
+"""
+
+import json
+import logging
+import os
+import stat
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from requests.cookies import RequestsCookieJar, create_cookie
+
+logger = logging.getLogger(__name__)
+
+# 文件格式版本，不兼容的修改时加一
+FORMAT_VERSION = 1
+
+
+def dump_cookies(jar: RequestsCookieJar) -> List[Dict[str, Any]]:
+    """
+    导出Cookie，保留域名、路径和过期时间
+
+    Returns:
+        可JSON序列化的字典列表
+    """
+    return [
+        {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path,
+            "expires": cookie.expires,
+            "secure": cookie.secure,
+            "http_only": cookie.has_nonstandard_attr("HttpOnly"),
+        }
+        for cookie in jar
+    ]
+
+
+def load_cookies(jar: RequestsCookieJar, cookies: List[Dict[str, Any]]) -> None:
+    """把导出的Cookie加入 jar，已过期的跳过"""
+    now = time.time()
+    for item in cookies:
+        if item.get("expires") is not None and item["expires"] <= now:
+            continue
+        jar.set_cookie(create_cookie(
+            item["name"], item["value"],
+            domain=item.get("domain", ""),
+            path=item.get("path", "/"),
+            expires=item.get("expires"),
+            secure=item.get("secure", False),
+            rest={"HttpOnly": None} if item.get("http_only") else {},
+        ))
+
+
+def write_session_file(path: str, data: Dict[str, Any]) -> None:
+    """
+    写入登录状态文件
+
+    文件只有所有者可读写（0600），先写临时文件再原子替换，
+    其他进程不会读到写了一半的文件。
+
+    Args:
+        path: 文件路径，支持 ~
+        data: 登录状态
+    """
+    path = os.path.expanduser(path)
+    document = dict(data, version=FORMAT_VERSION, saved_at=time.time())
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    # 每次写入使用独立的临时文件，并发写入的线程和进程互不干扰；mkstemp 创建的文件权限为0600
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_session_file(path: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    读取登录状态文件
+
+    Args:
+        path: 文件路径
+        max_age: 文件的最长有效时间（秒），None表示不限制
+
+    Returns:
+        登录状态；文件不存在、已过期、版本不符或内容损坏时返回None
+    """
+    path = os.path.expanduser(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            mode = os.fstat(f.fileno()).st_mode
+            document = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"无法读取登录状态文件 {path}: {e}")
+        return None
+
+    if os.name == "posix" and mode & (stat.S_IRWXG | stat.S_IRWXO):
+        logger.warning(f"登录状态文件 {path} 可被其他用户访问，建议执行 chmod 600")
+    if not isinstance(document, dict) or document.get("version") != FORMAT_VERSION:
+        logger.warning(f"登录状态文件 {path} 的格式不受支持")
+        return None
+    if max_age is not None and time.time() - document.get("saved_at", 0) > max_age:
+        logger.info(f"登录状态文件 {path} 已过期")
+        return None
+    return document
@@ -0,0 +1,83 @@
+"""
+CodeMao 请求合并
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .exceptions import DeadlineExceededError
+
+
+class _Call:
+    """一次正在进行的调用"""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    合并相同键的并发调用
+
+    同一时刻相同键只执行一次函数，其余调用者等待并共享结果或异常。
+    调用完成后立即移除，不缓存结果。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any],
+           timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        执行或加入一次调用
+
+        Args:
+            key: 调用键
+            fn: 实际执行的函数
+            timeout: 加入他人调用时的最长等待时间（秒），None表示等到调用结束
+
+        Returns:
+            (结果, 是否为共享结果)
+
+        Raises:
+            DeadlineExceededError: 等待他人调用超过 timeout
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            if not call.done.wait(timeout):
+                with self._lock:
+                    call.waiters -= 1
+                raise DeadlineExceededError(f"等待合并的请求超过 {timeout:g} 秒")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, call.waiters > 0
+
+    def in_flight(self) -> int:
+        """正在进行的调用数"""
+        with self._lock:
+            return len(self._calls)
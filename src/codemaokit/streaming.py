@@ -0,0 +1,171 @@
+"""
+CodeMao 列表响应的流式解析
+"""
+
+import re
+from typing import Any, Iterable, Iterator, List, Optional
+
+from .jsonlib import JsonLoads, loads as default_loads
+
+# 字符串外需要关注的结构字符
+_STRUCTURAL = re.compile(rb'["{}\[\],:]')
+# 字符串内需要关注的字符
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+_SEEK, _ARRAY, _DONE = range(3)
+
+
+class ItemStreamParser:
+    """
+    增量解析顶层对象中的数组字段
+
+    按块喂入响应体，每当数组中的一个元素完整到达时就解码并返回，
+    已返回的元素会从缓冲区移除，内存占用与单个元素大小相当。
+
+    示例:
+        >>> parser = ItemStreamParser("items")
+        >>> parser.feed(b'{"items": [{"id": 1}, {"i')
+        [{'id': 1}]
+        >>> parser.feed(b'd": 2}], "total": 2}')
+        [{'id': 2}]
+    """
+
+    def __init__(self, key: str = "items", loads: Optional[JsonLoads] = None):
+        """
+        初始化解析器
+
+        Args:
+            key: 顶层对象中数组字段的名称
+            loads: JSON解码函数，默认使用自动选择的解码器
+        """
+        self.key = key.encode("utf-8")
+        self._loads = loads or default_loads
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._state = _SEEK
+        self._in_string = False
+        self._string_start = 0
+        self._last_string: Optional[bytes] = None
+        self._current_key: Optional[bytes] = None
+        self._segment_start = 0
+        self.found = False
+
+    @property
+    def done(self) -> bool:
+        """数组是否已解析完毕"""
+        return self._state == _DONE
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        喂入一块数据
+
+        Args:
+            chunk: 响应体的一部分
+
+        Returns:
+            本次完整到达的数组元素
+        """
+        if self._state == _DONE:
+            return []
+        self._buf += chunk
+        items = self._scan()
+        if self._state == _ARRAY and self._segment_start > 0:
+            # 丢弃已返回的元素，保持缓冲区只包含未完成的部分
+            cut = self._segment_start
+            del self._buf[:cut]
+            self._pos -= cut
+            self._string_start -= cut
+            self._segment_start = 0
+        return items
+
+    def close(self) -> Any:
+        """
+        结束解析
+
+        Returns:
+            没有找到数组字段时返回整个已解码的文档（例如错误响应），否则返回None
+        """
+        if self._state == _SEEK:
+            return self._loads(bytes(self._buf)) if self._buf.strip() else None
+        return None
+
+    def _scan(self) -> List[Any]:
+        items: List[Any] = []
+        buf = self._buf
+        while self._state != _DONE:
+            if self._in_string:
+                m = _STRING_SPECIAL.search(buf, self._pos)
+                if m is None:
+                    self._pos = len(buf)
+                    break
+                if buf[m.start()] == 0x5C:  # 反斜杠，跳过被转义的字符
+                    if m.end() >= len(buf):
+                        self._pos = m.start()
+                        break
+                    self._pos = m.end() + 1
+                    continue
+                self._in_string = False
+                self._pos = m.end()
+                if self._depth == 1:
+                    self._last_string = bytes(buf[self._string_start:m.start()])
+                continue
+
+            m = _STRUCTURAL.search(buf, self._pos)
+            if m is None:
+                self._pos = len(buf)
+                break
+            char = buf[m.start()]
+            self._pos = m.end()
+
+            if char == 0x22:  # "
+                self._in_string = True
+                self._string_start = m.end()
+            elif char == 0x3A:  # :
+                if self._depth == 1:
+                    self._current_key = self._last_string
+            elif char in (0x7B, 0x5B):  # { [
+                self._depth += 1
+                if (self._state == _SEEK and char == 0x5B and self._depth == 2
+                        and self._current_key == self.key):
+                    self._state = _ARRAY
+                    self.found = True
+                    self._segment_start = m.end()
+            elif char in (0x7D, 0x5D):  # } ]
+                if self._state == _ARRAY and self._depth == 2:
+                    self._emit(items, m.start())
+                    self._state = _DONE
+                self._depth -= 1
+            elif char == 0x2C:  # ,
+                if self._state == _ARRAY and self._depth == 2:
+                    self._emit(items, m.start())
+                    self._segment_start = m.end()
+                elif self._depth == 1:
+                    self._current_key = None
+        return items
+
+    def _emit(self, items: List[Any], end: int) -> None:
+        segment = bytes(self._buf[self._segment_start:end]).strip()
+        if segment:
+            items.append(self._loads(segment))
+
+
+def iter_items(chunks: Iterable[bytes], key: str = "items",
+               loads: Optional[JsonLoads] = None) -> Iterator[Any]:
+    """
+    从响应体分块中逐个产出数组元素
+
+    Args:
+        chunks: 响应体分块
+        key: 顶层对象中数组字段的名称
+        loads: JSON解码函数
+
+    Yields:
+        解码后的数组元素
+    """
+    parser = ItemStreamParser(key, loads)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+    parser.close()
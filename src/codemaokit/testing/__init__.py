@@ -0,0 +1,7 @@
+"""
+CodeMao SDK 测试工具
+"""
+
+from .server import DEFAULT_PASSWORD, Dataset, FakeCodeMaoServer
+
+__all__ = ["DEFAULT_PASSWORD", "Dataset", "FakeCodeMaoServer"]
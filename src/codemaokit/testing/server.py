@@ -0,0 +1,853 @@
+"""
+CodeMao API 本地模拟服务器
+
+在本机实现SDK使用的接口，数据由随机种子合成，可注入延迟、错误和限流，
+用于在不访问真实服务器的情况下测量SDK的吞吐量、延迟分布和错误处理。
+
+示例:
+    >>> with FakeCodeMaoServer(latency=0.02, error_rate=0.01) as server:
+    ...     client = CodeMaoClient(base_url=server.url)
+    ...     client.login("user1", DEFAULT_PASSWORD)
+    ...     boards = client.get_boards()
+
+也可以作为独立进程运行:
+
+    python -m codemaokit.testing.server --port 8000 --latency 0.05 --rate-limit 200
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import secrets
+import threading
+import time
+from collections import Counter
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from ..utils import endpoint_template
+
+# 合成用户的默认密码
+DEFAULT_PASSWORD = "codemao123"
+# 合成用户ID的起始值，用户名为 user1、user2……
+USER_ID_BASE = 10000
+
+Latency = Union[float, Callable[[str], float]]
+
+
+class Dataset:
+    """
+    合成数据集
+
+    用户、作品、收藏和关注关系由种子和ID确定性地生成，不预先保存，
+    数据集规模不影响内存占用；只有帖子和用户资料的修改保存在内存中。
+    """
+
+    def __init__(self, users: int = 1000, boards: int = 12,
+                 posts_per_board: int = 20, max_works: int = 60,
+                 max_follows: int = 100, seed: int = 0):
+        """
+        初始化数据集
+
+        Args:
+            users: 用户数
+            boards: 板块数
+            posts_per_board: 每个板块初始的帖子数
+            max_works: 每个用户最多的作品数（收藏数相同）
+            max_follows: 每个用户最多的关注数和粉丝数
+            seed: 随机种子
+        """
+        self.users = users
+        self.max_works = max_works
+        self.max_follows = max_follows
+        self.seed = seed
+        rng = random.Random(seed)
+        self.boards: List[Dict[str, Any]] = [
+            {
+                "id": str(i + 1),
+                "name": f"板块{i + 1}",
+                "description": f"第{i + 1}个板块的介绍",
+                "icon_url": f"https://static.example.com/boards/{i + 1}.png",
+                "is_hot": i < 3,
+                "n_posts": 0,
+                "n_discussions": rng.randint(0, 10000),
+            }
+            for i in range(boards)
+        ]
+        self.posts: Dict[str, Dict[str, Any]] = {}
+        self.replies: Dict[str, Dict[str, Any]] = {}
+        self._profiles: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 1
+        # 可重入：请求处理函数在同一把锁内先检查再修改
+        self._lock = threading.RLock()
+        for board in self.boards:
+            for _ in range(posts_per_board):
+                self.add_post(
+                    board["id"], self.user_id(rng.randint(1, max(1, users))),
+                    f"示例帖子标题{self._next_id}", "示例帖子内容" * rng.randint(2, 20),
+                )
+
+    def _rng(self, *parts: Any) -> random.Random:
+        return random.Random(f"{self.seed}:" + ":".join(map(str, parts)))
+
+    def user_id(self, index: int) -> int:
+        """第 index 个用户（从1开始）的ID"""
+        return USER_ID_BASE + index
+
+    def has_user(self, user_id: int) -> bool:
+        """用户是否存在"""
+        return USER_ID_BASE < user_id <= USER_ID_BASE + self.users
+
+    def find_user(self, identity: str) -> Optional[int]:
+        """
+        按用户名、邮箱或手机号查找用户
+
+        Returns:
+            用户ID，不存在时返回None
+        """
+        match = re.fullmatch(r"user(\d+)(@example\.com)?|1380(\d{7})", identity)
+        if match is None:
+            return None
+        index = int(match.group(1) or match.group(3))
+        user_id = self.user_id(index)
+        return user_id if self.has_user(user_id) else None
+
+    def user(self, user_id: int) -> Dict[str, Any]:
+        """用户资料"""
+        index = user_id - USER_ID_BASE
+        rng = self._rng("user", user_id)
+        data = {
+            "id": user_id,
+            "nickname": f"用户{index}",
+            "username": f"user{index}",
+            "avatar_url": f"https://static.example.com/avatars/{user_id}.png",
+            "fullname": f"测试用户{index}",
+            "birthday": 946656000 + rng.randint(0, 3650) * 86400,
+            "sex": rng.randint(0, 1),
+            "qq": str(rng.randint(10000, 999999999)),
+            "description": f"用户{index}的个人简介",
+            "email": f"user{index}@example.com",
+            "phone_number": f"1380{index:07d}",
+            "gold": rng.randint(0, 5000),
+            "level": rng.randint(1, 10),
+            "doing": "",
+            "real_name": "",
+            "preview_work_id": 0,
+        }
+        with self._lock:
+            data.update(self._profiles.get(user_id, {}))
+        return data
+
+    def update_user(self, user_id: int, fields: Dict[str, Any]) -> None:
+        """修改用户资料"""
+        with self._lock:
+            self._profiles.setdefault(user_id, {}).update(fields)
+
+    def honor(self, user_id: int) -> Dict[str, Any]:
+        """用户荣誉信息"""
+        rng = self._rng("honor", user_id)
+        return {
+            "attention_status": False,
+            "block_total": 0,
+            "re_created_total": rng.randint(0, 100),
+            "attention_total": self._count("followers", user_id, self.max_follows),
+            "fans_total": self._count("fans", user_id, self.max_follows),
+            "collected_total": rng.randint(0, 1000),
+            "liked_total": rng.randint(0, 10000),
+            "view_times": rng.randint(0, 100000),
+            "author_level": rng.randint(1, 6),
+            "is_official_certification": False,
+            "subject_id": 0,
+            "work_shop_name": "",
+            "work_shop_level": 0,
+            "like_score": rng.randint(0, 100),
+            "collect_score": rng.randint(0, 100),
+            "fork_score": rng.randint(0, 100),
+        }
+
+    def _count(self, kind: str, user_id: int, maximum: int) -> int:
+        return self._rng(kind, "count", user_id).randint(0, maximum)
+
+    def works(self, user_id: int) -> List[Dict[str, Any]]:
+        """用户的作品列表"""
+        result = []
+        for i in range(self._count("works", user_id, self.max_works)):
+            rng = self._rng("work", user_id, i)
+            work_id = user_id * 1000 + i
+            result.append({
+                "id": work_id,
+                "work_name": f"作品{work_id}",
+                "preview": f"https://static.example.com/works/{work_id}.png",
+                "type": rng.randint(1, 3),
+                "view_times": rng.randint(0, 100000),
+                "collect_times": rng.randint(0, 1000),
+                "liked_times": rng.randint(0, 5000),
+                "fork_times": rng.randint(0, 200),
+                "publish_time": 1600000000 + rng.randint(0, 10 ** 8),
+                "description": f"作品{work_id}的介绍",
+                "fork_enable": rng.random() < 0.8,
+                "parent_id": 0,
+            })
+        return result
+
+    def collections(self, user_id: int) -> List[Dict[str, Any]]:
+        """用户的收藏列表"""
+        result = []
+        for i in range(self._count("collections", user_id, self.max_works)):
+            rng = self._rng("collection", user_id, i)
+            author = self.user_id(rng.randint(1, max(1, self.users)))
+            work_id = author * 1000 + i
+            result.append({
+                "id": work_id,
+                "name": f"作品{work_id}",
+                "preview": f"https://static.example.com/works/{work_id}.png",
+                "user_id": author,
+                "nickname": f"用户{author - USER_ID_BASE}",
+                "avatar_url": f"https://static.example.com/avatars/{author}.png",
+                "views_count": rng.randint(0, 100000),
+                "likes_count": rng.randint(0, 5000),
+                "collections_count": rng.randint(0, 1000),
+                "is_deleted": False,
+                "publish_time": 1600000000 + rng.randint(0, 10 ** 8),
+                "work_type": rng.randint(1, 3),
+                "description": "",
+            })
+        return result
+
+    def follows(self, kind: str, user_id: int) -> List[Dict[str, Any]]:
+        """
+        用户的关注或粉丝列表
+
+        Args:
+            kind: "followers" 或 "fans"
+            user_id: 用户ID
+        """
+        result = []
+        for i in range(self._count(kind, user_id, self.max_follows)):
+            rng = self._rng(kind, user_id, i)
+            other = self.user_id(rng.randint(1, max(1, self.users)))
+            result.append({
+                "id": other,
+                "nickname": f"用户{other - USER_ID_BASE}",
+                "avatar_url": f"https://static.example.com/avatars/{other}.png",
+                "n_works": self._count("works", other, self.max_works),
+                "total_likes": rng.randint(0, 10000),
+                "is_followed": rng.random() < 0.3,
+                "description": "",
+            })
+        return result
+
+    def messages(self, user_id: int) -> Dict[str, int]:
+        """消息统计"""
+        rng = self._rng("messages", user_id)
+        return {
+            "comment_reply": rng.randint(0, 50),
+            "like_fork": rng.randint(0, 200),
+            "system": rng.randint(0, 10),
+        }
+
+    def board(self, board_id: str) -> Optional[Dict[str, Any]]:
+        """板块详情"""
+        for board in self.boards:
+            if board["id"] == board_id:
+                return board
+        return None
+
+    def _new_id(self) -> str:
+        post_id = str(self._next_id)
+        self._next_id += 1
+        return post_id
+
+    def add_post(self, board_id: str, user_id: int, title: str, content: str,
+                 studio_id: Optional[str] = None) -> str:
+        """
+        发布帖子
+
+        Returns:
+            帖子ID
+        """
+        with self._lock:
+            post_id = self._new_id()
+            now = int(time.time())
+            board = self.board(board_id)
+            board["n_posts"] += 1
+            self.posts[post_id] = {
+                "id": post_id,
+                "board_id": board_id,
+                "board_name": board["name"],
+                "title": title,
+                "content": content,
+                "studio_id": studio_id,
+                "author_id": user_id,
+                "created_at": now,
+                "updated_at": now,
+                "n_replies": 0,
+                "n_comments": 0,
+                "n_views": 0,
+                "ask_help_flag": 0,
+                "tutorial_flag": 0,
+                "is_authorized": False,
+                "is_featured": False,
+                "is_hotted": False,
+                "is_pinned": False,
+            }
+            return post_id
+
+    def delete_post(self, post_id: str) -> None:
+        """删除帖子"""
+        with self._lock:
+            post = self.posts.pop(post_id)
+            self.board(post["board_id"])["n_posts"] -= 1
+
+    def add_reply(self, post_id: str, user_id: int, content: str) -> str:
+        """
+        回复帖子
+
+        Returns:
+            回复ID
+        """
+        with self._lock:
+            reply_id = self._new_id()
+            self.posts[post_id]["n_replies"] += 1
+            self.replies[reply_id] = {
+                "id": reply_id,
+                "post_id": post_id,
+                "user_id": user_id,
+                "content": content,
+                "created_at": int(time.time()),
+            }
+            return reply_id
+
+    def post_details(self, post_id: str) -> Optional[Dict[str, Any]]:
+        """帖子详情，包含作者信息"""
+        with self._lock:
+            post = self.posts.get(post_id)
+            if post is None:
+                return None
+            post["n_views"] += 1
+            details = dict(post)
+        author = details["author_id"]
+        details["user"] = {
+            "id": author,
+            "nickname": f"用户{author - USER_ID_BASE}",
+            "avatar_url": f"https://static.example.com/avatars/{author}.png",
+            "subject_id": 0,
+            "work_shop_name": "",
+            "work_shop_level": 0,
+            "wuhan_medal": False,
+            "has_signed": False,
+        }
+        return details
+
+
+class _Reply:
+    """处理函数的返回值"""
+
+    def __init__(self, body: Any = None, status: int = 200,
+                 headers: Optional[Dict[str, str]] = None):
+        self.body = {} if body is None else body
+        self.status = status
+        self.headers = headers or {}
+
+
+def _not_found(message: str) -> _Reply:
+    return _Reply({"error_code": "Not Found", "error_message": message}, 404)
+
+
+_ROUTES: List[Tuple[str, "re.Pattern[str]", str]] = [
+    (method, re.compile(pattern), handler)
+    for method, pattern, handler in [
+        ("POST", r"/tiger/v3/web/accounts/login", "login"),
+        ("POST", r"/tiger/v3/web/accounts/logout", "logout"),
+        ("PATCH", r"/tiger/v3/web/accounts/(\w+)", "update_account"),
+        ("GET", r"/api/user/info", "current_user"),
+        ("GET", r"/api/user/info/detail/(\d+)", "user_detail"),
+        ("GET", r"/api/user/random/nickname", "random_nickname"),
+        ("GET", r"/creation-tools/v1/user/center/honor", "honor"),
+        ("GET", r"/creation-tools/v1/user/center/work-list", "works"),
+        ("GET", r"/creation-tools/v1/user/center/collect/list", "collections"),
+        ("GET", r"/creation-tools/v1/user/(followers|fans)", "follows"),
+        ("GET", r"/web/forums/boards/simples/all", "boards"),
+        ("GET", r"/web/forums/boards/(\w+)", "board"),
+        ("POST", r"/web/forums/boards/(\w+)/posts", "create_post"),
+        ("GET", r"/web/forums/posts/(\w+)/details", "post_details"),
+        ("DELETE", r"/web/forums/posts/(\w+)", "delete_post"),
+        ("POST", r"/web/forums/posts/(\w+)/replies", "create_reply"),
+        ("GET", r"/web/message-record/count", "messages"),
+    ]
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # 保持连接，与真实服务器一样复用连接池
+    protocol_version = "HTTP/1.1"
+    # 响应头和响应体合并写出，避免与客户端的延迟确认相互等待
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    server: "_HTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _dispatch(self) -> None:
+        fake = self.server.fake
+        parts = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+
+        for method, pattern, name in _ROUTES:
+            match = pattern.fullmatch(parts.path)
+            if match is not None and method == self.command:
+                break
+        else:
+            self._send(fake._finish(self.command, parts.path, _not_found("接口不存在")))
+            return
+
+        reply = fake._admit(self.command, parts.path)
+        if reply is None:
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                body = None
+            if not isinstance(body, dict):
+                reply = _Reply({"error_code": "Param-Invalid@Common",
+                                "error_message": "请求参数验证失败"}, 400)
+            else:
+                user_id = fake._session_user(self.headers.get("Cookie"))
+                reply = getattr(fake, f"_handle_{name}")(
+                    user_id, body, query, *match.groups()
+                )
+        self._send(fake._finish(
+            self.command, parts.path, reply, self.headers.get("If-None-Match")
+        ))
+
+    def _send(self, reply: _Reply) -> None:
+        content = b""
+        if reply.status not in (204, 304):
+            content = json.dumps(reply.body, ensure_ascii=False).encode("utf-8")
+        self.send_response(reply.status)
+        headers = dict(reply.headers)
+        if content:
+            headers.setdefault("Content-Type", "application/json;charset=UTF-8")
+        headers["Content-Length"] = str(len(content))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if content:
+            self.wfile.write(content)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeCodeMaoServer"
+
+
+class FakeCodeMaoServer:
+    """
+    本地模拟的 CodeMao API 服务器
+
+    在后台线程中运行，每个连接一个线程。注入的故障按以下顺序生效：
+    限流（令牌桶，超出时返回429和 Retry-After）、随机错误（返回500或503）、
+    延迟（在生成响应前等待）。登录后通过 authorization Cookie 识别用户，
+    合成用户的用户名为 user1、user2……，密码为 DEFAULT_PASSWORD。
+    """
+
+    def __init__(self, dataset: Optional[Dataset] = None,
+                 host: str = "127.0.0.1", port: int = 0,
+                 latency: Latency = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: Optional[float] = None,
+                 burst: Optional[float] = None, seed: Optional[int] = None):
+        """
+        初始化服务器
+
+        Args:
+            dataset: 数据集，None表示使用默认规模的合成数据
+            host: 监听地址
+            port: 监听端口，0表示自动选择
+            latency: 每个响应的固定延迟（秒），或接受请求路径返回延迟的函数
+            jitter: 在固定延迟上增加的 [0, jitter) 均匀随机延迟（秒）
+            error_rate: 返回服务器错误的概率
+            rate_limit: 每秒允许的请求数，None表示不限流
+            burst: 限流的突发容量，None表示与 rate_limit 相同
+            seed: 故障注入的随机种子
+        """
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate 必须在0到1之间")
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError("rate_limit 必须大于0")
+        self.dataset = dataset if dataset is not None else Dataset()
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.burst = burst if burst is not None else max(1.0, rate_limit or 0.0)
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._random = random.Random(seed)
+        self._sessions: Dict[str, int] = {}
+        self._stats: Counter = Counter()
+        self._statuses: Counter = Counter()
+        self._endpoints: Counter = Counter()
+        self._lock = threading.Lock()
+        self._server: Optional[_HTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """服务器地址，可直接作为客户端的 base_url"""
+        if self._server is None:
+            raise RuntimeError("服务器未启动")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeCodeMaoServer":
+        """在后台线程中启动服务器"""
+        if self._server is not None:
+            return self
+        self._server = _HTTPServer((self.host, self.port), _Handler)
+        self._server.fake = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="codemao-fake-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止服务器"""
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            self._thread.join()
+
+    def __enter__(self) -> "FakeCodeMaoServer":
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取服务器统计
+
+        Returns:
+            包含 requests、throttled、injected_errors、statuses 和
+            endpoints（按 "方法 端点模板" 统计的请求数）的字典
+        """
+        with self._lock:
+            return {
+                "requests": self._stats["requests"],
+                "throttled": self._stats["throttled"],
+                "injected_errors": self._stats["injected_errors"],
+                "statuses": dict(self._statuses),
+                "endpoints": dict(self._endpoints),
+            }
+
+    def reset_stats(self) -> None:
+        """清空服务器统计"""
+        with self._lock:
+            self._stats.clear()
+            self._statuses.clear()
+            self._endpoints.clear()
+
+    def expire_sessions(self) -> int:
+        """
+        使所有登录会话失效，模拟令牌过期
+
+        Returns:
+            失效的会话数
+        """
+        with self._lock:
+            count = len(self._sessions)
+            self._sessions.clear()
+        return count
+
+    def _admit(self, method: str, path: str) -> Optional[_Reply]:
+        """执行故障注入，返回None表示正常处理请求"""
+        with self._lock:
+            self._stats["requests"] += 1
+            if self.rate_limit is not None:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._refilled_at) * self.rate_limit
+                )
+                self._refilled_at = now
+                if self._tokens < 1:
+                    self._stats["throttled"] += 1
+                    wait = (1 - self._tokens) / self.rate_limit
+                    return _Reply(
+                        {"error_code": "Too-Many-Requests", "error_message": "请求过于频繁"},
+                        429, {"Retry-After": str(max(1, math.ceil(wait)))},
+                    )
+                self._tokens -= 1
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            if failed:
+                self._stats["injected_errors"] += 1
+                status = self._random.choice((500, 503))
+            jitter = self._random.random() * self.jitter if self.jitter else 0.0
+
+        delay = (self.latency(path) if callable(self.latency) else self.latency) + jitter
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            return _Reply({"error_code": "Internal", "error_message": "服务器内部错误"}, status)
+        return None
+
+    def _finish(self, method: str, path: str, reply: _Reply,
+                if_none_match: Optional[str] = None) -> _Reply:
+        if method == "GET" and reply.status == 200:
+            content = json.dumps(reply.body, ensure_ascii=False).encode("utf-8")
+            etag = '"' + hashlib.sha1(content).hexdigest()[:16] + '"'
+            reply.headers["ETag"] = etag
+            if if_none_match == etag:
+                reply.status = 304
+        with self._lock:
+            self._statuses[reply.status] += 1
+            self._endpoints[f"{method} {endpoint_template(path)}"] += 1
+        return reply
+
+    def _session_user(self, cookie_header: Optional[str]) -> Optional[int]:
+        if not cookie_header:
+            return None
+        cookie = SimpleCookie()
+        cookie.load(cookie_header)
+        token = cookie.get("authorization")
+        if token is None:
+            return None
+        with self._lock:
+            return self._sessions.get(token.value)
+
+    # 以下为各接口的处理函数，参数为当前用户ID、请求体、查询参数和路径中的ID
+
+    def _handle_login(self, user_id: Optional[int], body: Dict[str, Any],
+                      query: Dict[str, str]) -> _Reply:
+        user_id = self.dataset.find_user(str(body.get("identity", "")))
+        if user_id is None or body.get("password") != DEFAULT_PASSWORD:
+            return _Reply({"error_code": 2, "error_message": "用户名或密码错误"}, 403)
+        token = secrets.token_hex(16)
+        with self._lock:
+            self._sessions[token] = user_id
+        user = self.dataset.user(user_id)
+        return _Reply({
+            "auth": {
+                "token": token,
+                "phone_number": user["phone_number"],
+                "email": user["email"],
+                "has_password": True,
+                "is_weak_password": False,
+            },
+            "user_info": {
+                key: user[key] for key in (
+                    "id", "nickname", "avatar_url", "fullname", "birthday",
+                    "sex", "qq", "description",
+                )
+            },
+        }, headers={"Set-Cookie": f"authorization={token}; Path=/; HttpOnly"})
+
+    def _handle_logout(self, user_id: Optional[int], body: Dict[str, Any],
+                       query: Dict[str, str]) -> _Reply:
+        return _Reply(headers={"Set-Cookie": "authorization=; Path=/; Max-Age=0"})
+
+    def _handle_update_account(self, user_id: Optional[int], body: Dict[str, Any],
+                               query: Dict[str, str], field: str) -> _Reply:
+        if user_id is None:
+            return _Reply({"error_code": 0, "error_message": "用户未登录"}, 401)
+        allowed = {"nickname", "fullname", "description", "sex", "birthday", "avatar_url"}
+        fields = body if field == "info" else {field: body.get(field)}
+        if not fields or not set(fields) <= allowed:
+            return _Reply({"error_code": 5, "error_message": "输入格式错误"}, 400)
+        self.dataset.update_user(user_id, fields)
+        return _Reply()
+
+    def _handle_current_user(self, user_id: Optional[int], body: Dict[str, Any],
+                             query: Dict[str, str]) -> _Reply:
+        if user_id is None:
+            return _Reply({"error_code": 2002, "error_message": "用户未登录"}, 401)
+        user = self.dataset.user(user_id)
+        user["avatar"] = user["avatar_url"]
+        return _Reply({"code": 200, "data": {"userInfo": user}})
+
+    def _handle_user_detail(self, user_id: Optional[int], body: Dict[str, Any],
+                            query: Dict[str, str], target: str) -> _Reply:
+        target_id = int(target)
+        if not self.dataset.has_user(target_id):
+            return _Reply({"code": 404, "msg": "您访问的资源不存在", "data": None})
+        works = self.dataset.works(target_id)
+        work = works[0] if works else {"id": 0, "work_name": "", "preview": ""}
+        return _Reply({
+            "code": 200,
+            "msg": "",
+            "data": {"userInfo": {
+                "user": self.dataset.user(target_id),
+                "work": {"id": work["id"], "name": work["work_name"],
+                         "preview": work["preview"]},
+            }},
+        })
+
+    def _handle_random_nickname(self, user_id: Optional[int], body: Dict[str, Any],
+                                query: Dict[str, str]) -> _Reply:
+        with self._lock:
+            number = self._random.randint(1, 99999)
+        return _Reply({"code": 200, "data": {"nickname": f"编程猫{number}"}})
+
+    def _target_user(self, query: Dict[str, str]) -> Optional[int]:
+        try:
+            target_id = int(query.get("user_id", ""))
+        except ValueError:
+            return None
+        return target_id if self.dataset.has_user(target_id) else None
+
+    def _page(self, items: List[Dict[str, Any]], query: Dict[str, str]) -> _Reply:
+        try:
+            offset = max(0, int(query.get("offset", 0)))
+            limit = max(0, int(query.get("limit", 20)))
+        except ValueError:
+            return _Reply({"error_code": "Param-Invalid@Common",
+                           "error_message": "请求参数验证失败"}, 400)
+        return _Reply({
+            "items": items[offset:offset + limit],
+            "offset": offset,
+            "limit": limit,
+            "total": len(items),
+        })
+
+    def _handle_honor(self, user_id: Optional[int], body: Dict[str, Any],
+                      query: Dict[str, str]) -> _Reply:
+        target_id = self._target_user(query)
+        if target_id is None:
+            return _not_found("用户不存在")
+        return _Reply(self.dataset.honor(target_id))
+
+    def _handle_works(self, user_id: Optional[int], body: Dict[str, Any],
+                      query: Dict[str, str]) -> _Reply:
+        target_id = self._target_user(query)
+        if target_id is None:
+            return _not_found("用户不存在")
+        return self._page(self.dataset.works(target_id), query)
+
+    def _handle_collections(self, user_id: Optional[int], body: Dict[str, Any],
+                            query: Dict[str, str]) -> _Reply:
+        target_id = self._target_user(query)
+        if target_id is None:
+            return _not_found("用户不存在")
+        return self._page(self.dataset.collections(target_id), query)
+
+    def _handle_follows(self, user_id: Optional[int], body: Dict[str, Any],
+                        query: Dict[str, str], kind: str) -> _Reply:
+        target_id = self._target_user(query)
+        if target_id is None:
+            return _not_found("用户不存在")
+        return self._page(self.dataset.follows(kind, target_id), query)
+
+    def _handle_boards(self, user_id: Optional[int], body: Dict[str, Any],
+                       query: Dict[str, str]) -> _Reply:
+        with self.dataset._lock:
+            boards = [dict(board) for board in self.dataset.boards]
+        return _Reply({"items": boards})
+
+    def _handle_board(self, user_id: Optional[int], body: Dict[str, Any],
+                      query: Dict[str, str], board_id: str) -> _Reply:
+        board = self.dataset.board(board_id)
+        if board is None:
+            return _not_found(f"板块不存在: {board_id}")
+        with self.dataset._lock:
+            return _Reply(dict(board))
+
+    def _handle_create_post(self, user_id: Optional[int], body: Dict[str, Any],
+                            query: Dict[str, str], board_id: str) -> _Reply:
+        if user_id is None:
+            return _Reply({"error_code": 2002, "error_message": "用户未登录"}, 401)
+        if self.dataset.board(board_id) is None:
+            return _not_found(f"板块不存在: {board_id}")
+        title = str(body.get("title") or "")
+        content = str(body.get("content") or "")
+        if not 5 <= len(title) <= 50 or len(content) < 10:
+            return _Reply({"error_code": "Param-Invalid@Common",
+                           "error_message": "请求参数验证失败"}, 400)
+        post_id = self.dataset.add_post(
+            board_id, user_id, title, content, body.get("studio_id")
+        )
+        return _Reply({"id": post_id}, 201)
+
+    def _handle_post_details(self, user_id: Optional[int], body: Dict[str, Any],
+                             query: Dict[str, str], post_id: str) -> _Reply:
+        details = self.dataset.post_details(post_id)
+        if details is None:
+            return _not_found(f"帖子不存在: {post_id}")
+        return _Reply(details)
+
+    def _handle_delete_post(self, user_id: Optional[int], body: Dict[str, Any],
+                            query: Dict[str, str], post_id: str) -> _Reply:
+        if user_id is None:
+            return _Reply({"error_code": 2002, "error_message": "用户未登录"}, 401)
+        with self.dataset._lock:
+            post = self.dataset.posts.get(post_id)
+            if post is None:
+                return _not_found(f"帖子不存在: {post_id}")
+            if post["author_id"] != user_id:
+                return _Reply({"error_code": "Forbidden", "error_message": "无权删除该帖子"}, 403)
+            self.dataset.delete_post(post_id)
+        return _Reply()
+
+    def _handle_create_reply(self, user_id: Optional[int], body: Dict[str, Any],
+                             query: Dict[str, str], post_id: str) -> _Reply:
+        if user_id is None:
+            return _Reply({"error_code": 2002, "error_message": "用户未登录"}, 401)
+        content = str(body.get("content") or "")
+        with self.dataset._lock:
+            if post_id not in self.dataset.posts:
+                return _not_found(f"帖子不存在: {post_id}")
+            if not content:
+                return _Reply({"error_code": "Param-Invalid@Common",
+                               "error_message": "请求参数验证失败"}, 400)
+            reply_id = self.dataset.add_reply(post_id, user_id, content)
+        return _Reply({"id": reply_id}, 201)
+
+    def _handle_messages(self, user_id: Optional[int], body: Dict[str, Any],
+                         query: Dict[str, str]) -> _Reply:
+        if user_id is None:
+            return _Reply({"error_code": 2002, "error_message": "用户未登录"}, 401)
+        return _Reply(self.dataset.messages(user_id))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="运行本地模拟的 CodeMao API 服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--users", type=int, default=1000, help="合成用户数")
+    parser.add_argument("--latency", type=float, default=0.0, help="固定延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="随机延迟上限（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="服务器错误概率")
+    parser.add_argument("--rate-limit", type=float, default=None, help="每秒允许的请求数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args(argv)
+
+    server = FakeCodeMaoServer(
+        Dataset(users=args.users, seed=args.seed), host=args.host, port=args.port,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        rate_limit=args.rate_limit, seed=args.seed,
+    ).start()
+    print(f"模拟服务器运行于 {server.url}，用户名 user1-user{args.users}，"
+          f"密码 {DEFAULT_PASSWORD}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,21 @@ CodeMao SDK 工具函数
 """
 
 import re
+import time
+from email.utils import parsedate_to_datetime
 from typing import Optional, Union
 from datetime import datetime
 
+# 端点前缀与分组的对应关系，用于限流等按组生效的策略
+ENDPOINT_GROUPS = (
+    ("/tiger/v3/web/accounts", "accounts"),
+    ("/web/forums", "forums"),
+    ("/web/message-record", "messages"),
+    ("/web/shops", "shops"),
+    ("/creation-tools", "creation"),
+    ("/api/user", "users"),
+)
+
 
 def validate_email(email: str) -> bool:
     """
@@ -211,4 +223,65 @@ def is_valid_work_type(work_type: int) -> bool:
     """
     # 编程猫常见的作品类型
     valid_types = {1, 2, 3, 4, 5, 6, 7, 8, 9, 10}
-    return work_type in valid_types
\ No newline at end of file
+    return work_type in valid_types
+
+
+def endpoint_group(endpoint: str) -> str:
+    """
+    获取API端点所属的分组
+    
+    Args:
+        endpoint: API端点，如 /web/forums/boards/1
+        
+    Returns:
+        分组名称，未知端点返回 "default"
+    """
+    for prefix, group in ENDPOINT_GROUPS:
+        if endpoint.startswith(prefix):
+            return group
+    return "default"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 响应头
+    
+    Args:
+        value: 响应头的值（秒数或HTTP日期）
+        
+    Returns:
+        需要等待的秒数，无法解析时返回None
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+_ID_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F]{16,}|[0-9a-fA-F-]{32,36})$')
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    将API端点中的ID替换为占位符
+    
+    Args:
+        endpoint: API端点，如 /web/forums/boards/17
+        
+    Returns:
+        端点模板，如 /web/forums/boards/{id}
+    """
+    path = endpoint.split('?', 1)[0]
+    return '/'.join(
+        '{id}' if _ID_SEGMENT.match(segment) else segment
+        for segment in path.split('/')
+    )
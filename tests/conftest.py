@@ -0,0 +1,49 @@
+"""
+测试公共夹具
+"""
+
+import pytest
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "clock(*targets): clock 夹具要替换的函数，如 codemaokit.cache.time.monotonic"
+    )
+
+
+@pytest.fixture
+def clock(request, monkeypatch):
+    """
+    可手动推进的时钟
+
+    用 clock 标记列出要替换的函数，按名称的最后一段替换为 monotonic、time 或 sleep，
+    sleep 推进时钟并记录在 slept 中:
+
+        pytestmark = pytest.mark.clock("codemaokit.ratelimit.time.monotonic",
+                                       "codemaokit.ratelimit.time.sleep")
+    """
+    marker = request.node.get_closest_marker("clock")
+    if marker is None or not marker.args:
+        raise ValueError("使用 clock 夹具时需要用 clock 标记列出要替换的函数")
+    fake = FakeClock()
+    for target in marker.args:
+        monkeypatch.setattr(target, getattr(fake, target.rsplit(".", 1)[1]))
+    return fake
@@ -0,0 +1,201 @@
+"""
+CodeMao 异步客户端测试
+"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from codemaokit import AsyncCodeMaoClient
+from codemaokit.models import User, Board, MessageStats
+from codemaokit.exceptions import (
+    APIError, AuthenticationError, NetworkError, ValidationError, ResourceNotFoundError
+)
+
+
+class FakeResponse:
+    """模拟 aiohttp 响应"""
+
+    def __init__(self, status=200, json_data=None):
+        self.status = status
+        self._body = json.dumps(json_data if json_data is not None else {}).encode('utf-8')
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class FakeCookieJar(list):
+    """模拟 aiohttp CookieJar"""
+
+
+class FakeSession:
+    """模拟 aiohttp ClientSession，按顺序返回预设响应"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+        self.closed = False
+        self.cookie_jar = FakeCookieJar()
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        return self.responses.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+LOGIN_RESPONSE = {
+    'auth': {'token': 'test_token'},
+    'user_info': {'id': 12345, 'nickname': '测试用户'}
+}
+
+
+class TestAsyncCodeMaoClient:
+    """测试CodeMao异步客户端"""
+
+    def test_login_and_get_boards(self):
+        """测试登录后获取板块列表"""
+        async def scenario():
+            client = AsyncCodeMaoClient()
+            client._session = FakeSession(
+                FakeResponse(json_data=LOGIN_RESPONSE),
+                FakeResponse(json_data={'items': [
+                    {'id': '1', 'name': '技术讨论', 'icon_url': '', 'is_hot': True}
+                ]}),
+            )
+            user = await client.login("testuser", "testpass")
+            boards = await client.get_boards()
+            # 第二次调用命中缓存，不发请求
+            await client.get_boards()
+            return client, user, boards
+
+        client, user, boards = asyncio.run(scenario())
+
+        assert isinstance(user, User)
+        assert client.is_authenticated is True
+        assert client.auth_token == 'test_token'
+        assert isinstance(boards[0], Board)
+        assert boards[0].name == '技术讨论'
+        assert len(client._session.calls) == 2
+
+    def test_create_post_resolves_board(self):
+        """测试发布帖子"""
+        async def scenario():
+            client = AsyncCodeMaoClient()
+            client._session = FakeSession(
+                FakeResponse(json_data=LOGIN_RESPONSE),
+                FakeResponse(json_data={'items': [
+                    {'id': '7', 'name': '技术讨论', 'icon_url': ''}
+                ]}),
+                FakeResponse(json_data={'id': 'post_123'}),
+            )
+            await client.login("testuser", "testpass")
+            post_id = await client.create_post(
+                "测试帖子标题", "这是一个测试帖子内容，长度足够。", "技术讨论"
+            )
+            return client, post_id
+
+        client, post_id = asyncio.run(scenario())
+
+        assert post_id == 'post_123'
+        method, url, kwargs = client._session.calls[-1]
+        assert method == "POST"
+        assert url.endswith("/web/forums/boards/7/posts")
+
+    def test_not_authenticated(self):
+        """测试未登录时调用需要认证的方法"""
+        client = AsyncCodeMaoClient()
+        with pytest.raises(AuthenticationError, match="请先登录"):
+            asyncio.run(client.get_message_stats())
+
+    def test_validation_error(self):
+        """测试参数验证"""
+        client = AsyncCodeMaoClient()
+        client.is_authenticated = True
+        with pytest.raises(ValidationError, match="标题长度必须在5-50字之间"):
+            asyncio.run(client.create_post("短", "内容足够长内容足够长", "板块"))
+
+    def test_get_message_stats(self):
+        """测试获取消息统计"""
+        async def scenario():
+            client = AsyncCodeMaoClient()
+            client.is_authenticated = True
+            client._session = FakeSession(FakeResponse(json_data={
+                'comment_reply': 5, 'like_fork': 3, 'system': 2
+            }))
+            return await client.get_message_stats()
+
+        stats = asyncio.run(scenario())
+
+        assert isinstance(stats, MessageStats)
+        assert stats.comment_reply == 5
+
+    def test_board_not_found(self):
+        """测试板块不存在"""
+        async def scenario():
+            client = AsyncCodeMaoClient()
+            client._session = FakeSession(FakeResponse(status=404))
+            await client.get_board_by_id('404')
+
+        with pytest.raises(ResourceNotFoundError, match="板块不存在"):
+            asyncio.run(scenario())
+
+    def test_server_error_retries_idempotent(self, monkeypatch):
+        """测试幂等请求在服务器错误时重试"""
+        async def no_sleep(delay):
+            return None
+
+        monkeypatch.setattr(asyncio, "sleep", no_sleep)
+
+        session = FakeSession(FakeResponse(status=503), FakeResponse(status=503))
+
+        async def scenario():
+            client = AsyncCodeMaoClient(max_retries=1)
+            client._session = session
+            await client.get_boards()
+
+        with pytest.raises(NetworkError, match="服务器错误"):
+            asyncio.run(scenario())
+        assert len(session.calls) == 2
+
+    def test_errors_not_rewrapped(self):
+        """测试认证失败和网络错误原样抛出，不包装成 APIError"""
+        async def stats():
+            client = AsyncCodeMaoClient()
+            client.is_authenticated = True
+            client._session = FakeSession(FakeResponse(status=401))
+            await client.get_message_stats()
+
+        async def delete():
+            client = AsyncCodeMaoClient(max_retries=0)
+            client.is_authenticated = True
+            client._session = FakeSession(FakeResponse(status=503))
+            await client.delete_post(1)
+
+        with pytest.raises(AuthenticationError):
+            asyncio.run(stats())
+        with pytest.raises(NetworkError):
+            asyncio.run(delete())
+
+    def test_context_manager_closes_session(self):
+        """测试异步上下文管理器关闭会话"""
+        async def scenario():
+            session = FakeSession()
+            async with AsyncCodeMaoClient() as client:
+                client._session = session
+            return client, session
+
+        client, session = asyncio.run(scenario())
+
+        assert session.closed is True
+        assert client._session is None
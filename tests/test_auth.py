@@ -0,0 +1,220 @@
+"""
+登录状态与多线程共用客户端测试
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from codemaokit import CodeMaoClient
+from codemaokit.auth import AuthState
+from codemaokit.exceptions import AuthenticationError
+from codemaokit.models import User
+from codemaokit.testing import DEFAULT_PASSWORD, Dataset, FakeCodeMaoServer
+from codemaokit.testing.server import USER_ID_BASE
+
+LOGIN = "POST /tiger/v3/web/accounts/login"
+
+
+def _unauthorized():
+    response = Mock()
+    response.status_code = 401
+    response.headers = {}
+    return response
+
+
+class TestAuthState:
+    """登录状态快照测试"""
+
+    def test_initial_state(self):
+        """初始为未登录状态"""
+        client = CodeMaoClient()
+        state = client.auth_state
+        assert state == AuthState()
+        assert client.is_authenticated is False
+        assert client.cookies == {}
+
+    def test_attribute_setters_replace_snapshot(self):
+        """设置属性时替换快照，旧快照不变"""
+        client = CodeMaoClient()
+        before = client.auth_state
+        client.is_authenticated = True
+        client.current_user = User(id=1, nickname="测试用户", avatar_url="")
+        assert before.is_authenticated is False
+        assert client.auth_state.is_authenticated is True
+        assert client.auth_state.user.id == 1
+        assert client.auth_state.generation == before.generation
+
+    def test_stale_unauthorized_keeps_new_login(self):
+        """旧请求的401不会覆盖之后完成的登录"""
+        client = CodeMaoClient()
+        stale = client._replace_auth(is_authenticated=True, token="old").generation
+        client._replace_auth(is_authenticated=True, token="new")
+
+        with pytest.raises(AuthenticationError):
+            client._check_status(_unauthorized(), "/api/user/info", "api", stale)
+        assert client.is_authenticated is True
+        assert client.auth_token == "new"
+
+    def test_current_unauthorized_logs_out(self):
+        """当前登录状态下的401标记为未登录"""
+        client = CodeMaoClient()
+        current = client._replace_auth(is_authenticated=True, token="t").generation
+        with pytest.raises(AuthenticationError):
+            client._check_status(_unauthorized(), "/api/user/info", "api", current)
+        assert client.is_authenticated is False
+
+
+class TestThreadSafeClient:
+    """多线程共用客户端测试"""
+
+    def test_pool_size(self):
+        """连接池大小传给默认适配器"""
+        client = CodeMaoClient(
+            connection_pool_size=4, connection_pool_maxsize=64, connection_pool_block=True
+        )
+        adapter = client.session.get_adapter("https://api.codemao.cn")
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 64
+        assert adapter._pool_block is True
+
+    def test_shared_client_across_threads(self, caplog):
+        """多个线程共用一个客户端，没有连接池溢出"""
+        threads = 32
+        dataset = Dataset(users=threads, boards=2, posts_per_board=1)
+        with FakeCodeMaoServer(dataset, latency=0.01) as server:
+            client = CodeMaoClient(base_url=server.url, connection_pool_maxsize=threads)
+            try:
+                client.login("user1", DEFAULT_PASSWORD)
+                with caplog.at_level(logging.WARNING, logger="urllib3"):
+                    with ThreadPoolExecutor(max_workers=threads) as pool:
+                        users = list(pool.map(
+                            lambda i: client.get_user(USER_ID_BASE + i),
+                            [1 + i % threads for i in range(threads * 4)],
+                        ))
+                        stats = list(pool.map(
+                            lambda _: client.get_message_stats(), range(threads)
+                        ))
+            finally:
+                client.session.close()
+
+        assert [user.id for user in users[:threads]] == [
+            USER_ID_BASE + 1 + i for i in range(threads)
+        ]
+        assert len(stats) == threads
+        assert client.is_authenticated is True
+        assert not [r for r in caplog.records if "pool is full" in r.getMessage()]
+
+
+@pytest.fixture
+def server():
+    with FakeCodeMaoServer(Dataset(users=5, boards=1, posts_per_board=1)) as fake:
+        yield fake
+
+
+@pytest.fixture
+def make_client(server):
+    clients = []
+
+    def _make(**kwargs):
+        client = CodeMaoClient(base_url=server.url, max_retries=0, **kwargs)
+        clients.append(client)
+        return client
+
+    yield _make
+    for client in clients:
+        client.session.close()
+
+
+class TestAutoReauth:
+    """登录失效后自动重新登录测试"""
+
+    def test_disabled_by_default(self, server, make_client):
+        """默认不自动重新登录"""
+        client = make_client()
+        client.login("user1", DEFAULT_PASSWORD)
+        server.expire_sessions()
+        server.reset_stats()
+        with pytest.raises(AuthenticationError):
+            client.get_message_stats()
+        assert client.is_authenticated is False
+        assert LOGIN not in server.stats()["endpoints"]
+
+    def test_concurrent_callers_share_one_login(self, server, make_client):
+        """并发失败的请求只触发一次登录，并在登录后重放"""
+        threads = 16
+        client = make_client(auto_reauth=True, connection_pool_maxsize=threads)
+        client.login("user1", DEFAULT_PASSWORD)
+        server.expire_sessions()
+        server.reset_stats()
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            stats = list(pool.map(lambda _: client.get_message_stats(), range(threads)))
+
+        assert len(stats) == threads
+        assert client.is_authenticated is True
+        assert server.stats()["endpoints"][LOGIN] == 1
+
+    def test_non_idempotent_request_not_replayed(self, server, make_client):
+        """POST 请求失败后重新登录但不重放"""
+        client = make_client(auto_reauth=True)
+        client.login("user1", DEFAULT_PASSWORD)
+        post_id = next(iter(server.dataset.posts))
+        server.expire_sessions()
+        server.reset_stats()
+
+        with pytest.raises(AuthenticationError):
+            client.reply_to_post(post_id, "回复内容")
+        assert client.is_authenticated is True
+        endpoints = server.stats()["endpoints"]
+        assert endpoints[LOGIN] == 1
+        assert endpoints["POST /web/forums/posts/{id}/replies"] == 1
+
+        assert client.reply_to_post(post_id, "回复内容")
+
+    def test_stream_replayed(self, server, make_client):
+        """流式列表在产出元素前遇到401时重新登录并重放"""
+        client = make_client(auto_reauth=True)
+        client.login("user1", DEFAULT_PASSWORD)
+        server.expire_sessions()
+        server.reset_stats()
+        perform = client._perform
+        responses = [_unauthorized()]
+
+        def unauthorized_once(*args, **kwargs):
+            return responses.pop() if responses else perform(*args, **kwargs)
+
+        with patch.object(client, "_perform", side_effect=unauthorized_once):
+            works = list(client.stream_user_works(USER_ID_BASE + 1))
+        assert works == list(client.stream_user_works(USER_ID_BASE + 1))
+        assert server.stats()["endpoints"][LOGIN] == 1
+        assert client.is_authenticated is True
+
+    def test_logout_stops_reauth(self, server, make_client):
+        """主动登出后不再自动登录"""
+        client = make_client(auto_reauth=True)
+        client.login("user1", DEFAULT_PASSWORD)
+        client.logout()
+        server.reset_stats()
+        with pytest.raises(AuthenticationError):
+            client.get_message_stats()
+        assert LOGIN not in server.stats()["endpoints"]
+
+    def test_credentials_callback(self, server, make_client):
+        """auto_reauth 可以是返回账号密码的函数"""
+        client = make_client(auto_reauth=lambda: ("user2", DEFAULT_PASSWORD))
+        assert client.get_message_stats() is not None
+        assert client.current_user.nickname == "用户2"
+
+    def test_failed_relogin_raises(self, server, make_client):
+        """重新登录失败时抛出 AuthenticationError"""
+        password = [DEFAULT_PASSWORD]
+        client = make_client(auto_reauth=lambda: ("user1", password[0]))
+        client.login("user1", DEFAULT_PASSWORD)
+        server.expire_sessions()
+        password[0] = "wrong-password"
+        with pytest.raises(AuthenticationError):
+            client.get_message_stats()
+        assert client.is_authenticated is False
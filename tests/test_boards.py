@@ -0,0 +1,147 @@
+"""
+板块目录缓存测试
+"""
+
+import threading
+import time
+
+import pytest
+
+from codemaokit import CodeMaoClient
+from codemaokit.boards import BoardCatalog
+from codemaokit.cache import ResponseCache
+from codemaokit.models import Board
+from codemaokit.testing import Dataset, FakeCodeMaoServer
+
+pytestmark = pytest.mark.clock("codemaokit.boards.time.monotonic")
+
+
+class FakeServer:
+    """模拟板块接口，记录调用次数"""
+
+    def __init__(self):
+        self.version = 1
+        self.list_calls = 0
+        self.detail_calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def fetch_boards(self, refresh=False):
+        self.list_calls += 1
+        self.release.wait()
+        return [Board(id='1', name=f'技术讨论v{self.version}', icon_url='')]
+
+    def fetch_board(self, board_id, refresh=False):
+        self.detail_calls += 1
+        self.release.wait()
+        return Board(id=board_id, name='技术讨论', icon_url='', n_posts=self.version)
+
+
+class TestBoardCatalog:
+    """测试板块目录"""
+
+    def test_without_ttl(self):
+        """测试未设置软过期时间时的行为"""
+        server = FakeServer()
+        catalog = BoardCatalog(server.fetch_boards, server.fetch_board)
+
+        catalog.get_boards()
+        catalog.get_boards()
+        catalog.get_board('1')
+        catalog.get_board('1')
+
+        assert server.list_calls == 1
+        assert server.detail_calls == 2
+
+    def test_stale_served_while_refreshing(self, clock):
+        """测试过期数据立即返回并在后台刷新"""
+        server = FakeServer()
+        catalog = BoardCatalog(server.fetch_boards, server.fetch_board, soft_ttl=60)
+        assert catalog.get_boards()[0].name == '技术讨论v1'
+
+        clock.now += 61
+        server.version = 2
+        server.release.clear()
+
+        # 过期后不阻塞，仍返回旧数据
+        assert catalog.get_boards()[0].name == '技术讨论v1'
+        assert catalog.get_boards()[0].name == '技术讨论v1'
+        server.release.set()
+        assert catalog.wait_refreshed(timeout=2)
+
+        assert server.list_calls == 2
+        assert catalog.get_boards()[0].name == '技术讨论v2'
+        catalog.close()
+
+    def test_board_detail_soft_ttl(self, clock):
+        """测试板块详情的软过期"""
+        server = FakeServer()
+        catalog = BoardCatalog(server.fetch_boards, server.fetch_board, soft_ttl=60)
+
+        assert catalog.get_board('1').n_posts == 1
+        assert catalog.get_board('1').n_posts == 1
+        assert server.detail_calls == 1
+
+        clock.now += 61
+        server.version = 5
+        assert catalog.get_board('1').n_posts == 1
+        assert catalog.wait_refreshed(timeout=2)
+        assert catalog.get_board('1').n_posts == 5
+        catalog.close()
+
+    def test_refresh_failure_keeps_stale(self, clock):
+        """测试后台刷新失败时保留旧数据"""
+        server = FakeServer()
+        catalog = BoardCatalog(server.fetch_boards, server.fetch_board, soft_ttl=60)
+        catalog.get_boards()
+
+        def failing(refresh=False):
+            raise RuntimeError("网络错误")
+
+        catalog._fetch_boards = failing
+        clock.now += 61
+        assert catalog.get_boards()[0].name == '技术讨论v1'
+        assert catalog.wait_refreshed(timeout=2)
+        assert catalog.get_boards()[0].name == '技术讨论v1'
+        catalog.close()
+
+    def test_name_and_id_indexes(self):
+        """测试名称与ID索引"""
+        def fetch_boards():
+            return [
+                Board(id='1', name='技术讨论', icon_url=''),
+                Board(id='2', name='新手入门', icon_url=''),
+                Board(id='3', name='技术讨论', icon_url=''),
+            ]
+
+        catalog = BoardCatalog(fetch_boards, lambda board_id: None)
+
+        assert catalog.resolve_id('新手入门') == '2'
+        # 同名板块以第一个为准
+        assert catalog.resolve_id('技术讨论') == '1'
+        assert catalog.resolve_id('不存在') is None
+        assert catalog.find('2').name == '新手入门'
+        assert catalog.find('9') is None
+
+
+class TestBoardRefreshWithCache:
+    """测试开启响应缓存时的后台刷新"""
+
+    def test_background_refresh_skips_response_cache(self):
+        """后台刷新绕过仍在有效期内的响应缓存，拿到新数据"""
+        with FakeCodeMaoServer(Dataset(users=2, boards=2, posts_per_board=1)) as server:
+            client = CodeMaoClient(base_url=server.url, cache=ResponseCache(),
+                                   boards_ttl=0.05)
+            try:
+                board_id = server.dataset.boards[0]["id"]
+                before = client.get_board_by_id(board_id).n_posts
+                server.dataset.add_post(board_id, 10001, "新帖子标题", "新帖子的内容内容")
+                time.sleep(0.1)
+
+                # 软过期后先返回旧数据，后台刷新
+                assert client.get_board_by_id(board_id).n_posts == before
+                assert client._board_catalog.wait_refreshed(timeout=5)
+                assert client.get_board_by_id(board_id).n_posts == before + 1
+            finally:
+                client._board_catalog.close()
+                client.session.close()
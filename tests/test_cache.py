@@ -0,0 +1,151 @@
+"""
+响应缓存测试
+"""
+
+import pytest
+
+from codemaokit import CodeMaoClient
+from codemaokit.cache import MemoryCache, SQLiteCache, ResponseCache
+from codemaokit.testing import Dataset, FakeCodeMaoServer
+from codemaokit.utils import endpoint_template
+
+pytestmark = pytest.mark.clock(
+    "codemaokit.cache.time.monotonic",
+    "codemaokit.cache.time.time",
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    """内存与磁盘两种后端"""
+    if request.param == "memory":
+        yield MemoryCache(max_entries=2, max_bytes=1024)
+    else:
+        cache = SQLiteCache(str(tmp_path / "cache.db"), max_entries=2, max_bytes=1024)
+        yield cache
+        cache.close()
+
+
+class TestCacheBackends:
+    """测试缓存后端"""
+
+    def test_get_set(self, backend, clock):
+        """测试读写"""
+        backend.set("a", {"id": 1}, ttl=10)
+        assert backend.get("a") == {"id": 1}
+        assert backend.get("missing") is None
+
+    def test_expiry(self, backend, clock):
+        """测试过期"""
+        backend.set("a", {"id": 1}, ttl=10)
+        clock.now += 11
+        assert backend.get("a") is None
+        assert backend.stats()["entries"] == 0
+
+    def test_lru_eviction_by_entries(self, backend, clock):
+        """测试按条目数淘汰最久未使用的条目"""
+        backend.set("a", {"id": 1}, ttl=10)
+        clock.now += 1
+        backend.set("b", {"id": 2}, ttl=10)
+        clock.now += 1
+        backend.get("a")
+        clock.now += 1
+        backend.set("c", {"id": 3}, ttl=10)
+
+        assert backend.get("b") is None
+        assert backend.get("a") == {"id": 1}
+        assert backend.stats()["evictions"] == 1
+
+    def test_eviction_by_bytes(self, backend, clock):
+        """测试按字节数淘汰"""
+        backend.set("a", {"text": "x" * 600}, ttl=10)
+        clock.now += 1
+        backend.set("b", {"text": "y" * 600}, ttl=10)
+
+        assert backend.get("a") is None
+        assert backend.stats()["bytes"] <= 1024
+
+    def test_oversized_value_skipped(self, backend, clock):
+        """测试超过容量的值不缓存"""
+        backend.set("a", {"text": "x" * 2000}, ttl=10)
+        assert backend.get("a") is None
+
+    def test_delete_and_clear(self, backend, clock):
+        """测试删除与清空"""
+        backend.set("a", {"id": 1}, ttl=10)
+        backend.set("b", {"id": 2}, ttl=10)
+        backend.delete("a")
+        assert backend.get("a") is None
+        backend.clear()
+        assert backend.stats()["entries"] == 0
+
+    def test_memory_uses_given_size(self, clock):
+        """测试内存后端按传入的响应体字节数计算容量"""
+        backend = MemoryCache(max_bytes=1024)
+        backend.set("a", {"id": 1}, ttl=10, size=500)
+        assert backend.stats()["bytes"] == 500
+        backend.set("b", {"id": 2}, ttl=10, size=2000)
+        assert backend.get("b") is None
+
+
+class TestResponseCache:
+    """测试响应缓存"""
+
+    def test_only_configured_gets_cached(self, clock):
+        """测试只缓存配置过的GET端点"""
+        cache = ResponseCache()
+        cache.set("GET", "/web/forums/boards/17", None, {"id": "17"})
+        cache.set("POST", "/web/forums/boards/17/posts", None, {"id": "1"})
+        cache.set("GET", "/api/user/info", None, {"id": 1})
+
+        assert cache.get("GET", "/web/forums/boards/17") == {"id": "17"}
+        assert cache.get("POST", "/web/forums/boards/17/posts") is None
+        assert cache.get("GET", "/api/user/info") is None
+        assert cache.stats()["entries"] == 1
+
+    def test_params_in_key_and_stats(self, clock):
+        """测试参数参与缓存键及命中统计"""
+        cache = ResponseCache(ttls={"/creation-tools/v1/user/center/honor": 5})
+        endpoint = "/creation-tools/v1/user/center/honor"
+        cache.set("GET", endpoint, {"user_id": 1}, {"fans_total": 1})
+
+        assert cache.get("GET", endpoint, {"user_id": 2}) is None
+        assert cache.get("GET", endpoint, {"user_id": 1}) == {"fans_total": 1}
+        clock.now += 6
+        assert cache.get("GET", endpoint, {"user_id": 1}) is None
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+
+    def test_endpoint_template(self):
+        """测试端点模板"""
+        assert endpoint_template("/web/forums/boards/17") == "/web/forums/boards/{id}"
+        assert endpoint_template("/tiger/v3/web/accounts/login") == "/tiger/v3/web/accounts/login"
+        assert endpoint_template("/web/forums/posts/123/replies") == "/web/forums/posts/{id}/replies"
+
+
+class TestClientRefresh:
+    """测试 refresh 跳过响应缓存"""
+
+    def test_refresh_bypasses_response_cache(self):
+        """配置响应缓存时 refresh=True 仍请求服务器并更新缓存"""
+        with FakeCodeMaoServer(Dataset(users=2, boards=2, posts_per_board=1)) as server:
+            client = CodeMaoClient(base_url=server.url, cache=ResponseCache())
+            try:
+                board_id = server.dataset.boards[0]["id"]
+                before = client.get_board_by_id(board_id).n_posts
+                client.get_boards()
+                server.dataset.add_post(board_id, 10001, "新帖子标题", "新帖子的内容内容")
+
+                assert client.get_board_by_id(board_id).n_posts == before
+                assert client.get_board_by_id(board_id, refresh=True).n_posts == before + 1
+                # 刷新的结果写回缓存
+                assert client.get_board_by_id(board_id).n_posts == before + 1
+
+                client.get_boards(refresh=True)
+                endpoints = server.stats()["endpoints"]
+                assert endpoints["GET /web/forums/boards/simples/all"] == 2
+                assert endpoints["GET /web/forums/boards/{id}"] == 2
+            finally:
+                client.session.close()
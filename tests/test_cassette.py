@@ -0,0 +1,126 @@
+"""
+录制/回放传输层测试
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from codemaokit import CodeMaoClient
+from codemaokit.cassette import (
+    Cassette, RecordingTransport, ReplayTransport, request_key
+)
+from codemaokit.exceptions import NetworkError
+
+
+class Handler(BaseHTTPRequestHandler):
+    """返回固定数据的本地服务器"""
+
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def do_GET(self):
+        Handler.hits += 1
+        if self.path.startswith("/web/forums/boards/simples/all"):
+            payload = {"items": [{"id": "17", "name": "技术讨论", "icon_url": ""}]}
+        elif self.path.startswith("/creation-tools/v1/user/center/work-list"):
+            payload = {"items": [{"id": i, "work_name": f"作品{i}"} for i in range(3)]}
+        else:
+            payload = {"id": "17", "name": "技术讨论", "icon_url": "", "n_posts": Handler.hits}
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.hits = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_client(base_url, **kwargs):
+    client = CodeMaoClient(**kwargs)
+    client.BASE_URL = base_url
+    return client
+
+
+class TestRequestKey:
+    """测试请求匹配键"""
+
+    def test_query_order_and_body(self):
+        """测试主机名和查询参数顺序无关，请求体参与匹配"""
+        assert request_key("get", "http://x/a?b=2&a=1") == request_key("GET", "https://y/a?a=1&b=2")
+        assert request_key("POST", "http://x/a", b"1") != request_key("POST", "http://x/a", b"2")
+
+
+class TestRecordReplay:
+    """测试录制后离线回放"""
+
+    def test_round_trip(self, server, tmp_path):
+        """测试录制的响应可以在没有网络时回放"""
+        path = str(tmp_path / "boards.jsonl.gz")
+        client = make_client(server, transport=RecordingTransport(Cassette(path)))
+        boards = client.get_boards()
+        first = client.get_board_by_id(17)
+        second = client.get_board_by_id(17)
+        works = list(client.stream_user_works(1, limit=3))
+        client.session.close()
+
+        cassette = Cassette(path)
+        assert len(cassette) == 4
+
+        replay = make_client("http://offline.invalid",
+                             transport=ReplayTransport(cassette))
+        assert replay.get_boards()[0].name == boards[0].name
+        # 相同请求按录制顺序返回
+        assert replay.get_board_by_id(17).n_posts == first.n_posts
+        assert replay.get_board_by_id(17).n_posts == second.n_posts
+        assert replay.get_board_by_id(17).n_posts == second.n_posts
+        assert [w.name for w in replay.stream_user_works(1, limit=3)] == [w.name for w in works]
+
+    def test_saved_on_exit(self, server, tmp_path):
+        """测试离开 with 块时关闭会话并保存录制文件"""
+        path = tmp_path / "boards.jsonl.gz"
+        with make_client(server, transport=RecordingTransport(Cassette(str(path)))) as client:
+            client.get_boards()
+        assert path.exists()
+        assert len(Cassette(str(path))) == 1
+
+    def test_miss_not_retried(self):
+        """测试没有匹配记录时直接失败"""
+        client = make_client("http://offline.invalid",
+                             transport=ReplayTransport(Cassette()))
+        with pytest.raises(NetworkError, match="没有匹配的录制记录"):
+            client.get_user_honor(1)
+
+    def test_latency_injection(self, server):
+        """测试注入延迟和读取超时"""
+        cassette = Cassette()
+        recorder = make_client(server, transport=RecordingTransport(cassette))
+        recorder.get_board_by_id(17)
+
+        client = make_client("http://offline.invalid",
+                             transport=ReplayTransport(cassette, latency=0.05))
+        start = time.monotonic()
+        client.get_board_by_id(17)
+        assert time.monotonic() - start >= 0.05
+
+        slow = make_client("http://offline.invalid", timeout=0.01, max_retries=0,
+                           transport=ReplayTransport(cassette, latency=lambda: 1.0))
+        with pytest.raises(NetworkError):
+            slow.get_board_by_id(17)
@@ -0,0 +1,94 @@
+"""
+熔断器测试
+"""
+
+import pytest
+
+from codemaokit.circuitbreaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from codemaokit.exceptions import CircuitOpenError, NetworkError
+
+pytestmark = pytest.mark.clock("codemaokit.circuitbreaker.time.monotonic")
+
+
+def fail(breaker, group="default", times=1):
+    for _ in range(times):
+        breaker.before_request(group)
+        breaker.record_failure(group)
+
+
+class TestCircuitBreaker:
+    """测试熔断器状态转换"""
+
+    def test_opens_after_threshold(self, clock):
+        """测试连续失败达到阈值后打开"""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+        fail(breaker, times=2)
+        assert breaker.state() == CLOSED
+
+        fail(breaker)
+        assert breaker.state() == OPEN
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.before_request()
+        assert isinstance(exc_info.value, NetworkError)
+        assert exc_info.value.retry_after == pytest.approx(10)
+
+    def test_success_resets_failures(self, clock):
+        """测试成功请求清零连续失败次数"""
+        breaker = CircuitBreaker(failure_threshold=2)
+        fail(breaker)
+        breaker.before_request()
+        breaker.record_success()
+        fail(breaker)
+        assert breaker.state() == CLOSED
+
+    def test_half_open_limits_probes(self, clock):
+        """测试半开状态只放行有限的探测请求"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=5)
+        fail(breaker)
+        clock.now += 5
+        assert breaker.state() == HALF_OPEN
+
+        breaker.before_request()
+        with pytest.raises(CircuitOpenError, match="探测"):
+            breaker.before_request()
+
+        breaker.record_success()
+        assert breaker.state() == CLOSED
+        breaker.before_request()
+
+    def test_failed_probe_reopens(self, clock):
+        """测试探测失败后重新打开"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=5)
+        fail(breaker)
+        clock.now += 5
+        fail(breaker)
+
+        assert breaker.state() == OPEN
+        clock.now += 4
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+    def test_success_threshold(self, clock):
+        """测试半开状态需要多次成功才关闭"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=1,
+                                 half_open_max_calls=2, success_threshold=2)
+        fail(breaker)
+        clock.now += 1
+        breaker.before_request()
+        breaker.before_request()
+        breaker.record_success()
+        assert breaker.state() == HALF_OPEN
+        breaker.record_success()
+        assert breaker.state() == CLOSED
+
+    def test_groups_are_independent(self, clock):
+        """测试分组互不影响，并支持单独配置"""
+        breaker = CircuitBreaker(failure_threshold=5,
+                                 group_settings={"forums": (1, 60)})
+        fail(breaker, "forums")
+
+        assert breaker.state("forums") == OPEN
+        breaker.before_request("users")
+
+        breaker.reset("forums")
+        assert breaker.state("forums") == CLOSED
@@ -10,8 +10,11 @@ from codemaokit import CodeMaoClient
 from codemaokit.models import User, Board, Post
 from codemaokit.exceptions import (
     AuthenticationError, APIError, ValidationError,
-    ResourceNotFoundError, NetworkError
+    ResourceNotFoundError, NetworkError, RateLimitError, CircuitOpenError
 )
+from codemaokit.cache import ResponseCache
+from codemaokit.ratelimit import RateLimiter
+from codemaokit.circuitbreaker import CircuitBreaker
 
 
 class TestCodeMaoClient:
@@ -25,11 +28,13 @@ class TestCodeMaoClient:
     @pytest.fixture
     def mock_response(self):
         """模拟响应"""
-        def _create_mock_response(status_code=200, json_data=None, text=""):
+        def _create_mock_response(status_code=200, json_data=None, text="", headers=None):
             response = Mock()
             response.status_code = status_code
             response.text = text
+            response.headers = headers or {}
             response.json.return_value = json_data or {}
+            response.content = json.dumps(json_data or {}).encode('utf-8')
             return response
         return _create_mock_response
     
@@ -280,10 +285,300 @@ class TestCodeMaoClient:
         with pytest.raises(CodeMaoError, match="请求过于频繁"):
             client.get_boards()
     
+    @patch('codemaokit.client.time.sleep')
     @patch('requests.Session.request')
-    def test_server_error(self, mock_request, client, mock_response):
+    def test_server_error(self, mock_request, mock_sleep, client, mock_response):
         """测试服务器错误"""
         mock_request.return_value = mock_response(status_code=500)
         
         with pytest.raises(NetworkError, match="服务器错误"):
-            client.get_boards()
\ No newline at end of file
+            client.get_boards()
+    
+    @patch('requests.Session.request')
+    def test_get_users_batch(self, mock_request, client, mock_response):
+        """测试批量获取用户信息"""
+        def fake_request(method, url, **kwargs):
+            user_id = url.rsplit('/', 1)[-1]
+            if user_id == '404':
+                return mock_response(json_data={'code': 404})
+            return mock_response(json_data={
+                'code': 200,
+                'data': {'userInfo': {'user': {'id': int(user_id), 'nickname': f'用户{user_id}'}}}
+            })
+        
+        mock_request.side_effect = fake_request
+        
+        results = client.get_users_batch([3, 1, 404, 3])
+        
+        # 重复ID只请求一次
+        assert mock_request.call_count == 3
+        assert [r.user_id for r in results] == [3, 1, 404, 3]
+        assert isinstance(results[0].user, User)
+        assert results[0].user.nickname == '用户3'
+        assert results[1].user.id == 1
+        assert results[2].ok is False
+        assert isinstance(results[2].error, ResourceNotFoundError)
+        assert results[3] is results[0]
+    
+    @patch('requests.Session.request')
+    def test_get_users_batch_with_honor(self, mock_request, client, mock_response):
+        """测试批量获取用户信息及荣誉"""
+        def fake_request(method, url, **kwargs):
+            if url.endswith('/honor'):
+                return mock_response(json_data={'fans_total': kwargs['params']['user_id'] * 10})
+            return mock_response(json_data={
+                'code': 200,
+                'data': {'userInfo': {'user': {'id': 1, 'nickname': '用户'}}}
+            })
+        
+        mock_request.side_effect = fake_request
+        
+        results = client.get_users_batch([1, 2], include_honor=True)
+        
+        assert results[0].honor.fans_total == 10
+        assert results[1].honor.fans_total == 20
+    
+    @patch('requests.Session.request')
+    def test_rate_limit_retry_after(self, mock_request, mock_response):
+        """测试429响应携带 Retry-After"""
+        limiter = RateLimiter(rate=None, group_rates={"forums": 100})
+        client = CodeMaoClient(rate_limiter=limiter)
+        mock_request.return_value = mock_response(
+            status_code=429, headers={"Retry-After": "7"}
+        )
+        
+        with pytest.raises(RateLimitError, match="请求过于频繁") as exc_info:
+            client.get_boards()
+        
+        assert exc_info.value.retry_after == 7.0
+        # 分组被暂停，超过 max_wait 时直接失败而不发请求
+        limiter.max_wait = 1
+        with pytest.raises(RateLimitError):
+            client.get_boards()
+        assert mock_request.call_count == 1
+    
+    @patch('requests.Session.request')
+    def test_coalesce_concurrent_gets(self, mock_request, mock_response):
+        """测试合并并发的相同GET请求"""
+        import threading
+        
+        client = CodeMaoClient(coalesce_requests=True)
+        release = threading.Event()
+        
+        def slow_request(method, url, **kwargs):
+            release.wait()
+            return mock_response(json_data={'id': '1', 'name': '技术讨论'})
+        
+        mock_request.side_effect = slow_request
+        boards = []
+        threads = [
+            threading.Thread(target=lambda: boards.append(client.get_board_by_id('1')))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        key = ("GET", "/web/forums/boards/1", ())
+        for _ in range(2000):
+            call = client._singleflight._calls.get(key)
+            if call is not None and call.waiters == 7:
+                break
+            release.wait(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        
+        assert mock_request.call_count == 1
+        assert len(boards) == 8
+        assert all(board.name == '技术讨论' for board in boards)
+    
+    @patch('requests.Session.request')
+    def test_response_cache(self, mock_request, mock_response):
+        """测试只读接口的响应缓存"""
+        from codemaokit.cache import ResponseCache
+        
+        client = CodeMaoClient(cache=ResponseCache())
+        mock_request.return_value = mock_response(
+            json_data={'id': '1', 'name': '技术讨论', 'n_posts': 100}
+        )
+        
+        first = client.get_board_by_id('1')
+        second = client.get_board_by_id('1')
+        
+        assert mock_request.call_count == 1
+        assert first == second
+        assert client.cache.stats()['hits'] == 1
+    
+    @patch('requests.Session.request')
+    def test_create_post_uses_board_index(self, mock_request, client, mock_response):
+        """测试发帖通过板块名称索引解析ID，不再请求板块详情"""
+        client.is_authenticated = True
+        client.current_user = User(id=1, nickname='测试用户', avatar_url='')
+        
+        def fake_request(method, url, **kwargs):
+            if url.endswith('/boards/simples/all'):
+                return mock_response(json_data={'items': [
+                    {'id': '1', 'name': '技术讨论'}, {'id': '2', 'name': '新手入门'}
+                ]})
+            return mock_response(json_data={'id': 'post_123'})
+        
+        mock_request.side_effect = fake_request
+        
+        for _ in range(3):
+            client.create_post("测试帖子标题", "这是一个测试帖子内容，长度足够。", "新手入门")
+        
+        urls = [call.kwargs['url'] for call in mock_request.call_args_list]
+        assert urls[0].endswith('/web/forums/boards/simples/all')
+        assert all(url.endswith('/web/forums/boards/2/posts') for url in urls[1:])
+        assert len(urls) == 4
+        
+        with pytest.raises(ResourceNotFoundError, match="板块不存在"):
+            client.create_post("测试帖子标题", "这是一个测试帖子内容，长度足够。", "不存在")
+    
+    @patch('requests.Session.request')
+    def test_conditional_get(self, mock_request, mock_response):
+        """测试条件请求复用304响应"""
+        client = CodeMaoClient(conditional_requests=True)
+        mock_request.return_value = mock_response(
+            json_data={'code': 200, 'data': {'userInfo': {'user': {'id': 1, 'nickname': '用户'}}}},
+            headers={'ETag': '"abc"'}
+        )
+        first = client.get_user(1)
+        
+        not_modified = mock_response(status_code=304)
+        not_modified.content = b''
+        mock_request.return_value = not_modified
+        second = client.get_user(1)
+        
+        assert mock_request.call_args_list[0].kwargs['headers'] is None
+        assert mock_request.call_args_list[1].kwargs['headers'] == {'If-None-Match': '"abc"'}
+        assert second == first
+    
+    @patch('requests.Session.request')
+    def test_not_modified_after_eviction(self, mock_request, mock_response):
+        """测试校验信息在请求期间被淘汰时，304后不带校验信息重新请求"""
+        client = CodeMaoClient(conditional_requests=True)
+        user_data = {'code': 200, 'data': {'userInfo': {'user': {'id': 1, 'nickname': '用户'}}}}
+        mock_request.return_value = mock_response(json_data=user_data, headers={'ETag': '"abc"'})
+        client.get_user(1)
+        
+        not_modified = mock_response(status_code=304)
+        not_modified.content = b''
+        fresh = mock_response(json_data=user_data, headers={'ETag': '"def"'})
+        
+        def respond(**kwargs):
+            if mock_request.call_count == 2:
+                client._validators.clear()
+                return not_modified
+            return fresh
+        
+        mock_request.side_effect = respond
+        user = client.get_user(1)
+        
+        assert user.nickname == '用户'
+        assert mock_request.call_count == 3
+        assert mock_request.call_args_list[1].kwargs['headers'] == {'If-None-Match': '"abc"'}
+        assert mock_request.call_args_list[2].kwargs['headers'] is None
+        assert client._validators.request_headers(
+            ResponseCache.make_key('/api/user/info/detail/1')
+        ) == {'If-None-Match': '"def"'}
+    
+    @patch('requests.Session.request')
+    def test_invalid_json_keeps_bounded_preview(self, mock_request, client, mock_response):
+        """测试无效JSON响应只在异常中保留响应体预览"""
+        response = mock_response()
+        response.content = b'<html>' + b'x' * 10000
+        mock_request.return_value = response
+        
+        with pytest.raises(APIError, match="无效的JSON响应") as exc_info:
+            client.get_user(1)
+        
+        assert len(exc_info.value.message) < 300
+        assert '10006字节' in exc_info.value.message
+    
+    @patch('requests.Session.request')
+    def test_custom_json_decoder(self, mock_request, mock_response):
+        """测试自定义JSON解码器"""
+        decoded = []
+        
+        def loads(content):
+            decoded.append(content)
+            return json.loads(content)
+        
+        client = CodeMaoClient(json_decoder=loads)
+        mock_request.return_value = mock_response(json_data={'items': []})
+        client.get_boards()
+        
+        assert decoded == [b'{"items": []}']
+    
+    @patch('requests.Session.request')
+    def test_stream_user_works(self, mock_request, client, mock_response):
+        """测试流式获取作品列表"""
+        from codemaokit.models import Work
+        
+        body = json.dumps({'items': [
+            {'id': 1, 'work_name': '作品1', 'type': 1},
+            {'id': 2, 'work_name': '作品2', 'type': 1},
+        ]}).encode('utf-8')
+        response = mock_response()
+        response.iter_content.return_value = [body[i:i + 10] for i in range(0, len(body), 10)]
+        mock_request.return_value = response
+        
+        works = list(client.stream_user_works(123, limit=2))
+        
+        assert [work.name for work in works] == ['作品1', '作品2']
+        assert isinstance(works[0], Work)
+        assert mock_request.call_args.kwargs['stream'] is True
+        assert mock_request.call_args.kwargs['params'] == {'user_id': 123, 'offset': 0, 'limit': 2}
+        response.close.assert_called_once()
+    
+    @patch('requests.Session.request')
+    def test_stream_api_error(self, mock_request, client, mock_response):
+        """测试流式请求返回业务错误"""
+        response = mock_response()
+        response.iter_content.return_value = ['{"error_code": "E", "error_message": "失败"}'.encode('utf-8')]
+        mock_request.return_value = response
+        
+        with pytest.raises(APIError, match="失败"):
+            list(client.stream_fans(123))
+    
+    @patch('requests.Session.request')
+    def test_circuit_breaker_fails_fast(self, mock_request, mock_response):
+        """测试熔断后不再发送请求"""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        client = CodeMaoClient(circuit_breaker=breaker, max_retries=0)
+        mock_request.return_value = mock_response(status_code=503)
+        
+        for _ in range(2):
+            with pytest.raises(NetworkError, match="服务器错误"):
+                client.get_boards()
+        
+        with pytest.raises(CircuitOpenError):
+            client.get_boards()
+        assert mock_request.call_count == 2
+        
+        # 其他分组不受影响，4xx 响应不计为失败
+        mock_request.return_value = mock_response(status_code=404)
+        with pytest.raises(ResourceNotFoundError):
+            client.get_user(1)
+        assert breaker.state("users") == "closed"
+    
+    @patch('requests.Session.request')
+    def test_circuit_breaker_probe_released_on_other_errors(self, mock_request, mock_response):
+        """测试半开探测抛出非 requests 异常时归还探测名额"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        client = CodeMaoClient(circuit_breaker=breaker, max_retries=0)
+        mock_request.return_value = mock_response(status_code=503)
+        with pytest.raises(NetworkError):
+            client.get_boards()
+        
+        mock_request.side_effect = RuntimeError("传输层故障")
+        with pytest.raises(APIError, match="传输层故障"):
+            client.get_boards()
+        
+        mock_request.side_effect = None
+        mock_request.return_value = mock_response(status_code=503)
+        with pytest.raises(NetworkError, match="服务器错误"):
+            client.get_boards()
+        assert mock_request.call_count == 3
+
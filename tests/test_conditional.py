@@ -0,0 +1,59 @@
+"""
+条件请求测试
+"""
+
+from codemaokit.conditional import ValidatorStore
+
+
+class TestValidatorStore:
+    """测试校验信息存储"""
+
+    def test_request_headers(self):
+        """测试生成条件请求头"""
+        store = ValidatorStore()
+        assert store.request_headers("/a") == {}
+
+        store.store("/a", '"v1"', "Wed, 21 Oct 2015 07:28:00 GMT", {"id": 1})
+
+        assert store.request_headers("/a") == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+        }
+
+    def test_not_modified(self):
+        """测试304复用已解析数据"""
+        store = ValidatorStore()
+        data = {"id": 1}
+        store.store("/a", '"v1"', None, data)
+
+        assert store.not_modified("/a") is data
+        assert store.not_modified("/b") is None
+        assert store.revalidated == 1
+
+    def test_without_validators_removes_entry(self):
+        """测试响应不再带校验信息时删除旧条目"""
+        store = ValidatorStore()
+        store.store("/a", '"v1"', None, {"id": 1})
+        store.store("/a", None, None, {"id": 2})
+
+        assert store.get("/a") is None
+
+    def test_discard(self):
+        """测试删除校验信息"""
+        store = ValidatorStore()
+        store.store("/a", '"v1"', None, {"id": 1})
+        store.discard("/a")
+        store.discard("/b")
+
+        assert store.get("/a") is None
+
+    def test_lru_eviction(self):
+        """测试超过容量时淘汰最久未使用的条目"""
+        store = ValidatorStore(max_entries=2)
+        store.store("/a", '"a"', None, 1)
+        store.store("/b", '"b"', None, 2)
+        store.get("/a")
+        store.store("/c", '"c"', None, 3)
+
+        assert store.get("/b") is None
+        assert store.get("/a") is not None
@@ -0,0 +1,159 @@
+"""
+截止时间测试
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from codemaokit import CodeMaoClient
+from codemaokit.deadline import Deadline
+from codemaokit.exceptions import DeadlineExceededError, NetworkError
+from codemaokit.ratelimit import RateLimiter
+
+pytestmark = pytest.mark.clock(
+    "codemaokit.deadline.time.monotonic",
+    "codemaokit.client.time.sleep",
+)
+
+
+def response(status_code=200, json_data=None):
+    mock = Mock()
+    mock.status_code = status_code
+    mock.headers = {}
+    mock.content = b'{"code": 200}' if json_data is None else json_data
+    return mock
+
+
+class TestDeadline:
+    """测试截止时间"""
+
+    def test_remaining_and_clamp(self, clock):
+        """测试剩余时间和超时裁剪"""
+        deadline = Deadline(5)
+        clock.now += 3
+
+        assert deadline.remaining() == pytest.approx(2)
+        assert deadline.clamp(1, 30) == (1, pytest.approx(2))
+
+        clock.now += 2
+        assert deadline.expired
+        with pytest.raises(DeadlineExceededError):
+            deadline.clamp(1, 30)
+
+    def test_coerce(self, clock):
+        """测试从秒数转换"""
+        deadline = Deadline(1)
+        assert Deadline.coerce(deadline) is deadline
+        assert Deadline.coerce(None) is None
+        assert Deadline.coerce(2.5).budget == 2.5
+        with pytest.raises(ValueError):
+            Deadline(0)
+
+
+class TestClientDeadline:
+    """测试客户端的截止时间与重试"""
+
+    @patch('requests.Session.request')
+    def test_separate_timeouts(self, mock_request, clock):
+        """测试连接/读取超时分别配置并受截止时间限制"""
+        client = CodeMaoClient(timeout=30, connect_timeout=3)
+        mock_request.return_value = response()
+
+        client.get_user_honor(1)
+        assert mock_request.call_args.kwargs['timeout'] == (3, 30)
+
+        client.get_user_honor(1, deadline=2)
+        assert mock_request.call_args.kwargs['timeout'] == (2, 2)
+
+    @patch('requests.Session.request')
+    def test_retries_with_backoff(self, mock_request, clock):
+        """测试5xx重试与指数退避"""
+        client = CodeMaoClient(max_retries=3)
+        mock_request.side_effect = [response(503), response(503), response()]
+
+        client.get_user_honor(1)
+
+        assert mock_request.call_count == 3
+        assert clock.slept == [2]
+
+    @patch('requests.Session.request')
+    def test_backoff_stops_at_deadline(self, mock_request, clock):
+        """测试退避超出剩余预算时不再重试"""
+        client = CodeMaoClient(max_retries=5, deadline=3)
+        mock_request.return_value = response(503)
+
+        with pytest.raises(NetworkError, match="服务器错误"):
+            client.get_user_honor(1)
+
+        # 立即重试一次，下一次需要退避2秒（剩余3秒），再下一次需要4秒超出预算
+        assert mock_request.call_count == 3
+        assert clock.now - 1000.0 < 3
+
+    @patch('requests.Session.request')
+    def test_timeout_raises_deadline_exceeded(self, mock_request, clock):
+        """测试超时耗尽预算时抛出截止时间异常"""
+        client = CodeMaoClient(max_retries=3)
+
+        def slow(**kwargs):
+            clock.now += kwargs['timeout'][1]
+            raise requests.exceptions.ReadTimeout("read timed out")
+
+        mock_request.side_effect = slow
+
+        with pytest.raises(DeadlineExceededError):
+            client.get_user_honor(1, deadline=1.5)
+        assert mock_request.call_count == 1
+
+    @patch('requests.Session.request')
+    def test_post_not_retried(self, mock_request, clock):
+        """测试非幂等请求不重试"""
+        client = CodeMaoClient(max_retries=3)
+        mock_request.side_effect = requests.exceptions.ReadTimeout("read timed out")
+
+        with pytest.raises(NetworkError, match="网络请求失败"):
+            client.login("user", "password")
+        assert mock_request.call_count == 1
+
+    @patch('requests.Session.request')
+    def test_rate_limit_wait_bounded_by_deadline(self, mock_request, clock):
+        """测试限流排队超过剩余预算时立即失败，不占用令牌"""
+        limiter = RateLimiter(rate=1, burst=1)
+        client = CodeMaoClient(rate_limiter=limiter)
+        mock_request.return_value = response()
+        client.get_user_honor(1)
+
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceededError):
+            client.get_user_honor(1, deadline=0.2)
+        assert time.monotonic() - started < 0.1
+        assert mock_request.call_count == 1
+        assert clock.slept == []
+
+    @patch('requests.Session.request')
+    def test_coalesced_wait_bounded_by_deadline(self, mock_request, clock):
+        """测试合并请求的等待者按自己的截止时间放弃"""
+        client = CodeMaoClient(coalesce_requests=True)
+        release = threading.Event()
+
+        def slow(*args, **kwargs):
+            release.wait()
+            return response()
+
+        mock_request.side_effect = slow
+        leader = threading.Thread(target=client.get_user_honor, args=(1,))
+        leader.start()
+        try:
+            while not client._singleflight.in_flight():
+                time.sleep(0.001)
+            started = time.monotonic()
+            with pytest.raises(DeadlineExceededError):
+                client.get_user_honor(1, deadline=0.2)
+            assert time.monotonic() - started < 1
+        finally:
+            release.set()
+            leader.join()
+        assert mock_request.call_count == 1
@@ -0,0 +1,228 @@
+"""
+对冲请求测试
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from codemaokit import CodeMaoClient
+from codemaokit.hedging import HedgingPolicy, LatencyTracker
+from codemaokit.ratelimit import RateLimiter
+
+
+class SlowThenFast:
+    """第一次调用阻塞直到被释放（fail 时随后超时失败），之后的调用立即返回"""
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            self.release.wait(5)
+            if self.fail:
+                raise TimeoutError("read timed out")
+            return "slow"
+        return "fast"
+
+
+class TestLatencyTracker:
+    """测试耗时窗口"""
+
+    def test_percentile(self):
+        """测试百分位计算和窗口大小"""
+        tracker = LatencyTracker(window=100)
+        for i in range(200):
+            tracker.add(i / 1000)
+
+        assert len(tracker) == 100
+        assert tracker.percentile(50) == pytest.approx(0.15)
+        assert tracker.percentile(99) == pytest.approx(0.199)
+
+    def test_empty(self):
+        """测试没有样本"""
+        assert LatencyTracker().percentile(95) is None
+
+
+class TestHedgingPolicy:
+    """测试对冲策略"""
+
+    def test_fast_primary_not_hedged(self):
+        """测试及时返回的请求不对冲"""
+        policy = HedgingPolicy(initial_delay=1.0)
+        send = Mock(return_value="ok")
+
+        assert policy.run("/a", send) == "ok"
+        assert send.call_count == 1
+        assert policy.stats()["hedged"] == 0
+        policy.close()
+
+    def test_stalled_primary_uses_hedge(self):
+        """测试卡住后失败的请求采用对冲结果"""
+        policy = HedgingPolicy(initial_delay=0.02)
+        send = SlowThenFast(fail=True)
+        threading.Timer(0.1, send.release.set).start()
+
+        assert policy.run("/a", send) == "fast"
+        assert send.calls == 2
+        assert policy.stats()["hedge_wins"] == 1
+        policy.close()
+
+    def test_hedge_wins_while_primary_slow(self):
+        """测试第一次请求仍未返回时采用先返回的对冲结果，慢的结果返回后被丢弃"""
+        policy = HedgingPolicy(initial_delay=0.02)
+        send = SlowThenFast()
+        discarded = []
+
+        started = time.monotonic()
+        assert policy.run("/a", send, discard=discarded.append) == "fast"
+        assert time.monotonic() - started < 1
+        assert policy.stats()["hedge_wins"] == 1
+        assert discarded == []
+
+        send.release.set()
+        deadline = time.monotonic() + 2
+        while not discarded and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert discarded == ["slow"]
+        policy.close()
+
+    def test_primary_not_queued_behind_pool(self):
+        """测试线程池占满时第一次请求也不排队，排队的对冲请求在有结果后不再发送"""
+        policy = HedgingPolicy(initial_delay=0.02, max_workers=1)
+        blocker = threading.Event()
+        policy._get_executor().submit(blocker.wait, 5)
+        send = Mock(side_effect=lambda: time.sleep(0.05) or "ok")
+
+        try:
+            assert policy.run("/a", send) == "ok"
+        finally:
+            blocker.set()
+        deadline = time.monotonic() + 2
+        while policy.stats()["hedged"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert send.call_count == 1
+        assert policy.stats()["hedged"] == 0
+        policy.close()
+
+    def test_before_hedge_can_veto(self):
+        """测试 before_hedge 返回False时不对冲，也不消耗预算"""
+        policy = HedgingPolicy(initial_delay=0.01, budget=0, burst=1)
+        send = SlowThenFast()
+        threading.Timer(0.05, send.release.set).start()
+
+        assert policy.run("/a", send, before_hedge=lambda: False) == "slow"
+        assert send.calls == 1
+        assert policy.stats()["hedged"] == 0
+        assert policy._tokens == 1
+        policy.close()
+
+    def test_budget_caps_hedges(self):
+        """测试对冲预算用尽后不再对冲"""
+        policy = HedgingPolicy(initial_delay=0.01, budget=0, burst=1)
+        first = SlowThenFast()
+        assert policy.run("/a", first) == "fast"
+        assert first.calls == 2
+        first.release.set()
+
+        second = SlowThenFast()
+        threading.Timer(0.05, second.release.set).start()
+        assert policy.run("/a", second) == "slow"
+        assert second.calls == 1
+        assert policy.stats()["hedged"] == 1
+        policy.close()
+
+    def test_failed_attempt_falls_back(self):
+        """测试不成功的结果只在没有成功结果时返回"""
+        policy = HedgingPolicy(initial_delay=0.01)
+        send = SlowThenFast()
+        threading.Timer(0.1, send.release.set).start()
+
+        result = policy.run("/a", send, accept=lambda r: r == "slow")
+        assert result == "slow"
+        policy.close()
+
+    def test_exception_propagates(self):
+        """测试请求异常"""
+        policy = HedgingPolicy()
+
+        with pytest.raises(RuntimeError):
+            policy.run("/a", Mock(side_effect=RuntimeError("boom")))
+        policy.close()
+
+    def test_delay_uses_percentile(self):
+        """测试样本足够后使用百分位耗时"""
+        policy = HedgingPolicy(percentile=90, min_samples=10, initial_delay=5,
+                               max_delay=0.5)
+        assert policy.delay_for("/a") == 0.5
+        tracker = policy._tracker("/a")
+        for i in range(10):
+            tracker.add(0.01 * (i + 1))
+        assert policy.delay_for("/a") == pytest.approx(0.1)
+
+
+class TestClientHedging:
+    """测试客户端对冲"""
+
+    @patch('requests.Session.request')
+    def test_hedges_configured_endpoint(self, mock_request):
+        """测试只对配置的GET端点对冲"""
+        fast = Mock(status_code=200, headers={}, content=b'{"code": 200}')
+        slow = Mock(status_code=200, headers={}, content=b'{"code": 200}')
+        release = threading.Event()
+        calls = []
+
+        def fake_request(method, url, **kwargs):
+            calls.append(url)
+            if len(calls) == 1:
+                release.wait(5)
+                return slow
+            return fast
+
+        mock_request.side_effect = fake_request
+        policy = HedgingPolicy(initial_delay=0.02,
+                               endpoints=["/api/user/info/detail/{id}"])
+        client = CodeMaoClient(hedging=policy)
+
+        threading.Timer(0.1, release.set).start()
+        client.get_user(42)
+        assert len(calls) == 2
+
+        # 未配置的端点不对冲
+        calls.clear()
+        mock_request.side_effect = None
+        mock_request.return_value = fast
+        client.get_user_honor(42)
+        assert policy.stats()["requests"] == 1
+        policy.close()
+
+    @patch('requests.Session.request')
+    def test_hedge_takes_rate_limit_token(self, mock_request):
+        """测试对冲请求也占用限流令牌，没有令牌时不对冲"""
+        release = threading.Event()
+        calls = []
+
+        def fake_request(method, url, **kwargs):
+            calls.append(url)
+            if len(calls) == 1:
+                release.wait(5)
+            return Mock(status_code=200, headers={}, content=b'{"code": 200}')
+
+        mock_request.side_effect = fake_request
+        limiter = RateLimiter(rate=0.5, burst=1)
+        policy = HedgingPolicy(initial_delay=0.02)
+        client = CodeMaoClient(hedging=policy, rate_limiter=limiter)
+
+        threading.Timer(0.1, release.set).start()
+        client.get_user(42)
+        assert len(calls) == 1
+        assert policy.stats()["hedged"] == 0
+        policy.close()
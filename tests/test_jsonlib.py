@@ -0,0 +1,36 @@
+"""
+JSON解码器选择测试
+"""
+
+import json
+
+import pytest
+
+from codemaokit.jsonlib import get_loads, body_preview
+
+
+class TestJsonLib:
+    """测试JSON解码器"""
+
+    def test_stdlib_decoder(self):
+        """测试标准库解码器"""
+        assert get_loads("json") is json.loads
+
+    def test_auto_decoder_accepts_bytes(self):
+        """测试自动选择的解码器直接解码字节"""
+        loads = get_loads()
+        assert loads('{"items": [1, 2]}'.encode("utf-8")) == {"items": [1, 2]}
+        with pytest.raises(ValueError):
+            loads(b"<html>")
+
+    def test_unknown_decoder(self):
+        """测试未知解码器"""
+        with pytest.raises(ValueError, match="未知的JSON解码器"):
+            get_loads("simplejson")
+
+    def test_body_preview(self):
+        """测试响应体预览"""
+        assert body_preview(b"short") == "short"
+        preview = body_preview("错".encode("utf-8") * 100, limit=10)
+        assert preview.endswith("（共300字节）")
+        assert len(preview) < 20
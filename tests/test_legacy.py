@@ -0,0 +1,71 @@
+"""
+旧版 codemao 模块测试
+"""
+
+import importlib
+from unittest.mock import patch
+
+import pytest
+
+import codemao
+from codemaokit.testing import DEFAULT_PASSWORD, Dataset, FakeCodeMaoServer
+from codemaokit.testing.server import USER_ID_BASE
+
+BOARDS = "GET /web/forums/boards/simples/all"
+
+
+@pytest.fixture
+def server():
+    with FakeCodeMaoServer(Dataset(users=5, boards=3, posts_per_board=1)) as fake:
+        previous = codemao.BASE_URL
+        codemao.BASE_URL = fake.url
+        try:
+            yield fake
+        finally:
+            codemao.BASE_URL = previous
+
+
+class TestLegacyModule:
+    """旧版模块测试"""
+
+    def test_import_without_network(self):
+        """导入模块时不发请求"""
+        with patch("requests.Session.request", side_effect=AssertionError("不应发请求")):
+            importlib.reload(codemao)
+
+    def test_boards_loaded_once(self, server):
+        """板块列表第一次访问时加载，之后使用缓存"""
+        boards = codemao.board.boards
+        assert [b.name for b in boards] == [b["name"] for b in server.dataset.boards]
+        assert codemao.board().boards is boards
+        assert server.stats()["endpoints"][BOARDS] == 1
+
+        found = codemao.board().getBoardByName(boards[0].name)
+        assert found.id == boards[0].id
+
+    def test_shared_session_keeps_no_cookies(self, server):
+        """登录Cookie只属于各自的 user，不会留在共享会话中"""
+        logged_in = codemao.user("user1", DEFAULT_PASSWORD)
+        # 登录时用自己的Cookie请求了当前用户信息
+        assert logged_in.info.id == USER_ID_BASE + 1
+        assert len(codemao._session.cookies) == 0
+        assert codemao.another(USER_ID_BASE + 2).info.nickname == "用户2"
+
+    def test_stream_lists(self, server):
+        """流式获取的列表与服务器数据一致，load_lists=False 时不请求列表"""
+        user_id = USER_ID_BASE + 1
+        person = codemao.another(user_id, load_lists=False)
+        endpoints = server.stats()["endpoints"]
+        assert "GET /creation-tools/v1/user/fans" not in endpoints
+
+        dataset = server.dataset
+        assert [w.id for w in person.streamWorks()] == [w["id"] for w in dataset.works(user_id)]
+        assert [c.id for c in person.streamCollections()] == [
+            c["id"] for c in dataset.collections(user_id)
+        ]
+        assert [f.id for f in person.streamFollowers()] == [
+            f["id"] for f in dataset.follows("followers", user_id)
+        ]
+        assert [f.id for f in person.streamFans(limit=2)] == [
+            f["id"] for f in dataset.follows("fans", user_id)[:2]
+        ]
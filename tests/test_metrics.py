@@ -0,0 +1,161 @@
+"""
+客户端指标测试
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from codemaokit import CodeMaoClient
+from codemaokit.exceptions import ResourceNotFoundError
+from codemaokit.metrics import Histogram, MetricsRegistry
+from codemaokit.middleware import RequestContext
+from codemaokit.profile import SECTIONS
+from codemaokit.testing import Dataset, FakeCodeMaoServer
+from codemaokit.testing.server import USER_ID_BASE
+
+
+def response(status_code=200, body=b'{"code": 200}'):
+    mock = Mock()
+    mock.status_code = status_code
+    mock.headers = {}
+    mock.content = body
+    mock.request.body = b'{"a": 1}'
+    return mock
+
+
+class TestHistogram:
+    """测试直方图"""
+
+    def test_cumulative_buckets(self):
+        """测试累计分桶"""
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+        assert histogram.count == 4
+        assert histogram.sum == pytest.approx(3.65)
+
+
+class TestMetricsRegistry:
+    """测试指标注册表"""
+
+    def test_record_context(self):
+        """测试从上下文记录指标"""
+        metrics = MetricsRegistry(buckets=(1.0,))
+        context = RequestContext("GET", "/web/forums/boards/17")
+        context.timings.update(start=0.0, end=0.2)
+        context.attempts = 3
+        context.status_code = 200
+        context.bytes_in = 100
+        metrics.after_receive(context, {})
+
+        error_context = RequestContext("GET", "/web/forums/boards/18")
+        error_context.status_code = 404
+        metrics.on_error(error_context, ResourceNotFoundError("x"))
+
+        stats = metrics.snapshot()["GET /web/forums/boards/{id}"]
+        assert stats["requests"] == 2
+        assert stats["retries"] == 2
+        assert stats["bytes_in"] == 100
+        assert stats["statuses"] == {200: 1, 404: 1}
+        assert stats["errors"] == {"ResourceNotFoundError": 1}
+        assert stats["latency"]["count"] == 1
+        assert stats["latency"]["buckets"] == {"1.0": 1, "+Inf": 1}
+
+    def test_prometheus_format(self):
+        """测试 Prometheus 文本格式"""
+        metrics = MetricsRegistry(buckets=(0.5,))
+        context = RequestContext("GET", "/api/user/info/detail/42")
+        context.timings.update(start=0.0, end=0.25)
+        context.status_code = 200
+        metrics.after_receive(context, {})
+
+        text = metrics.to_prometheus()
+        labels = 'method="GET",endpoint="/api/user/info/detail/{id}"'
+        assert "# TYPE codemao_requests_total counter" in text
+        assert f"codemao_requests_total{{{labels}}} 1" in text
+        assert f'codemao_responses_total{{{labels},status="200"}} 1' in text
+        assert f'codemao_request_duration_seconds_bucket{{{labels},le="0.5"}} 1' in text
+        assert f'codemao_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+        assert f"codemao_request_duration_seconds_count{{{labels}}} 1" in text
+        assert text.endswith("\n")
+
+        metrics.reset()
+        assert metrics.snapshot() == {}
+
+
+class TestClientMetrics:
+    """测试客户端集成"""
+
+    @patch('requests.Session.request')
+    def test_client_records_calls(self, mock_request):
+        """测试客户端调用被记录"""
+        metrics = MetricsRegistry()
+        client = CodeMaoClient(metrics=metrics, max_retries=0)
+        mock_request.return_value = response()
+
+        client.get_user_honor(1)
+        mock_request.return_value = response(status_code=404)
+        with pytest.raises(ResourceNotFoundError):
+            client.get_user_honor(2)
+
+        stats = metrics.snapshot()["GET /creation-tools/v1/user/center/honor"]
+        assert stats["requests"] == 2
+        assert stats["statuses"] == {200: 1, 404: 1}
+        assert stats["errors"] == {"ResourceNotFoundError": 1}
+        assert stats["bytes_in"] == 2 * len(b'{"code": 200}')
+        assert stats["bytes_out"] == 2 * len(b'{"a": 1}')
+        assert client.middlewares[0] is metrics
+
+    @patch('requests.Session.request')
+    def test_stream_recorded(self, mock_request):
+        """测试流式列表请求被记录，字节数按实际读取计算"""
+        metrics = MetricsRegistry()
+        client = CodeMaoClient(metrics=metrics, max_retries=0)
+        body = b'{"items": [{"id": 1, "work_name": "a"}]}'
+        ok = response(body=body)
+        ok.iter_content.return_value = [body]
+        mock_request.return_value = ok
+
+        assert len(list(client.stream_user_works(1))) == 1
+        mock_request.return_value = response(status_code=404)
+        with pytest.raises(ResourceNotFoundError):
+            list(client.stream_user_works(2))
+
+        stats = metrics.snapshot()["GET /creation-tools/v1/user/center/work-list"]
+        assert stats["requests"] == 2
+        assert stats["statuses"] == {200: 1, 404: 1}
+        assert stats["errors"] == {"ResourceNotFoundError": 1}
+        assert stats["bytes_in"] == len(body)
+        assert stats["latency"]["count"] == 2
+
+    def test_profile_sections_recorded(self):
+        """测试用户资料的各个部分（包括流式列表）都被记录"""
+        metrics = MetricsRegistry()
+        with FakeCodeMaoServer(Dataset(users=3, boards=1, posts_per_board=1)) as server:
+            client = CodeMaoClient(base_url=server.url, metrics=metrics, max_retries=0)
+            try:
+                client.get_user_profile(USER_ID_BASE + 1, sections=SECTIONS)
+            finally:
+                client.session.close()
+
+        snapshot = metrics.snapshot()
+        for template in (
+            "/api/user/info/detail/{id}",
+            "/creation-tools/v1/user/center/honor",
+            "/creation-tools/v1/user/center/work-list",
+            "/creation-tools/v1/user/center/collect/list",
+            "/creation-tools/v1/user/followers",
+            "/creation-tools/v1/user/fans",
+        ):
+            stats = snapshot[f"GET {template}"]
+            assert stats["requests"] == 1
+            assert stats["statuses"] == {200: 1}
+
+    def test_disabled_by_default(self):
+        """测试默认不启用"""
+        client = CodeMaoClient()
+        assert client.metrics is None
+        assert client.middlewares == []
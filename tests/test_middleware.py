@@ -0,0 +1,247 @@
+"""
+中间件测试
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+
+from codemaokit import CodeMaoClient
+from codemaokit.exceptions import NetworkError
+from codemaokit.middleware import Middleware, RequestContext, run_chain, run_stream_chain
+
+
+class Recorder(Middleware):
+    """记录钩子调用顺序"""
+
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+
+    def before_send(self, context):
+        self.log.append(f"{self.name}.before")
+
+    def after_receive(self, context, data):
+        self.log.append(f"{self.name}.after")
+
+    def on_error(self, context, error):
+        self.log.append(f"{self.name}.error")
+
+
+def response(status_code=200, body=b'{"code": 200}'):
+    mock = Mock()
+    mock.status_code = status_code
+    mock.headers = {}
+    mock.content = body
+    return mock
+
+
+class TestRunChain:
+    """测试中间件链"""
+
+    def test_order(self):
+        """测试钩子调用顺序"""
+        log = []
+        chain = [Recorder("a", log), Recorder("b", log)]
+
+        assert run_chain(chain, RequestContext("GET", "/x"), lambda: {"ok": 1}) == {"ok": 1}
+        assert log == ["a.before", "b.before", "b.after", "a.after"]
+
+        log.clear()
+        with pytest.raises(RuntimeError):
+            run_chain(chain, RequestContext("GET", "/x"), Mock(side_effect=RuntimeError))
+        assert log == ["a.before", "b.before", "b.error", "a.error"]
+
+    def test_short_circuit_and_replace(self):
+        """测试直接返回响应和替换响应"""
+        class Stub(Middleware):
+            def before_send(self, context):
+                return {"stub": True}
+
+        class Wrap(Middleware):
+            def after_receive(self, context, data):
+                return {"wrapped": data}
+
+        call = Mock()
+        data = run_chain([Wrap(), Stub()], RequestContext("GET", "/x"), call)
+
+        assert data == {"wrapped": {"stub": True}}
+        call.assert_not_called()
+
+    def test_retry_in_on_error(self):
+        """测试在 on_error 中重新发送"""
+        class RetryOnce(Middleware):
+            def on_error(self, context, error):
+                if isinstance(error, NetworkError):
+                    return context.replay()
+
+        call = Mock(side_effect=[NetworkError("boom"), {"ok": 1}])
+        context = RequestContext("GET", "/x")
+
+        assert run_chain([RetryOnce()], context, call) == {"ok": 1}
+        assert context.error is None
+        assert call.call_count == 2
+
+    def test_stream_chain(self):
+        """测试流式调用在读完后调用 after_receive，提前停止时也调用"""
+        log = []
+        chain = [Recorder("a", log)]
+
+        assert list(run_stream_chain(chain, RequestContext("GET", "/x"),
+                                     lambda: iter([1, 2]))) == [1, 2]
+        assert log == ["a.before", "a.after"]
+
+        log.clear()
+        items = run_stream_chain(chain, RequestContext("GET", "/x"), lambda: iter([1, 2]))
+        assert next(items) == 1
+        items.close()
+        assert log == ["a.before", "a.after"]
+
+    def test_stream_chain_recovery(self):
+        """测试流式调用只在产出元素前从错误中恢复"""
+        class Fallback(Middleware):
+            def on_error(self, context, error):
+                return {"items": ["cached"]}
+
+        def broken():
+            raise NetworkError("boom")
+            yield
+
+        def half_read():
+            yield "first"
+            raise NetworkError("boom")
+
+        context = RequestContext("GET", "/x")
+        assert list(run_stream_chain([Fallback()], context, broken)) == ["cached"]
+        assert context.error is None
+
+        with pytest.raises(NetworkError):
+            list(run_stream_chain([Fallback()], RequestContext("GET", "/x"), half_read))
+
+
+class TestClientMiddleware:
+    """测试客户端中的中间件"""
+
+    @patch('requests.Session.request')
+    def test_headers_and_timings(self, mock_request):
+        """测试注入请求头并记录各阶段时间"""
+        contexts = []
+
+        class Trace(Middleware):
+            def before_send(self, context):
+                context.headers["X-Trace-Id"] = "abc"
+
+            def after_receive(self, context, data):
+                contexts.append(context)
+
+        mock_request.return_value = response()
+        client = CodeMaoClient(middlewares=[Trace()])
+
+        client.get_user_honor(1)
+
+        assert mock_request.call_args.kwargs['headers'] == {"X-Trace-Id": "abc"}
+        context = contexts[0]
+        assert context.template == "/creation-tools/v1/user/center/honor"
+        assert context.status_code == 200
+        assert context.attempts == 1
+        durations = context.durations()
+        for phase in ("queue", "ttfb", "download", "parse", "total"):
+            assert durations[phase] >= 0
+
+    @patch('requests.Session.request')
+    def test_error_hook(self, mock_request):
+        """测试请求失败时调用 on_error"""
+        errors = []
+
+        class Collect(Middleware):
+            def on_error(self, context, error):
+                errors.append((context.status_code, error))
+
+        mock_request.return_value = response(404)
+        client = CodeMaoClient()
+        client.add_middleware(Collect())
+
+        with pytest.raises(Exception):
+            client.get_user_honor(1)
+        assert errors[0][0] == 404
+
+    @patch('requests.Session.request')
+    def test_stream_passes_chain(self, mock_request):
+        """测试流式列表请求经过中间件链"""
+        contexts = []
+        errors = []
+
+        class Trace(Middleware):
+            def before_send(self, context):
+                context.headers["X-Trace-Id"] = "abc"
+
+            def after_receive(self, context, data):
+                contexts.append(context)
+
+            def on_error(self, context, error):
+                errors.append((context.status_code, error))
+
+        body = b'{"items": [{"id": 1, "nickname": "a"}, {"id": 2, "nickname": "b"}]}'
+        ok = response(body=body)
+        ok.iter_content.return_value = [body[:20], body[20:]]
+        mock_request.return_value = ok
+        client = CodeMaoClient(middlewares=[Trace()])
+
+        assert [f.id for f in client.stream_fans(1)] == [1, 2]
+        assert mock_request.call_args.kwargs['headers'] == {"X-Trace-Id": "abc"}
+        context = contexts[0]
+        assert context.template == "/creation-tools/v1/user/fans"
+        assert context.status_code == 200
+        assert context.bytes_in == len(body)
+        assert "total" in context.durations()
+
+        mock_request.return_value = response(404)
+        with pytest.raises(Exception):
+            list(client.stream_fans(1))
+        assert errors[0][0] == 404
+
+
+class TestConnectTiming:
+    """测试建立连接的计时"""
+
+    def test_real_connection(self):
+        """测试新建连接时记录 connect 阶段，复用连接时不记录"""
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                body = json.dumps({"code": 200}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        contexts = []
+
+        class Collect(Middleware):
+            def after_receive(self, context, data):
+                contexts.append(context)
+
+        client = CodeMaoClient(middlewares=[Collect()])
+        client.BASE_URL = f"http://127.0.0.1:{server.server_port}"
+        try:
+            client.get_user_honor(1)
+            client.get_user_honor(2)
+        finally:
+            client.session.close()
+            server.shutdown()
+            server.server_close()
+
+        assert contexts[0].durations()["connect"] >= 0
+        assert "connect" not in contexts[1].durations()
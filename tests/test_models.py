@@ -304,4 +304,36 @@ class TestUserHonor:
         
         assert honor.id == "honor_123"
         assert honor.name == "优秀创作者"
-        assert honor.level == 1
\ No newline at end of file
+        assert honor.level == 1
+
+
+class TestCollection:
+    """测试收藏作品模型"""
+    
+    def test_collection_from_dict(self):
+        """测试从字典创建收藏作品"""
+        from codemaokit.models import Collection
+        
+        collection = Collection.from_dict({
+            'id': 1, 'name': '作品', 'preview': 'p.png',
+            'user_id': 2, 'views_count': 10
+        })
+        
+        assert collection.id == 1
+        assert collection.name == '作品'
+        assert collection.views_count == 10
+        assert collection.is_deleted is False
+
+
+class TestFollower:
+    """测试关注/粉丝用户模型"""
+    
+    def test_follower_from_dict(self):
+        """测试从字典创建关注用户"""
+        from codemaokit.models import Follower
+        
+        follower = Follower.from_dict({'id': 1, 'nickname': '粉丝', 'total_likes': 5})
+        
+        assert follower.nickname == '粉丝'
+        assert follower.total_likes == 5
+        assert follower.n_works == 0
@@ -0,0 +1,133 @@
+"""
+分页列表迭代器测试
+"""
+
+import itertools
+import time
+
+import pytest
+
+from codemaokit import CodeMaoClient
+from codemaokit.exceptions import NetworkError
+from codemaokit.pagination import PageIterator
+from codemaokit.testing import Dataset, FakeCodeMaoServer
+from codemaokit.testing.server import USER_ID_BASE
+
+WORKS = "GET /creation-tools/v1/user/center/work-list"
+
+
+@pytest.fixture
+def dataset():
+    return Dataset(users=20, boards=1, posts_per_board=1, max_works=60, max_follows=100)
+
+
+@pytest.fixture
+def user_id(dataset):
+    # 作品最多的用户，保证有多页
+    return max((USER_ID_BASE + i for i in range(1, 21)),
+               key=lambda uid: len(dataset.works(uid)))
+
+
+@pytest.fixture
+def server(dataset):
+    with FakeCodeMaoServer(dataset) as fake:
+        yield fake
+
+
+@pytest.fixture
+def client(server):
+    client = CodeMaoClient(base_url=server.url, max_retries=0)
+    yield client
+    client.session.close()
+
+
+def _pages(items, page_size, fail_at=None):
+    """按 offset/limit 切片的页面函数，fail_at 页第一次请求时失败"""
+    calls = []
+
+    def fetch_page(offset, limit):
+        calls.append(offset)
+        if offset == fail_at and calls.count(offset) == 1:
+            raise NetworkError("网络请求失败")
+        return {"items": items[offset:offset + limit], "total": len(items)}
+    return fetch_page, calls
+
+
+class TestPageIterator:
+    """分页迭代器测试"""
+
+    def test_all_pages(self):
+        """逐页产出所有元素，不多请求空页"""
+        fetch_page, calls = _pages(list(range(25)), 10)
+        assert list(PageIterator(fetch_page, lambda x: x, page_size=10)) == list(range(25))
+        assert calls == [0, 10, 20]
+
+    def test_cursor_resume(self):
+        """从 cursor 继续得到剩余元素"""
+        fetch_page, _ = _pages(list(range(25)), 10)
+        first = PageIterator(fetch_page, lambda x: x, page_size=10)
+        head = list(itertools.islice(first, 13))
+        first.close()
+        assert first.cursor == 13
+        rest = list(PageIterator(fetch_page, lambda x: x, cursor=first.cursor, page_size=10))
+        assert head + rest == list(range(25))
+
+    def test_failed_page_keeps_cursor(self):
+        """预取的页失败时在取到该页时抛出，重试后继续"""
+        fetch_page, _ = _pages(list(range(25)), 10, fail_at=10)
+        pages = PageIterator(fetch_page, lambda x: x, page_size=10)
+        assert list(itertools.islice(pages, 10)) == list(range(10))
+        with pytest.raises(NetworkError):
+            next(pages)
+        assert pages.cursor == 10
+        assert list(pages) == list(range(10, 25))
+
+    def test_invalid_page_size(self):
+        """页大小必须大于0"""
+        with pytest.raises(ValueError):
+            PageIterator(lambda offset, limit: {}, lambda x: x, page_size=0)
+
+
+class TestClientPagination:
+    """客户端分页方法测试"""
+
+    def test_iter_user_works(self, server, client, dataset, user_id):
+        """作品列表不再截断在一页"""
+        expected = [w["id"] for w in dataset.works(user_id)]
+        works = client.iter_user_works(user_id, page_size=7)
+        assert [w.id for w in works] == expected
+        assert works.pages == -(-len(expected) // 7)
+        assert server.stats()["endpoints"][WORKS] == works.pages
+
+    def test_all_lists(self, client, dataset, user_id):
+        """收藏、关注和粉丝列表"""
+        assert len(list(client.iter_user_collections(user_id, page_size=9))) == \
+            len(dataset.collections(user_id))
+        assert [f.id for f in client.iter_followers(user_id, page_size=9)] == \
+            [f["id"] for f in dataset.follows("followers", user_id)]
+        assert [f.id for f in client.iter_fans(user_id, page_size=9)] == \
+            [f["id"] for f in dataset.follows("fans", user_id)]
+
+    def test_prefetch_next_page(self, server, client, user_id):
+        """处理当前页时下一页已在后台请求"""
+        with client.iter_user_works(user_id, page_size=5) as works:
+            next(works)
+            give_up_at = time.monotonic() + 5
+            while server.stats()["endpoints"][WORKS] < 2:
+                assert time.monotonic() < give_up_at, "没有预取下一页"
+                time.sleep(0.01)
+
+        with client.iter_user_works(user_id, page_size=5, prefetch=False) as works:
+            server.reset_stats()
+            next(works)
+            time.sleep(0.05)
+            assert server.stats()["endpoints"][WORKS] == 1
+
+    def test_resume_from_cursor(self, client, dataset, user_id):
+        """用 cursor 恢复中断的迭代"""
+        expected = [w["id"] for w in dataset.works(user_id)]
+        works = client.iter_user_works(user_id, page_size=10)
+        head = [w.id for w in itertools.islice(works, 15)]
+        works.close()
+        rest = [w.id for w in client.iter_user_works(user_id, cursor=works.cursor)]
+        assert head + rest == expected
@@ -0,0 +1,141 @@
+"""
+会话池测试
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from codemaokit import CodeMaoClient, RateLimitError
+from codemaokit.exceptions import AuthenticationError
+from codemaokit.pool import ACTIVE, COOLDOWN, RELOGIN, SessionPool
+from codemaokit.testing import DEFAULT_PASSWORD, Dataset, FakeCodeMaoServer
+
+
+@pytest.fixture
+def server():
+    with FakeCodeMaoServer(Dataset(users=10, boards=2, posts_per_board=1)) as fake:
+        yield fake
+
+
+def _pool(server, accounts, **kwargs):
+    def factory():
+        return CodeMaoClient(base_url=server.url, max_retries=0)
+
+    kwargs.setdefault("relogin_delay", 0.01)
+    return SessionPool(accounts, client_factory=factory, **kwargs)
+
+
+def _accounts(count):
+    return [(f"user{i + 1}", DEFAULT_PASSWORD) for i in range(count)]
+
+
+def _wait_for(predicate, timeout=5.0):
+    give_up_at = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < give_up_at, "等待超时"
+        time.sleep(0.01)
+
+
+class TestSessionPool:
+    """会话池测试"""
+
+    def test_start_logs_in_all_accounts(self, server):
+        """启动时登录所有账号"""
+        with _pool(server, _accounts(3)) as pool:
+            assert [s["state"] for s in pool.stats()] == [ACTIVE] * 3
+            assert all(s.client.is_authenticated for s in pool.sessions)
+
+    def test_logs_in_on_first_acquire(self, server):
+        """没有调用 start 时第一次取出账号前登录"""
+        pool = _pool(server, _accounts(2))
+        try:
+            assert pool.call("get_current_user").nickname in ("用户1", "用户2")
+            assert [s["state"] for s in pool.stats()] == [ACTIVE] * 2
+            pool.call("get_current_user")
+            assert server.stats()["endpoints"]["POST /tiger/v3/web/accounts/login"] == 2
+        finally:
+            pool.close()
+
+    def test_close_closes_clients(self, server):
+        """关闭会话池时关闭每个客户端"""
+        pool = _pool(server, _accounts(2))
+        with patch.object(CodeMaoClient, "close", autospec=True) as close:
+            pool.close()
+        assert [c.args[0] for c in close.call_args_list] == [s.client for s in pool.sessions]
+
+    def test_round_robin(self, server):
+        """轮转策略依次使用每个账号"""
+        with _pool(server, _accounts(3), policy="round_robin") as pool:
+            users = [pool.call("get_current_user").nickname for _ in range(6)]
+        assert users == ["用户1", "用户2", "用户3"] * 2
+
+    def test_least_loaded(self, server):
+        """最少负载策略避开正在使用的账号"""
+        with _pool(server, _accounts(2)) as pool:
+            with pool.session() as first:
+                with pool.session() as second:
+                    assert first is not second
+            assert [s["in_flight"] for s in pool.stats()] == [0, 0]
+
+    def test_rate_limited_session_cools_down(self, server):
+        """被限流的账号暂停到 retry_after 之后"""
+        with _pool(server, _accounts(2), policy="round_robin") as pool:
+            with pytest.raises(RateLimitError):
+                with pool.session():
+                    raise RateLimitError("请求过于频繁", retry_after=0.2)
+            assert pool.sessions[0].state == COOLDOWN
+            assert pool.call("get_current_user").nickname == "用户2"
+            assert pool.call("get_current_user").nickname == "用户2"
+
+            time.sleep(0.25)
+            assert pool.stats()[0]["state"] == ACTIVE
+            assert pool.stats()[0]["rate_limited"] == 1
+
+    def test_all_rate_limited(self, server):
+        """所有账号都被限流时抛出 RateLimitError"""
+        with _pool(server, _accounts(1)) as pool:
+            with pytest.raises(RateLimitError):
+                with pool.session():
+                    raise RateLimitError("请求过于频繁", retry_after=30)
+            with pytest.raises(RateLimitError) as exc_info:
+                pool.acquire(timeout=0)
+            assert 0 < exc_info.value.retry_after <= 30
+
+    def test_authentication_error_triggers_relogin(self, server):
+        """认证失效的账号移出轮转并在后台重新登录"""
+        with _pool(server, _accounts(2), relogin_delay=0.05) as pool:
+            session = pool.sessions[0]
+            with pytest.raises(AuthenticationError):
+                with pool.session():
+                    raise AuthenticationError("认证失败，请重新登录")
+            assert session.state == RELOGIN
+            assert pool.call("get_current_user").nickname == "用户2"
+
+            _wait_for(lambda: session.state == ACTIVE)
+            assert session.client.is_authenticated
+            assert pool.stats()[0]["auth_failures"] == 1
+
+    def test_failed_login_retries_in_background(self, server):
+        """启动时登录失败的账号不影响其他账号，修正后重新登录"""
+        accounts = [("user1", "wrong-password"), ("user2", DEFAULT_PASSWORD)]
+        with _pool(server, accounts) as pool:
+            assert [s["state"] for s in pool.stats()] == [RELOGIN, ACTIVE]
+            assert pool.call("get_current_user").nickname == "用户2"
+
+            pool.sessions[0].password = DEFAULT_PASSWORD
+            _wait_for(lambda: pool.sessions[0].state == ACTIVE)
+
+    def test_no_logged_in_account(self, server):
+        """没有已登录的账号时抛出 AuthenticationError"""
+        with _pool(server, [("user1", "wrong-password")], relogin_delay=60) as pool:
+            with pytest.raises(AuthenticationError):
+                pool.acquire(timeout=0.05)
+
+    def test_invalid_arguments(self):
+        """无效参数"""
+        with pytest.raises(ValueError):
+            SessionPool([])
+        with pytest.raises(ValueError):
+            SessionPool([("user1", "pass")], policy="random")
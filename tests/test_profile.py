@@ -0,0 +1,82 @@
+"""
+用户资料测试
+"""
+
+import time
+
+import pytest
+
+from codemaokit import CodeMaoClient
+from codemaokit.exceptions import ResourceNotFoundError
+from codemaokit.profile import SECTIONS
+from codemaokit.testing import Dataset, FakeCodeMaoServer
+from codemaokit.testing.server import USER_ID_BASE
+
+USER_ID = USER_ID_BASE + 1
+LATENCY = 0.05
+
+
+@pytest.fixture
+def server():
+    dataset = Dataset(users=5, boards=1, posts_per_board=1)
+    with FakeCodeMaoServer(dataset, latency=LATENCY) as fake:
+        yield fake
+
+
+@pytest.fixture
+def client(server):
+    client = CodeMaoClient(base_url=server.url, max_retries=0)
+    yield client
+    client.session.close()
+
+
+class TestUserProfile:
+    """用户资料测试"""
+
+    def test_sections_loaded_concurrently(self, server, client):
+        """选择的部分并发加载，耗时接近单个请求"""
+        started = time.monotonic()
+        profile = client.get_user_profile(USER_ID, sections=SECTIONS)
+        elapsed = time.monotonic() - started
+
+        assert profile.loaded == frozenset(SECTIONS)
+        assert elapsed < LATENCY * len(SECTIONS) / 2
+        assert server.stats()["requests"] == len(SECTIONS)
+        assert profile.user.id == USER_ID
+        assert len(profile.works) == len(server.dataset.works(USER_ID))
+        assert server.stats()["requests"] == len(SECTIONS)
+
+    def test_other_sections_load_lazily(self, server, client):
+        """未选择的部分在第一次访问时请求一次"""
+        profile = client.get_user_profile(USER_ID, sections=["honor"])
+        assert profile.loaded == {"honor"}
+        assert server.stats()["requests"] == 1
+
+        fans = profile.fans
+        assert profile.fans is fans
+        assert profile.loaded == {"honor", "fans"}
+        assert server.stats()["requests"] == 2
+
+    def test_list_limit_marks_truncated(self, server, client):
+        """列表部分按 limit 截取，达到上限的部分标记为 truncated"""
+        followers = server.dataset.follows("followers", USER_ID)
+        works = server.dataset.works(USER_ID)
+        limit = len(works) + 1
+        assert len(followers) > limit
+
+        profile = client.get_user_profile(USER_ID, sections=["works", "followers"], limit=limit)
+
+        assert len(profile.followers) == limit
+        assert len(profile.works) == len(works)
+        assert profile.truncated == {"followers"}
+        assert client.get_user_profile(USER_ID, sections=["honor"]).truncated == frozenset()
+
+    def test_unknown_section(self, client):
+        """未知的部分名称"""
+        with pytest.raises(ValueError):
+            client.get_user_profile(USER_ID, sections=["user", "friends"])
+
+    def test_missing_user(self, client):
+        """用户不存在时抛出 ResourceNotFoundError"""
+        with pytest.raises(ResourceNotFoundError):
+            client.get_user_profile(USER_ID_BASE + 999, sections=["user", "honor"])
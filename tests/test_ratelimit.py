@@ -0,0 +1,97 @@
+"""
+限流器测试
+"""
+
+import pytest
+
+from codemaokit.ratelimit import TokenBucket, RateLimiter
+from codemaokit.exceptions import RateLimitError
+from codemaokit.utils import endpoint_group, parse_retry_after
+
+pytestmark = pytest.mark.clock(
+    "codemaokit.ratelimit.time.monotonic",
+    "codemaokit.ratelimit.time.sleep",
+)
+
+
+class TestTokenBucket:
+    """测试令牌桶"""
+
+    def test_burst_then_pace(self, clock):
+        """测试突发后按速率放行"""
+        bucket = TokenBucket(rate=2, capacity=2)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.5)
+
+    def test_refill(self, clock):
+        """测试令牌补充"""
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.reserve()
+        clock.now += 1
+        assert bucket.reserve() == 0
+
+    def test_pause(self, clock):
+        """测试暂停发放令牌"""
+        bucket = TokenBucket(rate=10, capacity=10)
+        bucket.pause(3)
+
+        assert bucket.reserve() == pytest.approx(3)
+        assert bucket.reserve() == pytest.approx(3.1)
+
+    def test_invalid_rate(self):
+        """测试无效速率"""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestRateLimiter:
+    """测试客户端限流器"""
+
+    def test_group_and_client_buckets(self, clock):
+        """测试客户端与分组同时限流"""
+        limiter = RateLimiter(rate=100, group_rates={"forums": (1, 1)})
+
+        assert limiter.acquire("forums") == 0
+        assert limiter.acquire("forums") == pytest.approx(1)
+        assert clock.slept == [pytest.approx(1)]
+        # 其他分组只受客户端总速率限制
+        assert limiter.acquire("users") == 0
+
+    def test_max_wait(self, clock):
+        """测试超过最长等待时间时抛出异常"""
+        limiter = RateLimiter(rate=1, burst=1, max_wait=0.5)
+        limiter.acquire()
+
+        with pytest.raises(RateLimitError) as exc_info:
+            limiter.acquire()
+
+        assert exc_info.value.retry_after == pytest.approx(1)
+        assert clock.slept == []
+
+    def test_backoff_uses_retry_after(self, clock):
+        """测试根据 Retry-After 退避"""
+        limiter = RateLimiter(rate=100, default_backoff=2)
+
+        assert limiter.backoff("forums", 5) == 5
+        assert limiter.acquire("forums") == pytest.approx(5)
+        assert limiter.backoff("forums") == 2
+
+
+class TestRateLimitUtils:
+    """测试限流相关工具函数"""
+
+    def test_endpoint_group(self):
+        """测试端点分组"""
+        assert endpoint_group("/web/forums/boards/1") == "forums"
+        assert endpoint_group("/tiger/v3/web/accounts/login") == "accounts"
+        assert endpoint_group("/api/user/info/detail/1") == "users"
+        assert endpoint_group("/unknown") == "default"
+
+    def test_parse_retry_after(self):
+        """测试解析 Retry-After"""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("invalid") is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
@@ -0,0 +1,179 @@
+"""
+本地模拟服务器测试
+"""
+
+import threading
+
+import pytest
+
+from codemaokit import CodeMaoClient, RateLimitError
+from codemaokit.exceptions import AuthenticationError, NetworkError, ResourceNotFoundError
+from codemaokit.testing import DEFAULT_PASSWORD, Dataset, FakeCodeMaoServer
+from codemaokit.testing.server import USER_ID_BASE
+
+
+@pytest.fixture
+def server():
+    with FakeCodeMaoServer(Dataset(users=50, boards=4, posts_per_board=3, seed=1)) as fake:
+        yield fake
+
+
+@pytest.fixture
+def client(server):
+    client = CodeMaoClient(base_url=server.url, max_retries=0)
+    yield client
+    client.session.close()
+
+
+class TestDataset:
+    """合成数据集测试"""
+
+    def test_deterministic(self):
+        """相同种子生成相同数据"""
+        a, b = Dataset(users=10, seed=3), Dataset(users=10, seed=3)
+        user_id = a.user_id(5)
+        assert a.user(user_id) == b.user(user_id)
+        assert a.works(user_id) == b.works(user_id)
+        assert a.follows("fans", user_id) == b.follows("fans", user_id)
+
+    def test_follow_counts_match_lists(self):
+        """荣誉信息中的关注数和粉丝数与列表长度一致"""
+        dataset = Dataset(users=20, seed=2)
+        for index in range(1, 6):
+            user_id = dataset.user_id(index)
+            honor = dataset.honor(user_id)
+            assert honor["attention_total"] == len(dataset.follows("followers", user_id))
+            assert honor["fans_total"] == len(dataset.follows("fans", user_id))
+
+    def test_find_user(self):
+        """按用户名、邮箱和手机号查找用户"""
+        dataset = Dataset(users=10)
+        assert dataset.find_user("user3") == USER_ID_BASE + 3
+        assert dataset.find_user("user3@example.com") == USER_ID_BASE + 3
+        assert dataset.find_user("13800000003") == USER_ID_BASE + 3
+        assert dataset.find_user("user11") is None
+        assert dataset.find_user("someone") is None
+
+
+class TestFakeCodeMaoServer:
+    """模拟服务器测试"""
+
+    def test_public_endpoints(self, server, client):
+        """未登录即可访问的接口"""
+        boards = client.get_boards()
+        assert [board.name for board in boards] == ["板块1", "板块2", "板块3", "板块4"]
+        assert client.get_board_by_id("2").n_posts == 3
+
+        user_id = USER_ID_BASE + 7
+        assert client.get_user(user_id).username == "user7"
+        assert client.get_user_honor(user_id).fans_total == len(
+            server.dataset.follows("fans", user_id)
+        )
+        works = list(client.stream_user_works(user_id, limit=1000))
+        assert len(works) == len(server.dataset.works(user_id))
+
+        with pytest.raises(ResourceNotFoundError):
+            client.get_user(USER_ID_BASE + 999)
+
+    def test_login_and_posts(self, server, client):
+        """登录后发帖、回帖和删帖"""
+        with pytest.raises(AuthenticationError):
+            client.login("user1", "wrong-password")
+
+        user = client.login("user1", DEFAULT_PASSWORD)
+        assert user.id == USER_ID_BASE + 1
+        info = client._request("GET", "/api/user/info")
+        assert info["data"]["userInfo"]["email"] == "user1@example.com"
+        assert client.get_message_stats().system >= 0
+
+        post_id = client.create_post("测试帖子标题", "这是一段足够长的帖子内容", "板块1")
+        assert server.dataset.posts[post_id]["author_id"] == user.id
+        assert client.reply_to_post(post_id, "回复内容")
+        client.delete_post(post_id)
+        assert post_id not in server.dataset.posts
+
+        client.update_user_info(nickname="新昵称")
+        assert client.get_user(user.id).nickname == "新昵称"
+
+    def test_requires_login(self, server, client):
+        """未登录访问需要认证的接口返回401"""
+        with pytest.raises(AuthenticationError):
+            client._request("GET", "/web/message-record/count")
+        assert server.stats()["statuses"] == {401: 1}
+
+    def test_error_rate(self, server, client):
+        """注入服务器错误"""
+        server.error_rate = 1.0
+        with pytest.raises(NetworkError):
+            client.get_boards()
+        stats = server.stats()
+        assert stats["injected_errors"] == 1
+        assert set(stats["statuses"]) <= {500, 503}
+
+    def test_rate_limit(self, server, client):
+        """超出限流时返回429和 Retry-After"""
+        server.rate_limit = 0.5
+        server.burst = server._tokens = 2
+        client.get_user(USER_ID_BASE + 1)
+        client.get_user(USER_ID_BASE + 2)
+        with pytest.raises(RateLimitError) as exc_info:
+            client.get_user(USER_ID_BASE + 3)
+        assert exc_info.value.retry_after == 2
+        assert server.stats()["throttled"] == 1
+
+    def test_invalid_rate_limit(self):
+        """限流速率必须大于0"""
+        for rate_limit in (0, -1):
+            with pytest.raises(ValueError, match="rate_limit"):
+                FakeCodeMaoServer(rate_limit=rate_limit)
+
+    def test_concurrent_delete_and_reply(self, server, client):
+        """同时删帖和回帖时回帖返回404，不会断开连接"""
+        client.login("user1", DEFAULT_PASSWORD)
+        replier = CodeMaoClient(base_url=server.url, max_retries=0)
+        replier.login("user2", DEFAULT_PASSWORD)
+        post_ids = [
+            client.create_post("测试帖子标题", "这是一段足够长的帖子内容", "板块1")
+            for _ in range(20)
+        ]
+        errors = []
+
+        def reply(post_id):
+            try:
+                replier.reply_to_post(post_id, "回复内容")
+            except ResourceNotFoundError:
+                pass
+            except Exception as e:
+                errors.append(e)
+
+        try:
+            for post_id in post_ids:
+                thread = threading.Thread(target=reply, args=(post_id,))
+                thread.start()
+                client.delete_post(post_id)
+                thread.join()
+        finally:
+            replier.session.close()
+        assert errors == []
+        assert not set(post_ids) & set(server.dataset.posts)
+
+    def test_conditional_requests(self, server):
+        """GET响应带 ETag，未修改时返回304"""
+        client = CodeMaoClient(base_url=server.url, conditional_requests=True)
+        try:
+            first = client._request("GET", "/web/forums/boards/simples/all")
+            second = client._request("GET", "/web/forums/boards/simples/all")
+        finally:
+            client.session.close()
+        assert first == second
+        assert server.stats()["statuses"] == {200: 1, 304: 1}
+
+    def test_stats_by_endpoint(self, server, client):
+        """按端点模板统计请求数"""
+        client.get_user(USER_ID_BASE + 1)
+        client.get_user(USER_ID_BASE + 2)
+        stats = server.stats()
+        assert stats["requests"] == 2
+        assert stats["endpoints"] == {"GET /api/user/info/detail/{id}": 2}
+        server.reset_stats()
+        assert server.stats()["requests"] == 0
@@ -0,0 +1,181 @@
+"""
+登录状态持久化测试
+"""
+
+import json
+import os
+import stat
+import threading
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from codemaokit import CodeMaoClient
+from codemaokit.exceptions import AuthenticationError
+from codemaokit.sessionfile import read_session_file, write_session_file
+from codemaokit.testing import DEFAULT_PASSWORD, Dataset, FakeCodeMaoServer
+
+LOGIN = "POST /tiger/v3/web/accounts/login"
+
+
+@pytest.fixture
+def server():
+    with FakeCodeMaoServer(Dataset(users=5, boards=1, posts_per_board=1)) as fake:
+        yield fake
+
+
+@pytest.fixture
+def make_client(server):
+    clients = []
+
+    def _make(**kwargs):
+        client = CodeMaoClient(base_url=server.url, max_retries=0, **kwargs)
+        clients.append(client)
+        return client
+
+    yield _make
+    for client in clients:
+        client.session.close()
+
+
+class TestSessionFile:
+    """状态文件读写测试"""
+
+    @pytest.mark.skipif(os.name != "posix", reason="文件权限仅在POSIX系统上检查")
+    def test_file_is_private(self, tmp_path):
+        """文件只有所有者可读写"""
+        path = tmp_path / "session.json"
+        write_session_file(str(path), {"token": "t"})
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        assert read_session_file(str(path))["token"] == "t"
+
+    def test_missing_corrupt_and_expired(self, tmp_path):
+        """文件不存在、损坏或过期时返回None"""
+        path = tmp_path / "session.json"
+        assert read_session_file(str(path)) is None
+        path.write_text("{not json", encoding="utf-8")
+        assert read_session_file(str(path)) is None
+        path.write_text(json.dumps({"version": 999}), encoding="utf-8")
+        assert read_session_file(str(path)) is None
+
+        write_session_file(str(path), {"token": "t"})
+        assert read_session_file(str(path), max_age=60) is not None
+        assert read_session_file(str(path), max_age=-1) is None
+
+    def test_concurrent_writes(self, tmp_path):
+        """多个线程同时写入同一个文件时互不干扰，也不留下临时文件"""
+        path = str(tmp_path / "session.json")
+        errors = []
+
+        def write(i):
+            try:
+                for _ in range(20):
+                    write_session_file(path, {"token": str(i)})
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert read_session_file(path)["token"] in {str(i) for i in range(8)}
+        assert os.listdir(tmp_path) == ["session.json"]
+
+
+class TestSessionPersistence:
+    """客户端保存与恢复登录状态测试"""
+
+    def test_save_requires_login(self, tmp_path):
+        """未登录时不能保存"""
+        with pytest.raises(AuthenticationError):
+            CodeMaoClient().save_session(str(tmp_path / "session.json"))
+
+    def test_restore_without_login_request(self, server, make_client, tmp_path):
+        """恢复后不再登录即可调用需要认证的接口"""
+        path = str(tmp_path / "session.json")
+        first = make_client()
+        user = first.login("user2", DEFAULT_PASSWORD)
+        first.save_session(path)
+        server.reset_stats()
+
+        second = make_client()
+        assert second.restore_session(path) is True
+        assert second.is_authenticated
+        assert second.auth_token == first.auth_token
+        assert second.get_current_user() == user
+        # 恢复本身不发请求
+        assert server.stats()["requests"] == 0
+
+        assert second.get_message_stats() is not None
+        assert LOGIN not in server.stats()["endpoints"]
+
+    def test_stale_session_detected_on_first_use(self, tmp_path):
+        """服务器端会话失效时，第一个需要认证的请求标记为未登录"""
+        path = str(tmp_path / "session.json")
+        with FakeCodeMaoServer(Dataset(users=5, boards=1, posts_per_board=1)) as old:
+            client = CodeMaoClient(base_url=old.url)
+            client.login("user1", DEFAULT_PASSWORD)
+            client.save_session(path)
+            client.session.close()
+            old_url = old.url
+
+        with FakeCodeMaoServer(Dataset(users=5, boards=1, posts_per_board=1)) as new:
+            # 新服务器没有旧的会话，保存的地址需要一致
+            document = json.loads(open(path, encoding="utf-8").read())
+            assert document["base_url"] == old_url
+            document["base_url"] = new.url
+            write_session_file(path, document)
+
+            client = CodeMaoClient(base_url=new.url)
+            try:
+                assert client.restore_session(path) is True
+                with pytest.raises(AuthenticationError):
+                    client.get_message_stats()
+                assert client.is_authenticated is False
+            finally:
+                client.session.close()
+
+    def test_validate_on_restore(self, server, make_client, tmp_path):
+        """validate=True 时立即验证会话"""
+        path = str(tmp_path / "session.json")
+        first = make_client()
+        first.login("user1", DEFAULT_PASSWORD)
+        first.save_session(path)
+        assert make_client().restore_session(path, validate=True) is True
+
+        first.logout()
+        document = read_session_file(path)
+        for cookie in document["cookies"]:
+            cookie["value"] = "expired"
+        write_session_file(path, document)
+        client = make_client()
+        assert client.restore_session(path, validate=True) is False
+        assert client.is_authenticated is False
+
+    def test_validate_network_error(self, server, make_client, tmp_path):
+        """验证请求网络失败时返回False，不抛出异常"""
+        path = str(tmp_path / "session.json")
+        first = make_client()
+        first.login("user1", DEFAULT_PASSWORD)
+        first.save_session(path)
+
+        client = make_client()
+        with patch("requests.Session.request",
+                   side_effect=requests.exceptions.ConnectionError("down")):
+            assert client.restore_session(path, validate=True) is False
+        assert client.is_authenticated is False
+
+    def test_other_base_url_not_restored(self, server, make_client, tmp_path):
+        """其他 base_url 保存的文件不恢复"""
+        path = str(tmp_path / "session.json")
+        client = make_client()
+        client.login("user1", DEFAULT_PASSWORD)
+        client.save_session(path)
+
+        other = CodeMaoClient()
+        assert other.restore_session(path) is False
+        assert other.is_authenticated is False
@@ -0,0 +1,84 @@
+"""
+请求合并测试
+"""
+
+import threading
+import time
+
+from codemaokit.singleflight import SingleFlight
+
+
+def wait_for(predicate, timeout=2.0):
+    """等待条件成立"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("等待超时")
+        time.sleep(0.001)
+
+
+class TestSingleFlight:
+    """测试请求合并"""
+
+    def test_concurrent_calls_share_result(self):
+        """测试并发调用共享结果"""
+        group = SingleFlight()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def fn():
+            calls.append(1)
+            release.wait()
+            return {"id": 1}
+
+        def worker():
+            results.append(group.do("key", fn))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        wait_for(lambda: "key" in group._calls and group._calls["key"].waiters == 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(result is results[0][0] for result, _ in results)
+        assert sorted(shared for _, shared in results) == [True] * 5
+        assert group.in_flight() == 0
+
+    def test_error_is_shared(self):
+        """测试异常传递给所有等待者"""
+        group = SingleFlight()
+        release = threading.Event()
+        errors = []
+
+        def fn():
+            release.wait()
+            raise ValueError("失败")
+
+        def worker():
+            try:
+                group.do("key", fn)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        wait_for(lambda: "key" in group._calls and group._calls["key"].waiters == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 3
+        assert group.in_flight() == 0
+
+    def test_sequential_calls_not_cached(self):
+        """测试调用完成后不缓存结果"""
+        group = SingleFlight()
+        counter = iter(range(10))
+
+        assert group.do("key", lambda: next(counter)) == (0, False)
+        assert group.do("key", lambda: next(counter)) == (1, False)
@@ -0,0 +1,64 @@
+"""
+流式解析测试
+"""
+
+import json
+
+import pytest
+
+from codemaokit.streaming import ItemStreamParser, iter_items
+
+
+def split(data, size):
+    """按固定大小切分字节"""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestItemStreamParser:
+    """测试增量解析"""
+
+    DOC = {
+        "total": 4,
+        "meta": {"items": [0]},
+        "note": "items",
+        "items": [
+            {"id": 1, "text": "转义\"引号\\和]},{符号", "nested": [1, {"k": "}"}]},
+            {"id": 2, "work_name": "作品"},
+            "字符串,]",
+            None,
+        ],
+        "after": [9],
+    }
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 4096])
+    def test_any_chunking(self, size):
+        """测试任意分块都能得到相同结果"""
+        raw = json.dumps(self.DOC, ensure_ascii=False).encode("utf-8")
+        assert list(iter_items(split(raw, size))) == self.DOC["items"]
+
+    def test_items_yielded_incrementally(self):
+        """测试元素到达即返回"""
+        parser = ItemStreamParser()
+
+        assert parser.feed(b'{"items": [{"id": 1}, {"i') == [{"id": 1}]
+        assert parser.feed(b'd": 2}') == []
+        assert parser.feed(b'], "total": 2}') == [{"id": 2}]
+        assert parser.done
+
+    def test_buffer_stays_small(self):
+        """测试已返回元素从缓冲区移除"""
+        parser = ItemStreamParser()
+        parser.feed(b'{"items": [')
+        for i in range(1000):
+            parser.feed(json.dumps({"id": i, "pad": "x" * 100}).encode() + b",")
+        assert len(parser._buf) < 200
+
+    def test_missing_key_returns_document(self):
+        """测试没有数组字段时返回整个文档"""
+        parser = ItemStreamParser()
+        assert parser.feed(b'{"error_code": "E", "error_message": "m"}') == []
+        assert parser.close() == {"error_code": "E", "error_message": "m"}
+
+    def test_empty_array(self):
+        """测试空数组"""
+        assert list(iter_items([b'{"items": []}'])) == []